@@ -0,0 +1,222 @@
+"""
+asyncio counterparts of the crud.py read/write paths, used by the FastAPI
+handlers. Statements are built by the shared helpers in crud.py so both
+paths return identical shapes; crud.py stays the sync API for scripts.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import exists, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth import UNUSABLE_PASSWORD
+from crud import (
+    all_events_select, alumni_page_result, alumni_page_select, alumni_select,
+    alumnus_to_dict, apply_event_update, event_to_dict, events_page_result,
+    events_page_select, events_select, new_event_from, profile_select,
+    profile_to_dict,
+)
+from event_calendar import EventClash, check_clashes, events_in_range
+from models import (
+    AlumniProfile, Department, Donation, Event, EventParticipation, EventType, Opportunity, OpportunityType,
+    Organization, User, UserRole,
+)
+from opportunities import feed_result, feed_select, new_opportunity_from, opportunities_select, opportunity_to_dict
+from pagination import DEFAULT_PAGE_SIZE
+from network import refresh_network
+from recommend import refresh_mentor
+from rollups import record_event, record_registration
+from schemas import EventCreate, EventUpdate, OpportunityCreate
+from search import refresh_alumnus
+
+
+class ConflictError(Exception):
+    pass
+
+
+# --- events ---
+
+async def get_all_events(session: AsyncSession, status: Optional[str] = None):
+    rows = (await session.execute(all_events_select(status, datetime.now()))).all()
+    return [event_to_dict(row) for row in rows]
+
+async def get_event(session: AsyncSession, event_id: int):
+    row = (await session.execute(
+        events_select(None, datetime.now()).where(Event.event_id == event_id)
+    )).first()
+    return event_to_dict(row) if row else None
+
+async def get_events_page(session: AsyncSession, limit: int = DEFAULT_PAGE_SIZE,
+                          after: Optional[str] = None, status: Optional[str] = None, encoded: bool = False):
+    rows = (await session.execute(events_page_select(limit, after, status, datetime.now()))).all()
+    return events_page_result(rows, limit, encoded)
+
+async def iter_events(session: AsyncSession, status: Optional[str] = None, batch_size: int = 500):
+    stmt = (
+        events_select(status, datetime.now())
+        .order_by(Event.start_time, Event.event_id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream(stmt)
+    async for row in result:
+        yield event_to_dict(row)
+
+async def get_events_in_range(session: AsyncSession, start: datetime, end: datetime,
+                              event_type: Optional[EventType] = None, event_org_id: Optional[int] = None):
+    return await session.run_sync(
+        lambda sync_session: events_in_range(sync_session, start, end, event_type, event_org_id)
+    )
+
+async def _check_clashes(session: AsyncSession, event: Event):
+    try:
+        await session.run_sync(lambda sync_session: check_clashes(sync_session, event))
+    except EventClash:
+        await session.rollback()
+        raise
+
+async def post_event(session: AsyncSession, event_data: EventCreate, allow_overlap: bool = False):
+    new_event = new_event_from(event_data)
+    session.add(new_event)
+    await session.flush()
+    if not allow_overlap:
+        await _check_clashes(session, new_event)
+    await session.run_sync(lambda sync_session: record_event(sync_session, new_event))
+    await session.commit()
+    return await get_event(session, new_event.event_id)
+
+async def update_event(session: AsyncSession, event_id: int, update_data: EventUpdate,
+                       allow_overlap: bool = False):
+    event = await session.get(Event, event_id)
+    if not event:
+        return None
+    await session.run_sync(lambda sync_session: apply_event_update(sync_session, event, update_data))
+    if not allow_overlap:
+        await session.flush()
+        await _check_clashes(session, event)
+    await session.commit()
+    return await get_event(session, event_id)
+
+async def delete_event(session: AsyncSession, event_id: int):
+    event = await session.get(Event, event_id)
+    if not event:
+        return False
+    message = "Event still has participants or donations on record"
+    # Checked up front as well: SQLite does not enforce the foreign keys.
+    for model in (EventParticipation, Donation):
+        if await session.scalar(select(exists().where(model.event_id == event_id))):
+            raise ConflictError(message)
+    await session.run_sync(lambda sync_session: record_event(sync_session, event, delta=-1))
+    await session.delete(event)
+    await _commit_or_conflict(session, message)
+    return True
+
+
+# --- alumni ---
+
+async def get_user_by_email(session: AsyncSession, email: str) -> Optional[User]:
+    return (await session.execute(select(User).where(User.email == email))).scalar_one_or_none()
+
+async def get_alumnus(session: AsyncSession, alumni_id: int):
+    row = (await session.execute(alumni_select().where(AlumniProfile.alumni_id == alumni_id))).first()
+    return alumnus_to_dict(row) if row else None
+
+async def get_alumnus_profile(session: AsyncSession, alumni_id: int):
+    profile = (await session.execute(profile_select(alumni_id))).unique().scalar_one_or_none()
+    return profile_to_dict(profile) if profile else None
+
+async def get_alumni_page(session: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None,
+                          encoded: bool = False):
+    rows = (await session.execute(alumni_page_select(limit, after))).all()
+    return alumni_page_result(rows, limit, encoded)
+
+async def iter_alumni(session: AsyncSession, batch_size: int = 500):
+    stmt = alumni_select().order_by(AlumniProfile.alumni_id).execution_options(yield_per=batch_size)
+    result = await session.stream(stmt)
+    async for row in result:
+        yield alumnus_to_dict(row)
+
+async def _department_id(session: AsyncSession, department_name: str):
+    department_id = await session.scalar(
+        select(Department.department_id).where(Department.department_name == department_name)
+    )
+    if department_id is None:
+        raise ValueError(f"Unknown department {department_name!r}")
+    return department_id
+
+async def _commit_or_conflict(session: AsyncSession, message: str):
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise ConflictError(message)
+
+def refresh_alumni_indexes(session, alumni_id: int):
+    refresh_alumnus(session, alumni_id)
+    refresh_mentor(session, alumni_id)
+    refresh_network(session, alumni_id)
+
+async def create_alumnus(session: AsyncSession, alumni_id: int, name: str, email: str,
+                         graduation_year: int, major: str):
+    department_id = await _department_id(session, major)
+    user = User(user_id=alumni_id, email=email, password_hash=UNUSABLE_PASSWORD,
+                role=UserRole.Alumni, created_at=datetime.now())
+    session.add(user)
+    session.add(AlumniProfile(alumni_id=alumni_id, alumni_name=name,
+                              graduation_year=graduation_year, department_id=department_id))
+    await session.run_sync(
+        lambda sync_session: record_registration(sync_session, UserRole.Alumni, department_id, user.created_at)
+    )
+    await _commit_or_conflict(session, "An alumnus with this id or email already exists")
+    await session.run_sync(lambda sync_session: refresh_alumni_indexes(sync_session, alumni_id))
+    return await get_alumnus(session, alumni_id)
+
+async def update_alumnus(session: AsyncSession, alumni_id: int, name: str, email: str,
+                         graduation_year: int, major: str):
+    profile = await session.get(AlumniProfile, alumni_id)
+    if profile is None:
+        return None
+    user = await session.get(User, alumni_id)
+    profile.alumni_name = name
+    profile.graduation_year = graduation_year
+    profile.department_id = await _department_id(session, major)
+    user.email = email
+    await _commit_or_conflict(session, "Another account already uses this email")
+    await session.run_sync(lambda sync_session: refresh_alumni_indexes(sync_session, alumni_id))
+    return await get_alumnus(session, alumni_id)
+
+async def delete_alumnus(session: AsyncSession, alumni_id: int):
+    profile = await session.get(AlumniProfile, alumni_id)
+    if profile is None:
+        return False
+    user = await session.get(User, alumni_id)
+    await session.run_sync(lambda sync_session: record_registration(
+        sync_session, UserRole.Alumni, profile.department_id, user.created_at, delta=-1
+    ))
+    await session.delete(profile)
+    await session.delete(user)
+    await _commit_or_conflict(session, "Alumnus still has careers, events or donations on record")
+    await session.run_sync(lambda sync_session: refresh_alumni_indexes(sync_session, alumni_id))
+    return True
+
+
+# --- opportunities ---
+
+async def get_opportunity_feed(session: AsyncSession, limit: int = DEFAULT_PAGE_SIZE,
+                               after: Optional[str] = None, type: Optional[OpportunityType] = None,
+                               organization_id: Optional[int] = None, audience: Optional[str] = None):
+    rows = (await session.execute(feed_select(limit, after, type, organization_id, audience))).all()
+    return feed_result(rows, limit)
+
+async def post_opportunity(session: AsyncSession, data: OpportunityCreate):
+    if await session.get(AlumniProfile, data.posted_by_alumni_id) is None:
+        raise ValueError(f"Unknown alumnus: {data.posted_by_alumni_id}")
+    if data.organization_id is not None and await session.get(Organization, data.organization_id) is None:
+        raise ValueError(f"Unknown organization: {data.organization_id}")
+    opportunity = new_opportunity_from(data)
+    session.add(opportunity)
+    await session.commit()
+    row = (await session.execute(
+        opportunities_select().where(Opportunity.opportunity_id == opportunity.opportunity_id)
+    )).first()
+    return opportunity_to_dict(row)
@@ -1,9 +1,153 @@
+import asyncio
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from threading import Lock
+from time import perf_counter
+from typing import List, Optional
+
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow, so request handlers hand it to a process pool.
+# HASH_WORKERS bounds CPU use, HASH_MAX_PENDING bounds the queue in front of it.
+# Every server worker has its own pool, so by default the cores are shared out
+# across WEB_CONCURRENCY (uvicorn's worker count) instead of each taking all.
+HASH_WORKERS = int(os.getenv(
+    "HASH_WORKERS", max(1, (os.cpu_count() or 1) // max(1, int(os.getenv("WEB_CONCURRENCY", 1))))
+))
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", 64))
+
+# Accounts created by an admin or an import have no password until the alumnus
+# sets one; "!" never matches a bcrypt hash, so they cannot log in meanwhile.
+UNUSABLE_PASSWORD = "!"
+
+
 def hash_password(password: str):
     return pwd_context.hash(password)
 
 def verify_password(plain_password, hashed_password):
+    if hashed_password == UNUSABLE_PASSWORD:
+        return False
     return pwd_context.verify(plain_password, hashed_password)
+
+
+class HashQueueFull(Exception):
+    """Raised when more than HASH_MAX_PENDING hash jobs are already waiting."""
+
+
+class HashStats:
+    def __init__(self, window: int = 1000):
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=window)
+
+    def snapshot(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            "workers": HASH_WORKERS,
+            "queue_limit": HASH_MAX_PENDING,
+            "queue_depth": self.pending,
+            "max_queue_depth": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_ms_p50": percentile(0.50),
+            "latency_ms_p95": percentile(0.95),
+            "latency_ms_max": round(latencies[-1] * 1000, 2) if latencies else None,
+        }
+
+
+hash_stats = HashStats()
+# Guards hash_stats counters; bulk imports update them from worker threads.
+_stats_lock = Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = Lock()
+
+
+def _mp_context():
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Created lazily inside a running, multi-threaded server: forking it could
+            # hand the children locks held by other threads, so start them from a forkserver.
+            _executor = ProcessPoolExecutor(max_workers=HASH_WORKERS, mp_context=_mp_context())
+        return _executor
+
+def shutdown_hash_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _enter_job():
+    with _stats_lock:
+        hash_stats.pending += 1
+        hash_stats.max_pending = max(hash_stats.max_pending, hash_stats.pending)
+
+def _leave_job(start: float):
+    with _stats_lock:
+        hash_stats.pending -= 1
+        hash_stats.completed += 1
+        hash_stats.latencies.append(perf_counter() - start)
+
+async def _run_hash_job(fn, *args):
+    with _stats_lock:
+        if hash_stats.pending >= HASH_MAX_PENDING:
+            hash_stats.rejected += 1
+            raise HashQueueFull()
+    _enter_job()
+    start = perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _leave_job(start)
+
+async def hash_password_async(password: str):
+    return await _run_hash_job(hash_password, password)
+
+async def verify_password_async(plain_password, hashed_password):
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hashes a batch for bulk imports on the same pool as the request path. At
+    most HASH_WORKERS jobs are in flight and they count toward
+    HASH_MAX_PENDING, so an import shares the pool instead of queueing the
+    whole batch ahead of logins.
+    """
+    hashes: List[Optional[str]] = [None] * len(passwords)
+    executor = _get_executor()
+    in_flight = {}
+    position = 0
+    try:
+        while position < len(passwords) or in_flight:
+            while position < len(passwords) and len(in_flight) < HASH_WORKERS:
+                _enter_job()
+                in_flight[executor.submit(hash_password, passwords[position])] = (position, perf_counter())
+                position += 1
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, start = in_flight.pop(future)
+                _leave_job(start)
+                hashes[index] = future.result()
+    finally:
+        for future, (_, start) in in_flight.items():
+            future.cancel()
+            _leave_job(start)
+    return hashes
@@ -0,0 +1,419 @@
+"""
+Benchmark harness for the API hot paths.
+
+Seeds a synthetic dataset into a scratch database (SQLite by default, or any
+DATABASE_URL such as a local Postgres), drives the app in-process over ASGI,
+first one request at a time and then with concurrent clients, and writes
+p50/p95/p99 latency, throughput and peak traced memory per scenario as JSON.
+
+    python benchmark.py --alumni 20000 --output bench.json
+    python benchmark.py --compare bench.json --output bench-new.json
+
+The response cache is disabled (CACHE_TTL_SECONDS=0) unless --cache-ttl is
+given, so numbers reflect the database path. Nothing here runs on import.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+SEED = 17
+DEFAULT_URL = "sqlite:///./benchmark.db"
+CHUNK = 5000
+
+WORDS = (
+    "software data machine learning cloud security embedded robotics finance design product "
+    "research analytics platform mobile backend frontend devops network hardware consulting"
+).split()
+ROLES = ["Engineer", "Senior Engineer", "Data Scientist", "Manager", "Researcher", "Consultant", "Analyst"]
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize_latencies(latencies: List[float], wall: float, errors: int) -> dict:
+    values = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "p50_ms": ms(_percentile(values, 0.50)),
+        "p95_ms": ms(_percentile(values, 0.95)),
+        "p99_ms": ms(_percentile(values, 0.99)),
+        "mean_ms": ms(statistics.fmean(values)) if values else 0.0,
+        "max_ms": ms(values[-1]) if values else 0.0,
+        "throughput_rps": round(len(values) / wall, 1) if wall else 0.0,
+    }
+
+
+# --- synthetic data ---
+
+def _insert(session, table, rows):
+    from sqlalchemy import insert
+
+    for start in range(0, len(rows), CHUNK):
+        session.execute(insert(table), rows[start:start + CHUNK])
+
+def seed_dataset(session, alumni: int, students: int, careers: int, events: int,
+                 participations: int, donations: int, opportunities: int) -> dict:
+    """Bulk-inserts a reproducible dataset and rebuilds the derived tables; returns row counts."""
+    from sqlalchemy import select
+
+    from auth import hash_password
+    from models import (
+        AlumniProfile, Career, Department, Donation, Event, EventOrganizer, EventOrgType,
+        EventParticipation, EventType, Opportunity, OpportunityType, Organization, ParticipantRole,
+        StudentProfile, User, UserRole,
+    )
+    from participation import recount_participants
+    from rollups import refresh_rollups
+    from search import create_search_indexes
+    from event_calendar import create_calendar_index
+
+    rng = random.Random(SEED)
+    now = datetime.now()
+    password_hash = hash_password("benchmark")  # one hash for everybody; bcrypt is not what we measure
+
+    _insert(session, Department.__table__, [{"department_name": f"Department {i}"} for i in range(12)])
+    _insert(session, Organization.__table__, [{"organization_name": f"Org {i}"} for i in range(500)])
+    _insert(session, EventOrganizer.__table__, [
+        {"event_org_type": EventOrgType.Club, "event_org_name": f"Club {i}"} for i in range(20)
+    ])
+    department_ids = session.scalars(select(Department.department_id)).all()
+    organization_ids = session.scalars(select(Organization.organization_id)).all()
+    organizer_ids = session.scalars(select(EventOrganizer.event_org_id)).all()
+
+    def text(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+
+    alumni_ids = list(range(1_000_000, 1_000_000 + alumni))
+    student_ids = list(range(2_000_000, 2_000_000 + students))
+    _insert(session, User.__table__, [
+        {"user_id": i, "email": f"user{i}@bench.example", "password_hash": password_hash,
+         "role": UserRole.Alumni if i < 2_000_000 else UserRole.Student,
+         "created_at": now - timedelta(days=rng.randrange(3650))}
+        for i in alumni_ids + student_ids
+    ])
+    _insert(session, AlumniProfile.__table__, [
+        {"alumni_id": i, "alumni_name": f"Alumnus {i}", "graduation_year": rng.randrange(1990, 2025),
+         "department_id": rng.choice(department_ids), "bio": text(12)}
+        for i in alumni_ids
+    ])
+    _insert(session, StudentProfile.__table__, [
+        {"student_id": i, "student_name": f"Student {i}", "department_id": rng.choice(department_ids),
+         "joined_year": rng.randrange(2019, 2026), "bio": text(8)}
+        for i in student_ids
+    ])
+    _insert(session, Career.__table__, [
+        {"alumni_id": i, "organization_id": rng.choice(organization_ids), "role": rng.choice(ROLES),
+         "started_on": date(2000, 1, 1) + timedelta(days=rng.randrange(9000)),
+         "worked_till": None if n == 0 else date(2000, 1, 1) + timedelta(days=rng.randrange(9000))}
+        for i in alumni_ids for n in range(careers)
+    ])
+    _insert(session, Event.__table__, [
+        {"event_name": f"Event {n}", "event_type": rng.choice(list(EventType)),
+         "start_time": (start := now + timedelta(hours=rng.randrange(-24 * 365, 24 * 180))),
+         "end_time": start + timedelta(hours=rng.randrange(1, 48)),
+         "description": text(20), "event_org_id": rng.choice(organizer_ids), "req_donation": 0}
+        for n in range(events)
+    ])
+    event_ids = session.scalars(select(Event.event_id)).all()
+    participation_rows = []
+    for event_id in event_ids:
+        for alumni_id in rng.sample(alumni_ids, min(participations, len(alumni_ids))):
+            participation_rows.append(
+                {"event_id": event_id, "alumni_id": alumni_id, "role": ParticipantRole.Participant}
+            )
+    _insert(session, EventParticipation.__table__, participation_rows)
+    _insert(session, Donation.__table__, [
+        {"alumni_id": rng.choice(alumni_ids), "event_id": rng.choice(event_ids) if event_ids and n % 2 else None,
+         "amount": rng.randrange(100, 100000), "currency": "INR", "transaction_id": f"bench-{n}",
+         "donation_date": now - timedelta(days=rng.randrange(730))}
+        for n in range(donations)
+    ])
+    _insert(session, Opportunity.__table__, [
+        {"posted_by_alumni_id": rng.choice(alumni_ids), "organization_id": rng.choice(organization_ids),
+         "type": rng.choice(list(OpportunityType)), "title": f"Opening {n}", "description": text(30),
+         "is_active": True, "target_audience": rng.choice([None, "CSE", "ECE"]),
+         "created_at": now - timedelta(minutes=n)}
+        for n in range(opportunities)
+    ])
+    session.commit()
+
+    refresh_rollups(session)
+    recount_participants(session)
+    create_search_indexes(session)
+    create_calendar_index(session)
+    return {
+        "alumni": alumni, "students": students, "careers": alumni * careers, "events": len(event_ids),
+        "participations": len(participation_rows), "donations": donations, "opportunities": opportunities,
+    }
+
+
+# --- scenarios ---
+
+class Scenario:
+    def __init__(self, name: str, method: str, path: Callable[[random.Random], str],
+                 body: Optional[Callable[[random.Random], dict]] = None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+
+def default_scenarios(ids: Dict[str, list]) -> List[Scenario]:
+    alumni_ids, student_ids, event_ids = ids["alumni"], ids["students"], ids["events"]
+    pick = lambda values: (lambda rng: rng.choice(values))
+    return [
+        Scenario("GET /api/events", "GET", lambda rng: "/api/events"),
+        Scenario("GET /api/events?status=Upcoming", "GET", lambda rng: "/api/events?status=Upcoming"),
+        Scenario("GET /api/event/{id}", "GET", lambda rng: f"/api/event/{pick(event_ids)(rng)}"),
+        Scenario("GET /api/alumni", "GET", lambda rng: "/api/alumni"),
+        Scenario("GET /api/alumni/{id}", "GET", lambda rng: f"/api/alumni/{pick(alumni_ids)(rng)}"),
+        Scenario("GET /api/alumni/{id}/profile", "GET",
+                 lambda rng: f"/api/alumni/{pick(alumni_ids)(rng)}/profile"),
+        Scenario("GET /api/alumni/search", "GET", lambda rng: f"/api/alumni/search?q={rng.choice(WORDS)}"),
+        Scenario("GET /api/opportunities", "GET", lambda rng: "/api/opportunities?limit=50"),
+        Scenario("GET /api/analytics", "GET", lambda rng: "/api/analytics"),
+        Scenario("GET mentor-recommendations", "GET",
+                 lambda rng: f"/api/students/{pick(student_ids)(rng)}/mentor-recommendations"),
+        Scenario("POST /api/login", "POST", lambda rng: "/api/login", lambda rng: {
+            "email": "student@example.com", "password": "studentpassword", "role": "Student",
+        }),
+    ]
+
+async def run_scenario(client, scenario: Scenario, requests: int, concurrency: int, rng: random.Random):
+    latencies: List[float] = []
+    errors = 0
+    calls = [(scenario.path(rng), scenario.body(rng) if scenario.body else None) for _ in range(requests)]
+    queue = iter(calls)
+
+    async def worker():
+        nonlocal errors
+        for path, body in queue:
+            start = perf_counter()
+            response = await client.request(scenario.method, path, json=body)
+            await response.aread()
+            latencies.append(perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    wall_start = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize_latencies(latencies, perf_counter() - wall_start, errors)
+
+async def measure_memory(client, scenario: Scenario, requests: int, rng: random.Random) -> float:
+    """Peak Python allocations (KiB) while serving `requests` sequential calls; traced separately
+    because tracemalloc would distort the latency numbers."""
+    tracemalloc.start()
+    try:
+        await run_scenario(client, scenario, requests, 1, rng)
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+def bench_get_all_events(requests: int) -> dict:
+    """crud.get_all_events called directly, without HTTP or serialization."""
+    import crud
+    from database import SessionLocal
+
+    latencies = []
+    wall_start = perf_counter()
+    with SessionLocal() as session:
+        for _ in range(requests):
+            start = perf_counter()
+            crud.get_all_events(session)
+            latencies.append(perf_counter() - start)
+    return summarize_latencies(latencies, perf_counter() - wall_start, 0)
+
+async def run_benchmarks(app, scenarios: List[Scenario], requests: int, concurrency: int,
+                         memory_requests: int, only: Optional[List[str]]) -> dict:
+    import httpx
+
+    rng = random.Random(SEED)
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for scenario in scenarios:
+            if only and not any(part in scenario.name for part in only):
+                continue
+            await run_scenario(client, scenario, min(requests, 10), 1, rng)  # warm up
+            results[scenario.name] = {
+                "sequential": await run_scenario(client, scenario, requests, 1, rng),
+                "concurrent": await run_scenario(client, scenario, requests, concurrency, rng),
+                "peak_traced_kib": await measure_memory(client, scenario, memory_requests, rng),
+            }
+            print(f"{scenario.name:40} p50 {results[scenario.name]['sequential']['p50_ms']:8.2f} ms  "
+                  f"x{concurrency} {results[scenario.name]['concurrent']['throughput_rps']:8.1f} req/s",
+                  file=sys.stderr)
+    return results
+
+
+# --- serialization ---
+
+def bench_serialization(sizes: List[int], repeat: int = 3) -> dict:
+    """Event list rows -> JSON bytes: the dict + response_model path vs a precompiled RowShape.
+    Uses synthetic result tuples so only serialization is timed."""
+    import json as stdlib_json
+
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    from crud import EVENT_SHAPE, event_to_dict
+    from schemas import EventOut
+
+    adapter = TypeAdapter(List[EventOut])
+    start = datetime(2025, 1, 1, 9, 30, 15, 123456)
+
+    def validated(rows):
+        # What FastAPI does for response_model=List[EventOut]: validate, dump, then json.dumps.
+        items = adapter.validate_python([event_to_dict(r) for r in rows])
+        return stdlib_json.dumps(adapter.dump_python(items, mode="json")).encode()
+
+    def encoder(rows):
+        return stdlib_json.dumps(jsonable_encoder([event_to_dict(r) for r in rows]), separators=(",", ":")).encode()
+
+    results = {}
+    for size in sizes:
+        rows = [
+            (n, f"Event {n}", "Annual meetup of the alumni network", start + timedelta(hours=n),
+             start + timedelta(hours=n + 3), "Upcoming", "Alumni Cell", 200, n % 200)
+            for n in range(size)
+        ]
+        assert stdlib_json.loads(EVENT_SHAPE.encode(rows)) == stdlib_json.loads(validated(rows))
+        timings = {}
+        for name, encode in (("response_model", validated), ("jsonable_encoder", encoder),
+                             ("row_shape", EVENT_SHAPE.encode)):
+            best = float("inf")
+            for _ in range(repeat):
+                began = perf_counter()
+                encode(rows)
+                best = min(best, perf_counter() - began)
+            timings[f"{name}_ms"] = round(best * 1000, 2)
+        timings["speedup_vs_response_model"] = round(timings["response_model_ms"] / timings["row_shape_ms"], 1)
+        results[str(size)] = timings
+        print(f"{size:>8} rows  {timings}", file=sys.stderr)
+    return results
+
+
+# --- reporting ---
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(previous: dict, current: dict):
+    print(f"{'scenario':40} {'p50 before':>11} {'p50 after':>10} {'p95 before':>11} {'p95 after':>10} {'rps x':>7}")
+    for name, result in current["scenarios"].items():
+        old = previous.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        before, after = old["sequential"], result["sequential"]
+        speedup = (result["concurrent"]["throughput_rps"] / old["concurrent"]["throughput_rps"]
+                   if old["concurrent"]["throughput_rps"] else 0.0)
+        print(f"{name:40} {before['p50_ms']:11.2f} {after['p50_ms']:10.2f} "
+              f"{before['p95_ms']:11.2f} {after['p95_ms']:10.2f} {speedup:7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the API hot paths against a synthetic dataset.")
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL", DEFAULT_URL),
+                        help="scratch database; it is wiped and re-seeded unless --skip-seed")
+    parser.add_argument("--alumni", type=int, default=5000)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--careers", type=int, default=2, help="careers per alumnus")
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--participations", type=int, default=20, help="participants per event")
+    parser.add_argument("--donations", type=int, default=5000)
+    parser.add_argument("--opportunities", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and mode")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--memory-requests", type=int, default=20)
+    parser.add_argument("--cache-ttl", type=float, default=0, help="response cache TTL; 0 measures the uncached path")
+    parser.add_argument("--only", nargs="*", help="run scenarios whose name contains any of these")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the data already in --database-url")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="previous results file to print a comparison against")
+    parser.add_argument("--serialization", nargs="*", type=int, metavar="ROWS",
+                        help="only benchmark JSON encoding of event lists of these sizes (default 10000 100000)")
+    args = parser.parse_args(argv)
+
+    if args.serialization is not None:
+        report = {"revision": git_revision(), "python": platform.python_version(),
+                  "serialization": bench_serialization(args.serialization or [10_000, 100_000])}
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        return
+
+    # Settings are read lazily from the environment, so set them before the app is imported.
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["CACHE_TTL_SECONDS"] = str(args.cache_ttl)
+    os.environ.setdefault("OPPORTUNITY_EXPIRY_INTERVAL", "0")
+
+    from sqlalchemy import select
+
+    from database import SessionLocal, create_schema, get_engine
+    from models import AlumniProfile, Base, Event, StudentProfile
+
+    sizes = None
+    if not args.skip_seed:
+        Base.metadata.drop_all(bind=get_engine())
+        create_schema()
+        seed_start = perf_counter()
+        with SessionLocal() as session:
+            sizes = seed_dataset(session, args.alumni, args.students, args.careers, args.events,
+                                 args.participations, args.donations, args.opportunities)
+        print(f"seeded {sizes} in {perf_counter() - seed_start:.1f}s", file=sys.stderr)
+
+    with SessionLocal() as session:
+        ids = {
+            "alumni": session.scalars(select(AlumniProfile.alumni_id)).all(),
+            "students": session.scalars(select(StudentProfile.student_id)).all(),
+            "events": session.scalars(select(Event.event_id)).all(),
+        }
+
+    from main import app
+
+    scenarios = default_scenarios(ids)
+    results = asyncio.run(run_benchmarks(
+        app, scenarios, args.requests, args.concurrency, args.memory_requests, args.only
+    ))
+    if not args.only or any("get_all_events" in part for part in args.only):
+        results["crud.get_all_events"] = {"sequential": bench_get_all_events(min(args.requests, 50))}
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "database": get_engine().dialect.name,
+        "dataset": sizes,
+        "settings": {"requests": args.requests, "concurrency": args.concurrency, "cache_ttl": args.cache_ttl},
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "scenarios": results,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"wrote {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            compare(json.load(fh), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Streaming bulk import of an alumni register from CSV or JSONL.
+
+Rows are read and validated in chunks; departments and organizations are
+resolved once per chunk; users, profiles and current careers are written with
+Postgres COPY (executemany elsewhere). Each chunk is its own transaction and
+bad rows are reported individually, so one malformed line never aborts the load.
+If the database rejects a chunk, its rows are retried one by one and only the
+failing ones are reported. Passwords are hashed on the shared pool in auth.py.
+
+    python bulk_import.py alumni.csv [--format jsonl] [--chunk-size 5000]
+"""
+import argparse
+import csv
+import enum
+import io
+import json
+from collections import Counter
+from datetime import date, datetime
+from itertools import islice
+from time import perf_counter
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError, field_validator
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from auth import UNUSABLE_PASSWORD, hash_passwords
+from models import AlumniProfile, Career, Department, Organization, User, UserRole
+from rollups import bump
+from network import reset_network_index
+from recommend import reset_mentor_index
+from search import reset_search_index
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+
+class AlumniImportRow(BaseModel):
+    user_id: int
+    email: str
+    name: str
+    graduation_year: int
+    department: str
+    ph_no: Optional[str] = None
+    bio: Optional[str] = None
+    linkedin_profile_url: Optional[str] = None
+    password: Optional[str] = None  # initial password; accounts without one must reset before logging in
+    organization: Optional[str] = None  # current employer, becomes an open-ended Career row
+    role: Optional[str] = None
+    location: Optional[str] = None
+    started_on: Optional[date] = None
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def blank_to_none(cls, value):
+        if isinstance(value, str):
+            value = value.strip()
+            return value or None
+        return value
+
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, value: str):
+        if "@" not in value:
+            raise ValueError("not an email address")
+        return value.lower()
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self._start = perf_counter()
+
+    def error(self, line: int, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self):
+        elapsed = perf_counter() - self._start
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "elapsed_s": round(elapsed, 3),
+            "rows_per_sec": round(self.rows / elapsed, 1) if elapsed else None,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+# --- reading ---
+
+def read_rows(stream: IO[str], fmt: str) -> Iterator[Tuple[int, dict]]:
+    """Yields (line number, raw row) pairs without loading the file."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            if line.strip():
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, {"__error__": f"invalid JSON: {e.msg}"}
+    else:
+        raise ValueError(f"Unsupported format {fmt!r}")
+
+def chunked(iterable: Iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# --- per-chunk work ---
+
+def _validate(chunk, report: ImportReport) -> List[Tuple[int, AlumniImportRow]]:
+    valid = []
+    seen_ids, seen_emails = set(), set()
+    for line, raw in chunk:
+        report.rows += 1
+        if "__error__" in raw:
+            report.error(line, raw["__error__"])
+            continue
+        try:
+            row = AlumniImportRow.model_validate(raw)
+        except ValidationError as e:
+            report.error(line, [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()])
+            continue
+        if row.user_id in seen_ids or row.email in seen_emails:
+            report.error(line, "duplicate user_id or email within the file")
+            continue
+        seen_ids.add(row.user_id)
+        seen_emails.add(row.email)
+        valid.append((line, row))
+    return valid
+
+def _drop_existing(session: Session, rows, report: ImportReport):
+    ids = [row.user_id for _, row in rows]
+    emails = [row.email for _, row in rows]
+    taken_ids = set(session.scalars(select(User.user_id).where(User.user_id.in_(ids))))
+    taken_emails = set(session.scalars(select(User.email).where(User.email.in_(emails))))
+    fresh = []
+    for line, row in rows:
+        if row.user_id in taken_ids or row.email in taken_emails:
+            report.error(line, "user_id or email already exists")
+        else:
+            fresh.append((line, row))
+    return fresh
+
+def _resolve_names(session: Session, model, id_col, name_col, names) -> Dict[str, int]:
+    """Maps names to ids, creating the missing ones in one batch."""
+    names = set(names)
+    if not names:
+        return {}
+    found = dict(session.execute(select(name_col, id_col).where(name_col.in_(names))).all())
+    missing = names - found.keys()
+    if missing:
+        session.execute(insert(model), [{name_col.key: name} for name in sorted(missing)])
+        found.update(session.execute(select(name_col, id_col).where(name_col.in_(missing))).all())
+    return found
+
+def _hash_passwords(rows):
+    hashes = iter(hash_passwords([row.password for _, row in rows if row.password]))
+    return [next(hashes) if row.password else UNUSABLE_PASSWORD for _, row in rows]
+
+
+# --- writing ---
+
+def _copy_rows(session: Session, table: str, columns: List[str], rows: List[dict]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row[c] is None else row[c] for c in columns])
+    buffer.seek(0)
+    cursor = session.connection().connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+def _write(session: Session, model, rows: List[dict]):
+    if not rows:
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        # SQLAlchemy stores Enum columns by member name.
+        values = [
+            {key: value.name if isinstance(value, enum.Enum) else value for key, value in row.items()}
+            for row in rows
+        ]
+        _copy_rows(session, model.__tablename__, list(rows[0]), values)
+    else:
+        session.execute(insert(model), rows)
+
+def _insert_rows(session: Session, rows, hashes: List[str], now: datetime):
+    departments = _resolve_names(session, Department, Department.department_id,
+                                 Department.department_name, (row.department for _, row in rows))
+    organizations = _resolve_names(session, Organization, Organization.organization_id,
+                                   Organization.organization_name,
+                                   (row.organization for _, row in rows if row.organization))
+    _write(session, User, [
+        {"user_id": row.user_id, "email": row.email, "password_hash": password_hash,
+         "role": UserRole.Alumni, "created_at": now}
+        for (_, row), password_hash in zip(rows, hashes)
+    ])
+    _write(session, AlumniProfile, [
+        {"alumni_id": row.user_id, "alumni_name": row.name, "ph_no": row.ph_no,
+         "graduation_year": row.graduation_year, "department_id": departments[row.department],
+         "bio": row.bio, "linkedin_profile_url": row.linkedin_profile_url}
+        for _, row in rows
+    ])
+    _write(session, Career, [
+        {"alumni_id": row.user_id, "organization_id": organizations[row.organization],
+         "role": row.role or "Unknown", "location": row.location,
+         "started_on": row.started_on or date(row.graduation_year, 7, 1)}
+        for _, row in rows if row.organization
+    ])
+    for department_id, count in Counter(departments[row.department] for _, row in rows).items():
+        bump(session, now.date(), "alumni_registrations", count, department_id=department_id)
+    session.commit()
+
+def import_chunk(session: Session, chunk, report: ImportReport):
+    rows = _drop_existing(session, _validate(chunk, report), report)
+    if not rows:
+        return
+
+    now = datetime.now()
+    hashes = _hash_passwords(rows)
+    try:
+        _insert_rows(session, rows, hashes, now)
+    except SQLAlchemyError:
+        session.rollback()
+    else:
+        report.inserted += len(rows)
+        return
+    # Something in the chunk broke a constraint: retry row by row so only the bad rows are reported.
+    for row, password_hash in zip(rows, hashes):
+        try:
+            _insert_rows(session, [row], [password_hash], now)
+        except SQLAlchemyError as e:
+            session.rollback()
+            report.error(row[0], f"rejected by the database: {type(e.__cause__ or e).__name__}")
+        else:
+            report.inserted += 1
+
+def import_alumni(session: Session, stream: IO[str], fmt: str = "csv", chunk_size: int = DEFAULT_CHUNK_SIZE):
+    report = ImportReport()
+    try:
+        for chunk in chunked(read_rows(stream, fmt), chunk_size):
+            import_chunk(session, chunk, report)
+    finally:
+        if report.inserted:
+            reset_search_index()
+            reset_mentor_index()
+            reset_network_index()
+    return report.as_dict()
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Bulk import alumni from CSV or JSONL.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("csv", "jsonl"))
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+    db = SessionLocal()
+    try:
+        with open(args.path, newline="", encoding="utf-8") as f:
+            result = import_alumni(db, f, fmt, args.chunk_size)
+    finally:
+        db.close()
+    print(json.dumps(result, indent=4, default=str))
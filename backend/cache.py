@@ -0,0 +1,151 @@
+"""
+Response cache for the hot read endpoints.
+
+Entries are keyed by route + query string and tagged ("events", "event:12",
+"alumni:7"). Invalidation bumps a tag's version instead of hunting for keys:
+the version is part of the key, so stale entries simply stop being reachable
+and age out of the LRU. Bodies carry a strong ETag so browsers can revalidate
+with If-None-Match and get a 304 without the payload.
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from serialization import RawJSON, dumps
+
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", 30))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+
+
+class InMemoryBackend:
+    """Bounded LRU with per-entry TTL; safe to share between threads."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at < monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: dict, ttl: float):
+        with self._lock:
+            self._entries[key] = (monotonic() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def version(self, tag: str) -> int:
+        return self._versions.get(tag, 0)
+
+    def bump(self, tag: str):
+        with self._lock:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class RedisBackend:
+    """Shared backend so every worker sees the same entries and invalidations."""
+
+    def __init__(self, url: str, prefix: str = "respcache:"):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[dict]:
+        raw = self._redis.get(self._prefix + key)
+        if not raw:
+            return None
+        entry = json.loads(raw)
+        entry["body"] = entry["body"].encode()
+        return entry
+
+    def set(self, key: str, entry: dict, ttl: float):
+        stored = {**entry, "body": entry["body"].decode()}
+        self._redis.set(self._prefix + key, json.dumps(stored), px=int(ttl * 1000))
+
+    def version(self, tag: str) -> int:
+        return int(self._redis.get(f"{self._prefix}v:{tag}") or 0)
+
+    def bump(self, tag: str):
+        self._redis.incr(f"{self._prefix}v:{tag}")
+
+    def clear(self):
+        for key in self._redis.scan_iter(match=self._prefix + "*"):
+            self._redis.delete(key)
+
+
+def _make_backend():
+    url = os.getenv("CACHE_BACKEND_URL")
+    if url and url.startswith("redis"):
+        return RedisBackend(url)
+    return InMemoryBackend()
+
+
+backend = _make_backend()
+
+
+def invalidate(*tags: str):
+    for tag in tags:
+        backend.bump(tag)
+
+def _cache_key(request: Request, tags: Iterable[str]) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    versions = ",".join(f"{tag}@{backend.version(tag)}" for tag in tags)
+    return f"{request.url.path}?{query}|{versions}"
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+def _to_response(request: Request, entry: dict) -> Response:
+    headers = {"ETag": entry["etag"], "Cache-Control": "no-cache", **entry["headers"]}
+    if _etag_matches(request, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+async def cached_json(request: Request, tags: Tuple[str, ...],
+                      produce: Callable[[Response], Awaitable], ttl: float = CACHE_TTL_SECONDS) -> Response:
+    """
+    Serves a JSON payload from the cache or builds it with `produce(response)`.
+    Headers that `produce` sets on the response (e.g. X-Next-Cursor) are cached with the body.
+    """
+    key = _cache_key(request, tags)
+    entry = backend.get(key)
+    if entry is None:
+        scratch = Response()
+        data = await produce(scratch)
+        # RawJSON from a RowShape is already encoded; anything else goes through the encoder once.
+        body = data if isinstance(data, RawJSON) else dumps(jsonable_encoder(data))
+        entry = {
+            "body": bytes(body),
+            "etag": '"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+            "headers": {k: v for k, v in scratch.headers.items() if k.lower().startswith("x-")},
+        }
+        backend.set(key, entry, ttl)
+    return _to_response(request, entry)
@@ -1,97 +1,319 @@
-from sqlalchemy.orm import Session
-from models import Event, EventOrganizer, EventType
+from sqlalchemy import and_, case, or_, select, tuple_
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import Optional
+from models import (
+    AlumniProfile, Career, Department, Event, EventOrganizer, EventParticipation,
+    EventType, User,
+)
 from datetime import datetime
 from database import SessionLocal
-from schemas import EventCreate, EventUpdate
+from schemas import EventCreate, EventUpdate, check_event_period
+from pagination import DEFAULT_PAGE_SIZE, decode_keyset, encode_cursor
+from serialization import RowShape
+from rollups import bump, record_event
 from zoneinfo import ZoneInfo
 import json
 
-def get_all_events(session: Session):
-    now = datetime.now()
+EVENT_STATUSES = ("Ongoing", "Upcoming", "Completed")
 
-    events = (
-        session.query(Event, EventOrganizer)
-        .join(EventOrganizer, Event.event_org_id == EventOrganizer.event_org_id)
-        .all()
+
+def event_status(now: datetime):
+    # Same rules the old Python loop used, evaluated by the database.
+    return case(
+        (Event.start_time > now, "Upcoming"),
+        (Event.end_time < now, "Completed"),
+        else_="Ongoing",
     )
 
-    response_list = []
-    for event_obj, organizer in events:
-        if event_obj.start_time > now:
-            status = "Upcoming"
-        elif event_obj.end_time and event_obj.end_time < now:
-            status = "Completed"
-        else:
-            status = "Ongoing"
-
-        response_list.append({
-            "id": str(event_obj.event_id),
-            "title": event_obj.event_name,
-            "description": event_obj.description,
-            "start_time": event_obj.start_time.isoformat(),
-            "end_time": event_obj.end_time.isoformat() if event_obj.end_time else None,
-            "status": status,
-            "organizer_name": organizer.event_org_name,
-        })
-
-    sort_order = {"Ongoing": 0, "Upcoming": 1, "Completed": 2}
-    response_list.sort(key=lambda e: sort_order[e["status"]])
-
-    return response_list
+def event_status_filter(status: str, now: datetime):
+    # Plain range predicates so the start_time/end_time indexes can be used.
+    if status == "Upcoming":
+        return Event.start_time > now
+    if status == "Completed":
+        return and_(Event.start_time <= now, Event.end_time < now)
+    if status == "Ongoing":
+        return and_(
+            Event.start_time <= now,
+            or_(Event.end_time.is_(None), Event.end_time >= now),
+        )
+    raise ValueError(f"Unknown event status {status!r}")
 
-def get_event(session: Session, event_id: int):
-    now = datetime.now()
+def event_to_dict(row):
+    event_id, title, description, start_time, end_time, status, organizer_name, capacity, participants = row
+    return {
+        "id": str(event_id),
+        "title": title,
+        "description": description,
+        "start_time": start_time.isoformat(),
+        "end_time": end_time.isoformat() if end_time else None,
+        "status": status,
+        "organizer_name": organizer_name,
+        "capacity": capacity,
+        "participant_count": participants or 0,
+    }
+
+# Same columns, straight to JSON bytes for the list endpoints.
+EVENT_SHAPE = RowShape(
+    id=(0, str), title=1, description=2, start_time=3, end_time=4, status=5,
+    organizer_name=6, capacity=7, participant_count=8,
+)
 
-    event = (
-        session.query(Event, EventOrganizer)
+def events_select(status: Optional[str], now: datetime):
+    # Plain columns, not Event entities: no identity map or per-row ORM state on list reads.
+    stmt = (
+        select(
+            Event.event_id, Event.event_name, Event.description, Event.start_time, Event.end_time,
+            event_status(now), EventOrganizer.event_org_name, Event.capacity, Event.participant_count,
+        )
         .join(EventOrganizer, Event.event_org_id == EventOrganizer.event_org_id)
-        .filter(Event.event_id == event_id)
-        .first()
     )
+    if status is not None:
+        stmt = stmt.where(event_status_filter(status, now))
+    return stmt
 
-    if not event:
+def all_events_select(status: Optional[str], now: datetime):
+    sort_order = case(
+        {name: rank for rank, name in enumerate(EVENT_STATUSES)},
+        value=event_status(now),
+    )
+    return events_select(status, now).order_by(sort_order, Event.start_time, Event.event_id)
+
+def events_page_select(limit: int, after: Optional[str], status: Optional[str], now: datetime):
+    stmt = events_select(status, now)
+    if after is not None:
+        start_time, event_id = decode_keyset(after, datetime, int)
+        stmt = stmt.where(tuple_(Event.start_time, Event.event_id) > tuple_(start_time, event_id))
+    return stmt.order_by(Event.start_time, Event.event_id).limit(limit + 1)
+
+def events_page_result(rows, limit: int, encoded: bool = False):
+    """(items, next cursor); with encoded=True items is a RawJSON array instead of dicts."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.start_time.isoformat(), last.event_id)
+    if encoded:
+        return EVENT_SHAPE.encode(rows), next_cursor
+    return [event_to_dict(row) for row in rows], next_cursor
+
+def single_event_result(row):
+    if not row:
+        return None
+    data = event_to_dict(row)
+    del data["id"]
+    return data
+
+def get_all_events(session: Session, status: Optional[str] = None):
+    rows = session.execute(all_events_select(status, datetime.now())).all()
+    return [event_to_dict(row) for row in rows]
+
+def get_event(session: Session, event_id: int):
+    row = session.execute(
+        events_select(None, datetime.now()).where(Event.event_id == event_id)
+    ).first()
+    data = single_event_result(row)
+    if data is None:
         return {"error": f"Event with id {event_id} not found"}
+    return data
 
-    event_obj, organizer = event
+def get_events_page(session: Session, limit: int = DEFAULT_PAGE_SIZE,
+                    after: Optional[str] = None, status: Optional[str] = None, encoded: bool = False):
+    """Returns one page of events ordered by (start_time, event_id) and the cursor for the next page."""
+    rows = session.execute(events_page_select(limit, after, status, datetime.now())).all()
+    return events_page_result(rows, limit, encoded)
 
-    # Determine status
-    if event_obj.start_time > now:
-        status = "Upcoming"
-    elif event_obj.end_time and event_obj.end_time < now:
-        status = "Completed"
-    else:
-        status = "Ongoing"
+def iter_events(session: Session, status: Optional[str] = None, batch_size: int = 500):
+    """Yields events from a server-side cursor, batch_size rows at a time."""
+    stmt = (
+        events_select(status, datetime.now())
+        .order_by(Event.start_time, Event.event_id)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in session.execute(stmt):
+        yield event_to_dict(row)
 
+def alumni_select():
+    return (
+        select(
+            AlumniProfile.alumni_id,
+            AlumniProfile.alumni_name,
+            User.email,
+            AlumniProfile.graduation_year,
+            Department.department_name,
+        )
+        .join(User, AlumniProfile.alumni_id == User.user_id)
+        .join(Department, AlumniProfile.department_id == Department.department_id)
+    )
+
+def alumnus_to_dict(row):
+    alumni_id, name, email, graduation_year, department_name = row
     return {
-        "title": event_obj.event_name,
-        "description": event_obj.description,
-        "start_time": event_obj.start_time.isoformat(),
-        "end_time": event_obj.end_time.isoformat() if event_obj.end_time else None,
-        "status": status,
-        "organizer_name": organizer.event_org_name,
+        "id": alumni_id,
+        "name": name,
+        "email": email,
+        "graduation_year": graduation_year,
+        "major": department_name,
     }
-def post_event(db: Session, event_data: EventCreate):
-    new_event = Event(
+
+ALUMNUS_SHAPE = RowShape(id=0, name=1, email=2, graduation_year=3, major=4)
+
+def alumni_page_select(limit: int, after: Optional[str]):
+    stmt = alumni_select()
+    if after is not None:
+        (alumni_id,) = decode_keyset(after, int)
+        stmt = stmt.where(AlumniProfile.alumni_id > alumni_id)
+    return stmt.order_by(AlumniProfile.alumni_id).limit(limit + 1)
+
+def alumni_page_result(rows, limit: int, encoded: bool = False):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].alumni_id)
+    if encoded:
+        return ALUMNUS_SHAPE.encode(rows), next_cursor
+    return [alumnus_to_dict(row) for row in rows], next_cursor
+
+def get_alumni_page(session: Session, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None,
+                    encoded: bool = False):
+    """Returns one page of alumni ordered by alumni_id and the cursor for the next page."""
+    rows = session.execute(alumni_page_select(limit, after)).all()
+    return alumni_page_result(rows, limit, encoded)
+
+def iter_alumni(session: Session, batch_size: int = 500):
+    stmt = (
+        alumni_select()
+        .order_by(AlumniProfile.alumni_id)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in session.execute(stmt):
+        yield alumnus_to_dict(row)
+
+def profile_select(alumni_id: int):
+    """
+    Loads an alumnus with user, department, careers (+organization),
+    participations (+event, organizer) and donations in four queries, however
+    many careers or events the alumnus has.
+    """
+    return (
+        select(AlumniProfile)
+        .where(AlumniProfile.alumni_id == alumni_id)
+        .options(
+            joinedload(AlumniProfile.user),
+            joinedload(AlumniProfile.department),
+            selectinload(AlumniProfile.careers).joinedload(Career.organization),
+            selectinload(AlumniProfile.participations)
+            .joinedload(EventParticipation.event)
+            .joinedload(Event.organizer),
+            selectinload(AlumniProfile.donations),
+        )
+    )
+
+def profile_to_dict(profile: AlumniProfile):
+    return {
+        "id": profile.alumni_id,
+        "name": profile.alumni_name,
+        "email": profile.user.email,
+        "ph_no": profile.ph_no,
+        "graduation_year": profile.graduation_year,
+        "department": profile.department.department_name,
+        "bio": profile.bio,
+        "linkedin_profile_url": profile.linkedin_profile_url,
+        "careers": [
+            {
+                "career_id": career.career_id,
+                "organization": career.organization.organization_name,
+                "role": career.role,
+                "location": career.location,
+                "started_on": career.started_on,
+                "worked_till": career.worked_till,
+                "is_current": career.worked_till is None,
+                "description": career.description,
+            }
+            for career in profile.careers
+        ],
+        "events": [
+            {
+                "event_id": participation.event_id,
+                "title": participation.event.event_name,
+                "start_time": participation.event.start_time,
+                "end_time": participation.event.end_time,
+                "organizer_name": participation.event.organizer.event_org_name,
+                "role": participation.role.value,
+                "feedback": participation.feedback,
+            }
+            for participation in sorted(profile.participations, key=lambda p: p.event.start_time, reverse=True)
+        ],
+        "donations": [
+            {
+                "donation_id": donation.donation_id,
+                "event_id": donation.event_id,
+                "amount": donation.amount,
+                "currency": donation.currency,
+                "donation_date": donation.donation_date,
+            }
+            for donation in profile.donations
+        ],
+    }
+
+def get_alumnus_profile(session: Session, alumni_id: int):
+    profile = session.execute(profile_select(alumni_id)).unique().scalar_one_or_none()
+    return profile_to_dict(profile) if profile else None
+
+def new_event_from(event_data: EventCreate):
+    return Event(
         event_name=event_data.event_name,
         event_type=event_data.event_type,
         start_time=event_data.start_time,
         end_time=event_data.end_time,
         description=event_data.description,
         event_org_id=event_data.event_org_id,
-        req_donation=event_data.req_donation
+        req_donation=event_data.req_donation,
+        capacity=event_data.capacity,
     )
+
+def post_event(db: Session, event_data: EventCreate, allow_overlap: bool = False):
+    from event_calendar import EventClash, check_clashes  # imports crud
+
+    new_event = new_event_from(event_data)
     db.add(new_event)
+    db.flush()
+    if not allow_overlap:
+        try:
+            check_clashes(db, new_event)
+        except EventClash:
+            db.rollback()
+            raise
+    record_event(db, new_event)
     db.commit()
     db.refresh(new_event)
     return new_event
 
-def update_event(db: Session, event_id: int, update_data: EventUpdate):
+def apply_event_update(db: Session, event: Event, update_data: EventUpdate):
+    """Raises ValueError, before touching the event, if the update would end it before it starts."""
+    changes = update_data.dict(exclude_unset=True)
+    check_event_period(changes.get("start_time", event.start_time), changes.get("end_time", event.end_time))
+    old_day = event.start_time.date()
+    for field, value in changes.items():
+        setattr(event, field, value)
+    if event.start_time.date() != old_day:
+        bump(db, old_day, "events", -1)
+        record_event(db, event)
+
+def update_event(db: Session, event_id: int, update_data: EventUpdate, allow_overlap: bool = False):
+    from event_calendar import EventClash, check_clashes  # imports crud
+
     event = db.query(Event).filter(Event.event_id == event_id).first()
     if not event:
         return None
 
-    for field, value in update_data.dict(exclude_unset=True).items():
-        setattr(event, field, value)
+    apply_event_update(db, event, update_data)
+    if not allow_overlap:
+        try:
+            db.flush()
+            check_clashes(db, event)
+        except EventClash:
+            db.rollback()
+            raise
 
     db.commit()
     db.refresh(event)
@@ -101,13 +323,15 @@ def delete_event(db: Session, event_id: int):
     event = db.query(Event).filter(Event.event_id == event_id).first()
     if not event:
         return False
+    record_event(db, event, delta=-1)
     db.delete(event)
     db.commit()
     return True
 
-db = SessionLocal()
-try:
-    events = get_all_events(db)
-    print(json.dumps(events, indent=4, ensure_ascii=False))
-finally:
-    db.close()
\ No newline at end of file
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        events = get_all_events(db)
+        print(json.dumps(events, indent=4, ensure_ascii=False))
+    finally:
+        db.close()
@@ -0,0 +1,314 @@
+"""
+Donation ingestion from payment-gateway callbacks and settlement reports.
+
+Everything funnels into ingest_batch(): one INSERT ... ON CONFLICT
+(transaction_id) DO NOTHING RETURNING per batch. Only rows that were really
+inserted come back, so retried callbacks and rows already in a report are
+dropped by the database. Those inserted rows then move donation_totals (per
+event and currency, read by progress bars) and the analytics rollups in the
+same transaction.
+
+Callbacks must carry X-Signature, the hex HMAC-SHA256 of the raw body under
+DONATION_WEBHOOK_SECRET; without a configured secret every callback is refused.
+
+Callbacks are not written one by one. DonationFlusher collects them for up to
+DONATION_FLUSH_MS or DONATION_BATCH_SIZE items and commits them together. Each
+caller awaits its batch, so the gateway is only acknowledged after the commit.
+
+    python donations.py settlement.csv [--format jsonl]   # reconciliation import
+    python donations.py --refresh-totals                  # rebuild donation_totals
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import IO, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from bulk_import import ImportReport, chunked, read_rows
+from models import AlumniProfile, Donation, DonationTotal, Event
+from rollups import dialect_insert, record_donations
+
+DONATION_BATCH_SIZE = int(os.getenv("DONATION_BATCH_SIZE", 500))
+DONATION_FLUSH_MS = float(os.getenv("DONATION_FLUSH_MS", 50))
+DONATION_QUEUE_SIZE = int(os.getenv("DONATION_QUEUE_SIZE", 20000))
+DONATION_WEBHOOK_SECRET = os.getenv("DONATION_WEBHOOK_SECRET", "")
+SIGNATURE_HEADER = "X-Signature"
+# Rows per INSERT statement; keeps bind parameters under SQLite's limit.
+INSERT_CHUNK = 1000
+
+logger = logging.getLogger(__name__)
+
+if not DONATION_WEBHOOK_SECRET:
+    logger.warning("DONATION_WEBHOOK_SECRET is not set; donation callbacks will be refused")
+
+
+class DonationIn(BaseModel):
+    transaction_id: str = Field(..., min_length=1, max_length=128)
+    alumni_id: int
+    event_id: Optional[int] = None
+    amount: Decimal = Field(..., gt=0, max_digits=10, decimal_places=2)
+    currency: str = "INR"
+    donation_date: Optional[datetime] = None
+
+    @field_validator("event_id", "donation_date", mode="before")
+    @classmethod
+    def blank_to_none(cls, value):
+        return None if value == "" else value
+
+    @field_validator("currency")
+    @classmethod
+    def normalize_currency(cls, value: str):
+        value = value.strip().upper()
+        if len(value) != 3 or not value.isalpha():
+            raise ValueError("currency must be a 3-letter ISO code")
+        return value
+
+
+class BatchResult:
+    def __init__(self):
+        self.inserted: List[str] = []
+        self.duplicates: List[str] = []
+        self.rejected: Dict[str, str] = {}
+
+
+# --- writing ---
+
+def _known_ids(session: Session, column, ids) -> set:
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return set()
+    return set(session.scalars(select(column).where(column.in_(ids))))
+
+def ingest_batch(session: Session, donations: List[DonationIn]) -> BatchResult:
+    """Writes a batch idempotently and updates the totals; the caller commits."""
+    result = BatchResult()
+    alumni = _known_ids(session, AlumniProfile.alumni_id, (d.alumni_id for d in donations))
+    events = _known_ids(session, Event.event_id, (d.event_id for d in donations))
+    rows, seen = [], set()
+    now = datetime.now()
+    for d in donations:
+        if d.alumni_id not in alumni:
+            result.rejected[d.transaction_id] = f"unknown alumnus {d.alumni_id}"
+        elif d.event_id is not None and d.event_id not in events:
+            result.rejected[d.transaction_id] = f"unknown event {d.event_id}"
+        elif d.transaction_id in seen:
+            result.duplicates.append(d.transaction_id)
+        else:
+            seen.add(d.transaction_id)
+            rows.append({
+                "transaction_id": d.transaction_id, "alumni_id": d.alumni_id, "event_id": d.event_id,
+                "amount": d.amount, "currency": d.currency, "donation_date": d.donation_date or now,
+            })
+
+    inserted = []
+    for chunk in chunked(rows, INSERT_CHUNK):
+        stmt = (
+            dialect_insert(session)(Donation).values(chunk)
+            .on_conflict_do_nothing(index_elements=[Donation.transaction_id])
+            .returning(Donation.transaction_id, Donation.alumni_id, Donation.event_id,
+                       Donation.amount, Donation.currency, Donation.donation_date)
+        )
+        inserted.extend(session.execute(stmt).all())
+    result.inserted = [row.transaction_id for row in inserted]
+    new = set(result.inserted)
+    result.duplicates += [row["transaction_id"] for row in rows if row["transaction_id"] not in new]
+    if inserted:
+        _apply_totals(session, inserted)
+    return result
+
+def _apply_totals(session: Session, inserted):
+    departments = dict(session.execute(
+        select(AlumniProfile.alumni_id, AlumniProfile.department_id)
+        .where(AlumniProfile.alumni_id.in_({row.alumni_id for row in inserted}))
+    ).all())
+    totals: Dict[Tuple[int, str], List] = defaultdict(lambda: [Decimal(0), 0])
+    rollup: Dict[tuple, List] = defaultdict(lambda: [Decimal(0), 0])
+    for row in inserted:
+        totals[(row.event_id or 0, row.currency)][0] += row.amount
+        totals[(row.event_id or 0, row.currency)][1] += 1
+        key = (row.donation_date.date(), departments.get(row.alumni_id), row.event_id, row.currency)
+        rollup[key][0] += row.amount
+        rollup[key][1] += 1
+
+    stmt = dialect_insert(session)(DonationTotal).values([
+        {"event_id": event_id, "currency": currency, "total": amount, "donation_count": count}
+        for (event_id, currency), (amount, count) in totals.items()
+    ])
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=[DonationTotal.event_id, DonationTotal.currency],
+        set_={"total": DonationTotal.total + stmt.excluded.total,
+              "donation_count": DonationTotal.donation_count + stmt.excluded.donation_count},
+    ))
+    for (day, department_id, event_id, currency), (amount, count) in rollup.items():
+        record_donations(session, day, amount, count, department_id, event_id, currency)
+
+def refresh_donation_totals(session: Session):
+    """Rebuilds donation_totals from the donation table (after loads that bypass ingest_batch)."""
+    session.execute(delete(DonationTotal))
+    session.execute(insert(DonationTotal).from_select(
+        ["event_id", "currency", "total", "donation_count"],
+        select(func.coalesce(Donation.event_id, 0), Donation.currency, func.sum(Donation.amount), func.count())
+        .group_by(func.coalesce(Donation.event_id, 0), Donation.currency),
+    ))
+    session.commit()
+
+def donation_progress(session: Session, event_id: int) -> Optional[dict]:
+    target = session.scalar(select(Event.req_donation).where(Event.event_id == event_id))
+    if target is None:
+        return None
+    totals = session.execute(
+        select(DonationTotal.currency, DonationTotal.total, DonationTotal.donation_count)
+        .where(DonationTotal.event_id == event_id)
+    ).all()
+    return {
+        "event_id": event_id,
+        "target": target,
+        "totals": [{"currency": c, "total": t, "donations": n} for c, t, n in totals],
+    }
+
+
+# --- callbacks: group commit ---
+
+def verify_signature(body: bytes, signature: Optional[str]) -> bool:
+    if not DONATION_WEBHOOK_SECRET or not signature:
+        return False
+    expected = hmac.new(DONATION_WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+
+class DonationFlusher:
+    """Micro-batches callbacks into one transaction each; submit() resolves after the commit."""
+
+    def __init__(self, session_factory, batch_size: int = DONATION_BATCH_SIZE,
+                 flush_ms: float = DONATION_FLUSH_MS, on_flushed=None):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_seconds = flush_ms / 1000
+        self.on_flushed = on_flushed
+        self._queue: Optional[asyncio.Queue] = None
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    async def submit(self, donation: DonationIn) -> str:
+        """'inserted' or 'duplicate'; raises ValueError for rejected callbacks and
+        asyncio.QueueFull when the backlog is full."""
+        if self._queue is None:
+            outcomes = await asyncio.to_thread(self._flush, [donation])
+            return self._outcome(outcomes, donation)
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((donation, future))
+        return await future
+
+    @staticmethod
+    def _outcome(result: BatchResult, donation: DonationIn) -> str:
+        if donation.transaction_id in result.rejected:
+            raise ValueError(result.rejected[donation.transaction_id])
+        return "inserted" if donation.transaction_id in result.inserted else "duplicate"
+
+    def _flush(self, donations: List[DonationIn]) -> BatchResult:
+        with self.session_factory() as session:
+            result = ingest_batch(session, donations)
+            session.commit()
+        if result.inserted and self.on_flushed is not None:
+            inserted = set(result.inserted)
+            self.on_flushed({d.event_id for d in donations if d.transaction_id in inserted})
+        return result
+
+    async def run(self):
+        self._queue = asyncio.Queue(DONATION_QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.flush_seconds
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await self._settle(batch)
+        finally:
+            queue, self._queue = self._queue, None
+            while not queue.empty():
+                _, future = queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Donation flusher stopped"))
+
+    async def _settle(self, batch):
+        try:
+            result = await asyncio.to_thread(self._flush, [donation for donation, _ in batch])
+        except Exception as exc:
+            logger.exception("Donation batch of %d failed", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for donation, future in batch:
+            if future.done():
+                continue
+            try:
+                future.set_result(self._outcome(result, donation))
+            except ValueError as exc:
+                future.set_exception(exc)
+
+
+# --- reconciliation import ---
+
+def import_donations(session: Session, stream: IO[str], fmt: str = "csv", chunk_size: int = 5000) -> dict:
+    """Loads a gateway settlement report; rows already ingested from callbacks are skipped."""
+    report = ImportReport()
+    duplicates = 0
+    for chunk in chunked(read_rows(stream, fmt), chunk_size):
+        valid, lines = [], {}
+        for line, raw in chunk:
+            report.rows += 1
+            try:
+                donation = DonationIn.model_validate(raw)
+            except ValidationError as e:
+                report.error(line, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+                continue
+            valid.append(donation)
+            lines.setdefault(donation.transaction_id, line)
+        result = ingest_batch(session, valid)
+        session.commit()
+        report.inserted += len(result.inserted)
+        duplicates += len(result.duplicates)
+        for transaction_id, message in result.rejected.items():
+            report.error(lines[transaction_id], message)
+    return {**report.as_dict(), "duplicates": duplicates}
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Reconcile donations from a gateway settlement report.")
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("--format", choices=("csv", "jsonl"))
+    parser.add_argument("--refresh-totals", action="store_true", help="rebuild donation_totals and exit")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if args.refresh_totals:
+            refresh_donation_totals(db)
+            print("donation_totals rebuilt")
+        elif args.path:
+            fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+            with open(args.path, newline="", encoding="utf-8") as f:
+                print(json.dumps(import_donations(db, f, fmt), indent=4, default=str))
+        else:
+            parser.error("a settlement file or --refresh-totals is required")
@@ -0,0 +1,204 @@
+"""
+Calendar range reads and clash detection over event intervals.
+
+An event occupies [start_time, end_time). Events without an end (or ending at
+their start) occupy the single instant start_time. A window [from, to) returns
+every event overlapping it. Times are naive local time; aware input is
+converted first. A clash is an overlap with another event of the same
+organizer.
+
+- Postgres: a GiST expression index on tsrange(start_time, end_time). Queries
+  use the same expression with &&, so both the calendar read and the clash
+  check are one index scan.
+- Elsewhere (SQLite, tests): an in-process interval tree over all events,
+  rebuilt lazily after committed changes to event times, type or organizer.
+  Matching ids are then read by primary key; long id lists go to SQLite as one
+  JSON array through json_each instead of one bind parameter per id.
+"""
+import json
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from threading import RLock
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event as orm_event, func, inspect, literal_column, select, text
+from sqlalchemy.orm import Session
+
+from crud import event_to_dict, events_select
+from models import Event, EventType
+from schemas import naive_local
+
+MAX_WINDOW = timedelta(days=400)
+CLASH_LIMIT = 20
+# Above this many ids, SQLite reads them from a JSON array (its bind parameter limit can be as low as 999).
+INLINE_IDS = 500
+_INSTANT = timedelta(microseconds=1)
+
+# Must stay textually identical to the index expression for Postgres to use it.
+PERIOD_SQL = ("tsrange(start_time, greatest(end_time, start_time), "
+              "CASE WHEN end_time > start_time THEN '[)' ELSE '[]' END)")
+PG_CALENDAR_DDL = [f"CREATE INDEX IF NOT EXISTS ix_event_period ON event USING GIST (({PERIOD_SQL}))"]
+
+
+class EventClash(Exception):
+    def __init__(self, clashes: List[dict]):
+        super().__init__(f"Overlaps {len(clashes)} other event(s)")
+        self.clashes = clashes
+
+
+def effective_end(start: datetime, end: Optional[datetime]) -> datetime:
+    return end if end is not None and end > start else start + _INSTANT
+
+
+class IntervalTree:
+    """
+    Static interval tree: intervals sorted by start, plus a segment tree of the
+    maximum end over each range. A window [lo, hi) only has to look at the
+    prefix starting before hi (one bisect), and the segment tree skips every
+    subtree whose intervals all end by lo, so a query is O(log n + k).
+    """
+
+    def __init__(self, intervals: List[Tuple[datetime, datetime, int, EventType, int]]):
+        intervals = sorted(intervals)
+        self.starts = [i[0] for i in intervals]
+        self.items = intervals
+        size = 1
+        while size < max(len(intervals), 1):
+            size *= 2
+        self._size = size
+        self._max_end: List[Optional[datetime]] = [None] * (2 * size)
+        for position, interval in enumerate(intervals):
+            self._max_end[size + position] = interval[1]
+        for node in range(size - 1, 0, -1):
+            left, right = self._max_end[2 * node], self._max_end[2 * node + 1]
+            self._max_end[node] = left if right is None else right if left is None else max(left, right)
+
+    def __len__(self):
+        return len(self.items)
+
+    def overlapping(self, lo: datetime, hi: datetime) -> List[tuple]:
+        limit = bisect_left(self.starts, hi)
+        found: List[tuple] = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, left, right = stack.pop()
+            if left >= limit or self._max_end[node] is None or self._max_end[node] <= lo:
+                continue
+            if right - left == 1:
+                found.append(self.items[left])
+                continue
+            middle = (left + right) // 2
+            stack.append((2 * node + 1, middle, right))
+            stack.append((2 * node, left, middle))
+        return found
+
+
+_tree: Optional[IntervalTree] = None
+_tree_lock = RLock()
+
+
+def build_interval_tree(session: Session) -> IntervalTree:
+    rows = session.execute(
+        select(Event.start_time, Event.end_time, Event.event_id, Event.event_type, Event.event_org_id)
+        .execution_options(yield_per=5000)
+    )
+    return IntervalTree([(s, effective_end(s, e), event_id, event_type, org_id)
+                         for s, e, event_id, event_type, org_id in rows])
+
+def get_interval_tree(session: Session) -> IntervalTree:
+    global _tree
+    with _tree_lock:
+        if _tree is None:
+            _tree = build_interval_tree(session)
+        return _tree
+
+def reset_interval_tree():
+    global _tree
+    with _tree_lock:
+        _tree = None
+
+
+def _is_postgres(session: Session) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+def _overlap_select(session: Session, lo: datetime, hi: datetime, event_type: Optional[EventType] = None,
+                    event_org_id: Optional[int] = None, exclude_id: Optional[int] = None):
+    stmt = events_select(None, datetime.now())
+    if _is_postgres(session):
+        stmt = stmt.where(literal_column(PERIOD_SQL).op("&&")(func.tsrange(lo, hi, literal_column("'[)'"))))
+        if event_type is not None:
+            stmt = stmt.where(Event.event_type == event_type)
+        if event_org_id is not None:
+            stmt = stmt.where(Event.event_org_id == event_org_id)
+        if exclude_id is not None:
+            stmt = stmt.where(Event.event_id != exclude_id)
+    else:
+        ids = [
+            event_id for _, _, event_id, type_, org_id in get_interval_tree(session).overlapping(lo, hi)
+            if (event_type is None or type_ == event_type) and (event_org_id is None or org_id == event_org_id)
+            and event_id != exclude_id
+        ]
+        if len(ids) > INLINE_IDS and session.get_bind().dialect.name == "sqlite":
+            values = func.json_each(json.dumps(ids)).table_valued("value")
+            stmt = stmt.where(Event.event_id.in_(select(values.c.value)))
+        else:
+            stmt = stmt.where(Event.event_id.in_(ids))
+    return stmt.order_by(Event.start_time, Event.event_id)
+
+def events_in_range(session: Session, start: datetime, end: datetime, event_type: Optional[EventType] = None,
+                    event_org_id: Optional[int] = None) -> List[dict]:
+    """Events overlapping [start, end), in start order."""
+    start, end = naive_local(start), naive_local(end)
+    if end <= start:
+        raise ValueError("'to' must be after 'from'")
+    if end - start > MAX_WINDOW:
+        raise ValueError(f"Window is limited to {MAX_WINDOW.days} days")
+    rows = session.execute(_overlap_select(session, start, end, event_type, event_org_id)).all()
+    return [event_to_dict(row) for row in rows]
+
+def find_clashes(session: Session, start: datetime, end: Optional[datetime], event_org_id: int,
+                 exclude_id: Optional[int] = None) -> List[dict]:
+    """Events of the same organizer overlapping [start, end)."""
+    start, end = naive_local(start), naive_local(end)
+    stmt = _overlap_select(session, start, effective_end(start, end), event_org_id=event_org_id,
+                           exclude_id=exclude_id).limit(CLASH_LIMIT)
+    return [event_to_dict(row) for row in session.execute(stmt).all()]
+
+def check_clashes(session: Session, event: Event):
+    """Raises EventClash if `event` (already flushed) overlaps another event of its organizer."""
+    clashes = find_clashes(session, event.start_time, event.end_time, event.event_org_id, exclude_id=event.event_id)
+    if clashes:
+        raise EventClash(clashes)
+
+def create_calendar_index(session: Session):
+    if not _is_postgres(session):
+        return
+    for statement in PG_CALENDAR_DDL:
+        session.execute(text(statement))
+    session.commit()
+
+
+# --- keeping the tree fresh ---
+
+_TRACKED = ("start_time", "end_time", "event_type", "event_org_id")
+
+@orm_event.listens_for(Session, "after_flush")
+def _collect_event_changes(session, flush_context):
+    for obj in (*session.new, *session.deleted, *session.dirty):
+        if isinstance(obj, Event) and (
+            obj in session.new or obj in session.deleted
+            or any(inspect(obj).attrs[key].history.has_changes() for key in _TRACKED)
+        ):
+            session.info["calendar_changed"] = True
+            return
+
+@orm_event.listens_for(Session, "after_commit")
+def _publish_event_changes(session):
+    if session.info.pop("calendar_changed", False):
+        reset_interval_tree()
+
+@orm_event.listens_for(Session, "after_rollback")
+def _discard_event_changes(session):
+    # A tree built inside the rolled-back transaction may hold its uncommitted rows.
+    if session.info.pop("calendar_changed", False):
+        reset_interval_tree()
@@ -0,0 +1,182 @@
+"""
+Streaming exports for the admin pages.
+
+Rows are read through a server-side cursor (yield_per) and written out in
+fixed-size batches, so memory stays flat and the CSV header reaches the
+client before the first row is even fetched.
+"""
+import csv
+import enum
+import io
+import os
+import tempfile
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from database import SessionLocal
+from models import AlumniProfile, Department, Donation, Event, EventParticipation, User
+
+EXPORT_BATCH_SIZE = 2000
+
+_donor = aliased(AlumniProfile)
+_participant = aliased(AlumniProfile)
+
+# Column name -> SQL expression, in default output order.
+DATASETS: Dict[str, dict] = {
+    "alumni": {
+        "columns": {
+            "id": AlumniProfile.alumni_id,
+            "name": AlumniProfile.alumni_name,
+            "email": User.email,
+            "graduation_year": AlumniProfile.graduation_year,
+            "department_id": AlumniProfile.department_id,
+            "department": Department.department_name,
+            "ph_no": AlumniProfile.ph_no,
+            "linkedin_profile_url": AlumniProfile.linkedin_profile_url,
+            "bio": AlumniProfile.bio,
+        },
+        "joins": [
+            (User, User.user_id == AlumniProfile.alumni_id),
+            (Department, Department.department_id == AlumniProfile.department_id),
+        ],
+        "root": AlumniProfile,
+        "profile": AlumniProfile,
+        "date_column": None,
+        "order_by": AlumniProfile.alumni_id,
+    },
+    "donations": {
+        "columns": {
+            "donation_id": Donation.donation_id,
+            "alumni_id": Donation.alumni_id,
+            "alumni_name": _donor.alumni_name,
+            "department_id": _donor.department_id,
+            "graduation_year": _donor.graduation_year,
+            "event_id": Donation.event_id,
+            "event_name": Event.event_name,
+            "amount": Donation.amount,
+            "currency": Donation.currency,
+            "transaction_id": Donation.transaction_id,
+            "donation_date": Donation.donation_date,
+        },
+        "joins": [
+            (_donor, _donor.alumni_id == Donation.alumni_id),
+            (Event, Event.event_id == Donation.event_id, True),
+        ],
+        "root": Donation,
+        "profile": _donor,
+        "date_column": Donation.donation_date,
+        "order_by": Donation.donation_id,
+    },
+    "participation": {
+        "columns": {
+            "event_id": EventParticipation.event_id,
+            "event_name": Event.event_name,
+            "start_time": Event.start_time,
+            "alumni_id": EventParticipation.alumni_id,
+            "alumni_name": _participant.alumni_name,
+            "department_id": _participant.department_id,
+            "graduation_year": _participant.graduation_year,
+            "role": EventParticipation.role,
+            "feedback": EventParticipation.feedback,
+        },
+        "joins": [
+            (Event, Event.event_id == EventParticipation.event_id),
+            (_participant, _participant.alumni_id == EventParticipation.alumni_id),
+        ],
+        "root": EventParticipation,
+        "profile": _participant,
+        "date_column": Event.start_time,
+        "order_by": (EventParticipation.event_id, EventParticipation.alumni_id),
+    },
+}
+
+
+def resolve_columns(dataset: str, columns: Optional[str]) -> List[str]:
+    available = DATASETS[dataset]["columns"]
+    if not columns:
+        return list(available)
+    selected = [name.strip() for name in columns.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown columns for {dataset}: {', '.join(unknown)}")
+    return selected
+
+def build_export_query(dataset: str, columns: List[str], graduation_year: Optional[int] = None,
+                       department_id: Optional[int] = None, from_date: Optional[date] = None,
+                       to_date: Optional[date] = None):
+    spec = DATASETS[dataset]
+    stmt = select(*(spec["columns"][name] for name in columns)).select_from(spec["root"])
+    for target, onclause, *outer in spec["joins"]:
+        stmt = stmt.join(target, onclause, isouter=bool(outer))
+
+    profile = spec["profile"]
+    if graduation_year is not None:
+        stmt = stmt.where(profile.graduation_year == graduation_year)
+    if department_id is not None:
+        stmt = stmt.where(profile.department_id == department_id)
+    date_column = spec["date_column"]
+    if date_column is not None:
+        if from_date is not None:
+            stmt = stmt.where(date_column >= datetime.combine(from_date, time()))
+        if to_date is not None:
+            stmt = stmt.where(date_column < datetime.combine(to_date + timedelta(days=1), time()))
+    order_by = spec["order_by"]
+    return stmt.order_by(*order_by) if isinstance(order_by, tuple) else stmt.order_by(order_by)
+
+def _cell(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+def _batches(stmt, batch_size: int) -> Iterator[list]:
+    session = SessionLocal()
+    try:
+        result = session.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield partition
+    finally:
+        session.close()
+
+def stream_csv(stmt, columns: List[str], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+
+    for partition in _batches(stmt, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_cell(value) for value in row] for row in partition)
+        yield buffer.getvalue()
+
+def stream_xlsx(stmt, columns: List[str], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    XLSX is a zip, so it can only be sent once complete; openpyxl's write-only
+    mode keeps memory flat while the sheet is spooled to a temporary file.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(columns)
+    for partition in _batches(stmt, batch_size):
+        for row in partition:
+            sheet.append([_cell(value) for value in row])
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook.save(path)
+        with open(path, "rb") as f:
+            while chunk := f.read(64 * 1024):
+                yield chunk
+    finally:
+        os.remove(path)
+
+def xlsx_available() -> bool:
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
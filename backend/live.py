@@ -0,0 +1,195 @@
+"""
+Server-Sent Events for event changes, so clients stop polling /api/events.
+
+One in-process EventBroker fans every message out to all connected clients:
+the payload is encoded once and dropped into each client's bounded queue.
+One StatusScheduler task sleeps until the next start_time/end_time in a short
+look-ahead window and announces Upcoming -> Ongoing -> Completed transitions;
+one heartbeat task keeps idle connections open. Thousands of clients therefore
+cost two timers, not thousands of polls.
+
+Messages (SSE `event:` names): event.created, event.updated, event.deleted,
+event.status {id, status}, event.participants {id, participant_count} and
+event.donations {id} (totals changed; re-read /api/event/{id}/donations).
+Clients that fall too far behind are disconnected; EventSource reconnects
+with Last-Event-ID and missed messages are replayed from a short history.
+"""
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Deque, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, or_, select
+
+from models import Event
+
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", 256))
+SSE_HISTORY = int(os.getenv("SSE_HISTORY", 1000))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+STATUS_HORIZON = timedelta(minutes=10)
+
+logger = logging.getLogger(__name__)
+
+_CLOSE = None
+_HEARTBEAT = b": keep-alive\n\n"
+
+
+class EventBroker:
+    def __init__(self, queue_size: int = SSE_QUEUE_SIZE, history: int = SSE_HISTORY):
+        self._queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._history: Deque[Tuple[int, bytes]] = deque(maxlen=history)
+        self._next_id = 1
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.disconnected_slow = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def publish(self, kind: str, data: dict):
+        """Safe to call from the event loop or from worker threads; a no-op until the app has started."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fanout(kind, data)
+        else:
+            loop.call_soon_threadsafe(self._fanout, kind, data)
+
+    def _fanout(self, kind: str, data: dict):
+        message_id = self._next_id
+        self._next_id += 1
+        message = f"id: {message_id}\nevent: {kind}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+        self._history.append((message_id, message))
+        self._send(message)
+
+    def _send(self, message: Optional[bytes]):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too far behind: cut it loose; it resumes from history on reconnect.
+                self._subscribers.discard(queue)
+                self.disconnected_slow += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_CLOSE)
+
+    def _replay(self, last_event_id: Optional[str]) -> List[bytes]:
+        try:
+            last = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last = None
+        if last is None:
+            return []
+        return [message for message_id, message in self._history if message_id > last]
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        queue: asyncio.Queue = asyncio.Queue(self._queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield b"retry: 3000\n\n"
+            for message in self._replay(last_event_id):
+                yield message
+            while True:
+                message = await queue.get()
+                if message is _CLOSE:
+                    return
+                yield message
+        finally:
+            self._subscribers.discard(queue)
+
+    async def run_heartbeat(self, interval: float = SSE_HEARTBEAT_SECONDS):
+        while True:
+            await asyncio.sleep(interval)
+            self._send(_HEARTBEAT)
+
+    def close(self):
+        """Ends every open stream (on shutdown)."""
+        self._send(_CLOSE)
+        self._subscribers.clear()
+
+
+class StatusScheduler:
+    """Announces status transitions at each event's start_time and end_time.
+
+    Only the next STATUS_HORIZON of transitions is loaded (two indexed range
+    scans); reschedule() makes it reload early after events are written.
+    """
+
+    def __init__(self, broker: EventBroker, session_factory,
+                 on_transition: Optional[Callable[[int], None]] = None):
+        self.broker = broker
+        self.session_factory = session_factory
+        self.on_transition = on_transition
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def reschedule(self):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _load(self, since: datetime, until: datetime) -> List[Tuple[datetime, int, str]]:
+        with self.session_factory() as session:
+            rows = session.execute(
+                select(Event.event_id, Event.start_time, Event.end_time).where(or_(
+                    and_(Event.start_time > since, Event.start_time <= until),
+                    and_(Event.end_time > since, Event.end_time <= until),
+                ))
+            ).all()
+        transitions = []
+        for event_id, start_time, end_time in rows:
+            if since < start_time <= until and (end_time is None or end_time >= start_time):
+                transitions.append((start_time, event_id, "Ongoing"))
+            if end_time is not None and since < end_time <= until:
+                transitions.append((end_time, event_id, "Completed"))
+        return sorted(transitions)
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleeps up to `seconds`; True if woken early by reschedule()."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), max(seconds, 0))
+        except asyncio.TimeoutError:
+            return False
+        self._wake.clear()
+        return True
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        since = datetime.now()
+        while True:
+            until = datetime.now() + STATUS_HORIZON
+            try:
+                transitions = await asyncio.to_thread(self._load, since, until)
+            except Exception:
+                logger.exception("Loading event status transitions failed")
+                await self._sleep(30)
+                continue
+            woken = False
+            for when, event_id, status in transitions:
+                if await self._sleep((when - datetime.now()).total_seconds()):
+                    woken = True
+                    break
+                since = when
+                self.broker.publish("event.status", {"id": str(event_id), "status": status})
+                if self.on_transition is not None:
+                    self.on_transition(event_id)
+            if woken:
+                continue
+            if not await self._sleep((until - datetime.now()).total_seconds()):
+                since = until
+
+
+broker = EventBroker()
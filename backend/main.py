@@ -1,10 +1,53 @@
-from fastapi import FastAPI, HTTPException, Depends
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Body, Depends, File, Header, Query, Request, Response, UploadFile
+from pydantic import BaseModel, ValidationError
+from typing import List, Literal, Optional
+from datetime import date
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from passlib.context import CryptContext
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from time import perf_counter
+from database import AsyncSessionLocal, SessionLocal, get_async_db, get_db, get_engine, pool_status
+from schemas import (
+    AlumniProfileOut, AlumniSearchHit, DonationProgress, DonationReceipt, EventCreate, EventOut, EventUpdate,
+    LocalDateTime, MentorRecommendation, MentorshipBulkAction, MentorshipBulkResult, MentorshipRequestOut, NetworkAlumnus,
+    NetworkFacets, OpportunityCreate, OpportunityOut, ParticipantIn, ParticipantRemoval, ParticipantUpdate,
+    ParticipationBatchResult,
+)
+import async_crud
+from cache import cached_json, invalidate
+from serialization import json_response
+from search import search_alumni
+from rollups import summarize
+from recommend import recommend_mentors
+from network import network_alumni, network_facets
+from mentorship import get_request_queue, process_requests
+import participation
+from event_calendar import EventClash
+from donations import (
+    SIGNATURE_HEADER, DonationFlusher, DonationIn, donation_progress, import_donations, verify_signature,
+)
+from opportunities import OPPORTUNITY_EXPIRY_INTERVAL, run_expiry_loop
+from live import StatusScheduler, broker
+from models import EventType, MentorshipStatus, OpportunityType, UserRole
+from tokens import InvalidToken, TokenClaims, current_user, decode_token, issue_tokens, require_role, revoke
+from bulk_import import DEFAULT_CHUNK_SIZE, import_alumni
+from exports import DATASETS, build_export_query, resolve_columns, stream_csv, stream_xlsx, xlsx_available
+import io
+import asyncio
+from auth import (
+    UNUSABLE_PASSWORD, HashQueueFull, hash_password_async, hash_stats,
+    shutdown_hash_pool, verify_password_async,
+)
+from profiling import ProfiledRoute, ProfilingMiddleware, metrics
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, ndjson_response
+from repository import AlumnusRecord, EventRecord, alumni_repository, event_repository
 
 app = FastAPI()
+app.router.route_class = ProfiledRoute
 
 # CORS Middleware
 origins = [
@@ -19,6 +62,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilingMiddleware, exclude_paths=("/api/events/stream",))
 
 # --- Models ---
 class Alumnus(BaseModel):
@@ -28,12 +72,6 @@ class Alumnus(BaseModel):
     graduation_year: int
     major: str
 
-class Event(BaseModel):
-    id: int
-    title: str
-    description: str
-    date: str
-
 class LoginData(BaseModel):
     email: str
     password: str
@@ -44,140 +82,592 @@ class UserInDB(BaseModel):
     hashed_password: str
     role: str # "student", "alumni", or "admin"
 
-# Dummy Data
-fake_alumni_db = [
-    {"id": 1, "name": "John Doe", "email": "john.doe@example.com", "graduation_year": 2010, "major": "Computer Science"},
-    {"id": 2, "name": "Jane Smith", "email": "jane.smith@example.com", "graduation_year": 2012, "major": "Electrical Engineering"}
-]
-fake_events_db = [
-    {"id": 1, "title": "Alumni Meet 2025", "description": "Annual alumni meet.", "date": "2025-12-25"},
-    {"id": 2, "title": "Tech Talk", "description": "A talk on recent advancements in AI.", "date": "2025-11-15"}
-]
+EventStatus = Literal["Ongoing", "Upcoming", "Completed"]
+
+async def fetch_page(fetch, response: Response, *args):
+    """Runs a keyset page query; the next cursor is returned in the X-Next-Cursor header."""
+    try:
+        items, next_cursor = await fetch(*args)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+async def stream_rows(iter_rows, *args):
+    # Streaming outlives the request-scoped session, so it opens its own.
+    async with AsyncSessionLocal() as session:
+        async for row in iter_rows(session, *args):
+            yield row
 
 # --- Hardcoded User Data ---
-plain_users = {
-    "admin@example.com": {"password": "adminpassword", "role": "Admin"},
-    "student@example.com": {"password": "studentpassword", "role": "Student"},
-    "alumni@example.com": {"password": "alumnipassword", "role": "Alumni"},
+# bcrypt hashes of "adminpassword", "studentpassword" and "alumnipassword",
+# precomputed so workers don't spend ~1s of CPU hashing them at startup.
+fake_users_db = {
+    "admin@example.com": {
+        "hashed_password": "$2b$12$Bmh4xBBWcWZkeyKjmtJ0QecNA3YkVj41R3SETdb580bPFi7iUv1Na",
+        "role": "Admin",
+    },
+    "student@example.com": {
+        "hashed_password": "$2b$12$uV7sySImFM8zeozd8mdz3OaaX.UnjJvf.IxFE159gEGOgEcaJ49dG",
+        "role": "Student",
+    },
+    "alumni@example.com": {
+        "hashed_password": "$2b$12$.Fo.K/Ye7/ZYzFKjWJWPg.uLc24ktl9mvEq6dk5.x6mTT37pya0eu",
+        "role": "Alumni",
+    },
 }
 
-fake_users_db = {}
+
+background_tasks = set()
+def invalidate_event(event_id: int):
+    event_repository.invalidate(event_id)
+    invalidate("events", f"event:{event_id}")
+
+def invalidate_alumnus(alumnus_id: int):
+    alumni_repository.invalidate(alumnus_id)
+    invalidate("alumni", f"alumni:{alumnus_id}")
+
+status_scheduler = StatusScheduler(broker, SessionLocal, invalidate_event)
+
+def donations_flushed(event_ids):
+    for event_id in event_ids:
+        if event_id is not None:
+            broker.publish("event.donations", {"id": str(event_id)})
+
+donation_flusher = DonationFlusher(SessionLocal, on_flushed=donations_flushed)
 
 @app.on_event("startup")
-def startup_event():
-    """Hashes the plain text passwords on application startup."""
-    for email, user_data in plain_users.items():
-        fake_users_db[email] = {
-            "hashed_password": pwd_context.hash(user_data["password"]),
-            "role": user_data["role"]
-        }
-        
+async def start_background_jobs():
+    broker.bind(asyncio.get_running_loop())
+    jobs = [broker.run_heartbeat(), status_scheduler.run(), donation_flusher.run()]
+    if OPPORTUNITY_EXPIRY_INTERVAL > 0:
+        jobs.append(run_expiry_loop(SessionLocal, lambda expired: invalidate("opportunities")))
+    background_tasks.update(asyncio.create_task(job) for job in jobs)
+
+@app.on_event("shutdown")
+def shutdown_event():
+    broker.close()
+    for task in background_tasks:
+        task.cancel()
+    shutdown_hash_pool()
+
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Alumni Portal API"}
 
 
-# Password Hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def hash_queue_full():
+    return HTTPException(status_code=429, detail="Too many login attempts in progress, try again shortly",
+                         headers={"Retry-After": "1"})
+
+@app.get("/health/db")
+def health_db():
+    start = perf_counter()
+    try:
+        with get_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=503, detail={"status": "unavailable", "error": type(e).__name__, **pool_status()})
+    return {"status": "ok", "ping_ms": round((perf_counter() - start) * 1000, 2), **pool_status()}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    """Per-route request, DB and serialization metrics in Prometheus text format."""
+    return metrics.render()
+
+@app.get("/metrics/hashing")
+def hashing_metrics():
+    return hash_stats.snapshot()
 
 @app.get("/api/analytics")
-def analytics():
-    return {"alumni_count": len(fake_alumni_db), "event_count": len(fake_events_db), "donations": 15000}
+def analytics(
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+):
+    """Dashboard counters for an optional [from, to] date range, served from the analytics rollups."""
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    return summarize(db, from_date, to_date)
+
+@app.post("/api/admin/alumni/import")
+def import_alumni_register(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "jsonl"]] = None,
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=100, le=50000),
+    db: Session = Depends(get_db),
+    claims: TokenClaims = Depends(require_role(UserRole.Admin)),
+):
+    """Bulk-loads an alumni register; bad rows are reported per line instead of failing the upload."""
+    fmt = format or ("jsonl" if (file.filename or "").endswith((".jsonl", ".ndjson")) else "csv")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    report = import_alumni(db, stream, fmt, chunk_size)
+    if report["inserted"]:
+        invalidate("alumni")
+    return report
+
+@app.post("/api/admin/donations/import")
+def import_donation_settlement(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "jsonl"]] = None,
+    db: Session = Depends(get_db),
+    claims: TokenClaims = Depends(require_role(UserRole.Admin)),
+):
+    """Reconciles a gateway settlement report; transactions already received by callback are skipped."""
+    fmt = format or ("jsonl" if (file.filename or "").endswith((".jsonl", ".ndjson")) else "csv")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    return import_donations(db, stream, fmt)
+
+@app.get("/api/admin/export/{dataset}")
+def export_dataset(
+    dataset: Literal["alumni", "donations", "participation"],
+    format: Literal["csv", "xlsx"] = "csv",
+    columns: Optional[str] = Query(None, description="comma-separated column names"),
+    graduation_year: Optional[int] = None,
+    department_id: Optional[int] = None,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    claims: TokenClaims = Depends(require_role(UserRole.Admin)),
+):
+    try:
+        selected = resolve_columns(dataset, columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if (from_date or to_date) and DATASETS[dataset]["date_column"] is None:
+        raise HTTPException(status_code=400, detail=f"{dataset} export has no date to filter on")
+    stmt = build_export_query(dataset, selected, graduation_year, department_id, from_date, to_date)
+
+    filename = f"{dataset}-{date.today().isoformat()}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == "xlsx":
+        if not xlsx_available():
+            raise HTTPException(status_code=501, detail="XLSX export needs openpyxl installed")
+        return StreamingResponse(
+            stream_xlsx(stmt, selected),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers=headers,
+        )
+    return StreamingResponse(stream_csv(stmt, selected), media_type="text/csv", headers=headers)
 
 # Signup
 @app.post("/api/signup")
-def signup(user_data: UserInDB):
+async def signup(user_data: UserInDB):
     if user_data.username in fake_users_db:
         return {"error": "Username already exists"}
-    hashed_password = pwd_context.hash(user_data.hashed_password)
+    try:
+        hashed_password = await hash_password_async(user_data.hashed_password)
+    except HashQueueFull:
+        raise hash_queue_full()
     user_in_db = UserInDB(username=user_data.username, hashed_password=hashed_password, role=user_data.role)
     fake_users_db[user_data.username] = user_in_db.dict()
     return {"message": f"User {user_data.username} created successfully"}
 
 
 # Login
+async def find_user(db: AsyncSession, email: str):
+    """(password hash, role, user id) for a demo account or a registered user, else None."""
+    user_in_db = fake_users_db.get(email)
+    if user_in_db:
+        role = next((r for r in UserRole if r.value.lower() == user_in_db["role"].lower()), None)
+        return (user_in_db["hashed_password"], role, None) if role else None
+    user = await async_crud.get_user_by_email(db, email)
+    if user is None:
+        return None
+    return user.password_hash, user.role, user.user_id
+
 @app.post("/api/login")
-def login(login_data: LoginData):
+async def login(login_data: LoginData, db: AsyncSession = Depends(get_async_db)):
     """
-    Authenticates a user based on email, password, and role.
+    Authenticates a user based on email, password, and role, and issues an
+    access/refresh token pair so later requests skip the password check.
     """
-    user_in_db = fake_users_db.get(login_data.email)
+    user_in_db = await find_user(db, login_data.email)
 
     if not user_in_db:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    hashed_password, role, user_id = user_in_db
 
-    if login_data.role.lower() != user_in_db["role"].lower():
+    if login_data.role.lower() != role.value.lower():
         raise HTTPException(status_code=401, detail="Incorrect role for this user")
 
-    if not pwd_context.verify(login_data.password, user_in_db["hashed_password"]):
+    try:
+        password_ok = await verify_password_async(login_data.password, hashed_password)
+    except HashQueueFull:
+        raise hash_queue_full()
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
 
-    return {"message": f"Welcome {login_data.email}", "role": user_in_db["role"]}
+    return {"message": f"Welcome {login_data.email}", **issue_tokens(login_data.email, role, user_id)}
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+@app.post("/api/token/refresh")
+async def refresh_token(body: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """Rotates a refresh token; the only token path that reads the user store."""
+    try:
+        claims = decode_token(body.refresh_token, "refresh")
+    except InvalidToken as exc:
+        raise HTTPException(status_code=401, detail=str(exc))
+    user_in_db = await find_user(db, claims.sub)
+    if not user_in_db or user_in_db[0] == UNUSABLE_PASSWORD:
+        raise HTTPException(status_code=401, detail="Account no longer active")
+    _, role, user_id = user_in_db
+    revoke(claims)
+    return issue_tokens(claims.sub, role, user_id)
+
+@app.post("/api/logout")
+def logout(body: Optional[RefreshRequest] = None, claims: TokenClaims = Depends(current_user)):
+    revoke(claims)
+    if body is not None:
+        try:
+            revoke(decode_token(body.refresh_token, "refresh"))
+        except InvalidToken:
+            pass
+    return {"message": "Logged out"}
+
+@app.get("/api/me")
+def whoami(claims: TokenClaims = Depends(current_user)):
+    return {"email": claims.sub, "role": claims.role.value, "user_id": claims.uid}
 
 # Events
-@app.get("/api/events", response_model=List[Event])
-# ... existing code ...
-def get_events():
-    return fake_events_db
-
-@app.post("/api/events", response_model=Event)
-def create_event(event: Event):
-    fake_events_db.append(event.dict())
+@app.get("/api/events", response_model=List[EventOut])
+async def get_events(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    status: Optional[EventStatus] = None,
+    stream: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    if stream:
+        return ndjson_response(stream_rows(async_crud.iter_events, status))
+    return await cached_json(request, ("events",), lambda response: fetch_page(
+        async_crud.get_events_page, response, db, limit, after, status, True
+    ))
+
+def clash_conflict(exc: EventClash):
+    return HTTPException(status_code=409, detail={"message": str(exc), "clashes": exc.clashes})
+
+@app.get("/api/events/calendar", response_model=List[EventOut])
+async def events_calendar(
+    from_time: LocalDateTime = Query(..., alias="from"),
+    to_time: LocalDateTime = Query(..., alias="to"),
+    event_type: Optional[EventType] = None,
+    event_org_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Events overlapping [from, to), for month/week calendar views."""
+    try:
+        return await async_crud.get_events_in_range(db, from_time, to_time, event_type, event_org_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@app.post("/api/events", response_model=EventOut)
+async def create_event(event: EventCreate, allow_overlap: bool = False, db: AsyncSession = Depends(get_async_db)):
+    """
+    Rejected with 409 and the clashing events if it overlaps another event of
+    the same organizer, unless allow_overlap is set.
+    """
+    try:
+        created = await async_crud.post_event(db, event, allow_overlap)
+    except EventClash as exc:
+        raise clash_conflict(exc)
+    invalidate("events")
+    broker.publish("event.created", created)
+    status_scheduler.reschedule()
+    return created
+
+@app.get("/api/event/{event_id}", response_model=EventOut)
+async def get_event(request: Request, event_id: int, db: AsyncSession = Depends(get_async_db)):
+    async def load(event_id: int):
+        event = await async_crud.get_event(db, event_id)
+        return EventRecord.from_dict(event) if event else None
+
+    async def produce(response: Response):
+        event = await event_repository.aget(event_id, load)
+        if event is None:
+            raise HTTPException(status_code=404, detail="Event not found")
+        return event.to_dict()
+
+    return await cached_json(request, (f"event:{event_id}",), produce)
+
+@app.put("/api/event/{event_id}", response_model=EventOut)
+async def update_event(event_id: int, updated_event: EventUpdate, allow_overlap: bool = False,
+                       db: AsyncSession = Depends(get_async_db)):
+    try:
+        event = await async_crud.update_event(db, event_id, updated_event, allow_overlap)
+    except EventClash as exc:
+        raise clash_conflict(exc)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    invalidate_event(event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    broker.publish("event.updated", event)
+    status_scheduler.reschedule()
     return event
 
-@app.get("/api/event/{event_id}", response_model=Event)
-def get_event(event_id: int):
-    for event in fake_events_db:
-        if event["id"] == event_id:
-            return event
-    return {"error": "Event not found"}
-
-@app.put("/api/event/{event_id}", response_model=Event)
-def update_event(event_id: int, updated_event: Event):
-    for i, event in enumerate(fake_events_db):
-        if event["id"] == event_id:
-            fake_events_db[i] = updated_event.dict()
-            return updated_event
-    return {"error": "Event not found"}
-
 @app.delete("/api/event/{event_id}")
-def delete_event(event_id: int):
-    for i, event in enumerate(fake_events_db):
-        if event["id"] == event_id:
-            del fake_events_db[i]
-            return {"message": "Event deleted"}
-    return {"error": "Event not found"}
+async def delete_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
+    try:
+        deleted = await async_crud.delete_event(db, event_id)
+    except async_crud.ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    invalidate_event(event_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Event not found")
+    broker.publish("event.deleted", {"id": str(event_id)})
+    return {"message": "Event deleted"}
+
+@app.get("/api/events/stream")
+async def event_stream(last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events: event.created/updated/deleted, event.status transitions and event.participants."""
+    return StreamingResponse(
+        broker.subscribe(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Participants: whole batches in one transaction
+def write_participants(write, db: Session, event_id: int, payload):
+    try:
+        result = write(db, event_id, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except participation.CapacityExceeded as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    invalidate_event(event_id)
+    broker.publish("event.participants", {"id": str(event_id), "participant_count": result["participant_count"]})
+    return result
+
+@app.post("/api/event/{event_id}/participants", response_model=ParticipationBatchResult)
+def add_participants(event_id: int, participants: List[ParticipantIn] = Body(..., max_length=10000),
+                     db: Session = Depends(get_db),
+                     claims: TokenClaims = Depends(require_role(UserRole.Admin))):
+    return write_participants(participation.add_participants, db, event_id, participants)
+
+@app.patch("/api/event/{event_id}/participants", response_model=ParticipationBatchResult)
+def update_participants(event_id: int, updates: List[ParticipantUpdate] = Body(..., max_length=10000),
+                        db: Session = Depends(get_db),
+                        claims: TokenClaims = Depends(require_role(UserRole.Admin))):
+    return write_participants(participation.update_participants, db, event_id, updates)
+
+@app.delete("/api/event/{event_id}/participants", response_model=ParticipationBatchResult)
+def remove_participants(event_id: int, removal: ParticipantRemoval, db: Session = Depends(get_db),
+                        claims: TokenClaims = Depends(require_role(UserRole.Admin))):
+    return write_participants(participation.remove_participants, db, event_id, removal.alumni_ids)
+
+# Donations: gateway callbacks are group-committed by the flusher
+@app.post("/api/donations/callback", response_model=DonationReceipt)
+async def donation_callback(request: Request, x_signature: Optional[str] = Header(None)):
+    """Acknowledged once the donation is committed; retries of a known transaction_id report 'duplicate'."""
+    body = await request.body()
+    if not verify_signature(body, x_signature):
+        raise HTTPException(status_code=401, detail=f"Missing or invalid {SIGNATURE_HEADER}")
+    try:
+        donation = DonationIn.model_validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors())
+    try:
+        status = await donation_flusher.submit(donation)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Donation backlog is full, retry shortly",
+                            headers={"Retry-After": "1"})
+    return {"transaction_id": donation.transaction_id, "status": status}
+
+@app.get("/api/event/{event_id}/donations", response_model=DonationProgress)
+def get_event_donations(event_id: int, db: Session = Depends(get_db)):
+    progress = donation_progress(db, event_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return progress
+
+# Opportunities
+@app.get("/api/opportunities", response_model=List[OpportunityOut])
+async def get_opportunity_feed(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    type: Optional[OpportunityType] = None,
+    organization_id: Optional[int] = None,
+    audience: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Active opportunities, newest first; untargeted postings match every audience."""
+    return await cached_json(request, ("opportunities",), lambda response: fetch_page(
+        async_crud.get_opportunity_feed, response, db, limit, after, type, organization_id, audience
+    ))
+
+@app.post("/api/opportunities", response_model=OpportunityOut)
+async def create_opportunity(opportunity: OpportunityCreate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        created = await async_crud.post_opportunity(db, opportunity)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    invalidate("opportunities")
+    return created
 
 # Alumni
 @app.get("/api/alumni", response_model=List[Alumnus])
-def get_alumni():
-    return fake_alumni_db
+async def get_alumni(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    if stream:
+        return ndjson_response(stream_rows(async_crud.iter_alumni))
+    body = await fetch_page(async_crud.get_alumni_page, response, db, limit, after, True)
+    # Built by our own query, so response_model re-validation is skipped; the model still documents it.
+    return json_response(body, headers={k: v for k, v in response.headers.items() if k.lower().startswith("x-")})
+
+@app.get("/api/alumni/search", response_model=List[AlumniSearchHit])
+def search_alumni_directory(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: Session = Depends(get_db),
+):
+    """Ranked search over alumni name, bio, department and employers, tolerant of typos in names."""
+    return search_alumni(db, q, limit, offset)
+
+def network_filters(
+    organization_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    graduation_year: Optional[int] = None,
+    location: Optional[str] = Query(None, max_length=200),
+    role: Optional[str] = Query(None, max_length=200),
+):
+    return {"organization_id": organization_id, "department_id": department_id,
+            "graduation_year": graduation_year, "location": location, "role": role}
+
+@app.get("/api/alumni/network", response_model=List[NetworkAlumnus])
+def browse_alumni_network(
+    filters: dict = Depends(network_filters),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: Session = Depends(get_db),
+):
+    """Alumni by current employer, role, location, department and graduation year, from the network index."""
+    return network_alumni(db, limit, offset, **filters)
+
+@app.get("/api/alumni/network/facets", response_model=NetworkFacets)
+def alumni_network_facets(
+    filters: dict = Depends(network_filters),
+    limit: int = Query(20, ge=1, le=200, description="organizations to return"),
+    db: Session = Depends(get_db),
+):
+    """Alumni counts per current organization, department and graduation year for the given filters."""
+    return network_facets(db, limit, **filters)
+
+@app.get("/api/organizations/{organization_id}/alumni", response_model=List[NetworkAlumnus])
+def organization_alumni(
+    organization_id: int,
+    department_id: Optional[int] = None,
+    graduation_year: Optional[int] = None,
+    include_former: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: Session = Depends(get_db),
+):
+    """Alumni working at an organization now (and, with include_former, who used to)."""
+    return network_alumni(db, limit, offset, organization_id=organization_id, department_id=department_id,
+                          graduation_year=graduation_year, include_former=include_former)
+
+@app.get("/api/students/{student_id}/mentor-recommendations", response_model=List[MentorRecommendation])
+def mentor_recommendations(student_id: int, k: int = Query(10, ge=1, le=50), db: Session = Depends(get_db)):
+    """Top-k alumni for a student by bio/career similarity, department and spare mentoring capacity."""
+    recommendations = recommend_mentors(db, student_id, k)
+    if recommendations is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    return recommendations
+
+@app.get("/api/admin/mentorship-requests", response_model=List[MentorshipRequestOut])
+def mentorship_request_queue(
+    response: Response,
+    status: MentorshipStatus = MentorshipStatus.Pending,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    db: Session = Depends(get_db),
+    claims: TokenClaims = Depends(require_role(UserRole.Admin)),
+):
+    """Mentorship requests oldest first, with each mentor's current mentee count."""
+    try:
+        items, next_cursor = get_request_queue(db, limit, after, status)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+@app.post("/api/admin/mentorship-requests/bulk", response_model=MentorshipBulkResult)
+def process_mentorship_requests(
+    action: MentorshipBulkAction,
+    db: Session = Depends(get_db),
+    claims: TokenClaims = Depends(require_role(UserRole.Admin)),
+):
+    """Accepts and rejects many requests in one transaction, within each mentor's mentee cap."""
+    try:
+        return process_requests(db, action.accept, action.reject, claims.uid)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+async def write_alumnus(write, db: AsyncSession, alumnus_id: int, alumnus: Alumnus):
+    try:
+        data = await write(db, alumnus_id, alumnus.name, alumnus.email, alumnus.graduation_year, alumnus.major)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except async_crud.ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    invalidate_alumnus(alumnus_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Alumnus not found")
+    return data
 
 @app.post("/api/alumni", response_model=Alumnus)
-def create_alumnus(alumnus: Alumnus):
-    fake_alumni_db.append(alumnus.dict())
-    return alumnus
+async def create_alumnus(alumnus: Alumnus, db: AsyncSession = Depends(get_async_db)):
+    return await write_alumnus(async_crud.create_alumnus, db, alumnus.id, alumnus)
 
 @app.get("/api/alumni/{alumnus_id}", response_model=Alumnus)
-def get_alumnus(alumnus_id: int):
-    for alumnus in fake_alumni_db:
-        if alumnus["id"] == alumnus_id:
-            return alumnus
-    return {"error": "Alumnus not found"}
+async def get_alumnus(request: Request, alumnus_id: int, db: AsyncSession = Depends(get_async_db)):
+    async def load(alumnus_id: int):
+        alumnus = await async_crud.get_alumnus(db, alumnus_id)
+        return AlumnusRecord(**alumnus) if alumnus else None
+
+    async def produce(response: Response):
+        alumnus = await alumni_repository.aget(alumnus_id, load)
+        if alumnus is None:
+            raise HTTPException(status_code=404, detail="Alumnus not found")
+        return alumnus.to_dict()
+
+    return await cached_json(request, (f"alumni:{alumnus_id}",), produce)
+
+@app.get("/api/alumni/{alumnus_id}/profile", response_model=AlumniProfileOut)
+async def get_alumnus_profile(alumnus_id: int, db: AsyncSession = Depends(get_async_db)):
+    profile = await async_crud.get_alumnus_profile(db, alumnus_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Alumnus not found")
+    return profile
 
 @app.put("/api/alumni/{alumnus_id}", response_model=Alumnus)
-def update_alumnus(alumnus_id: int, updated_alumnus: Alumnus):
-    for i, alumnus in enumerate(fake_alumni_db):
-        if alumnus["id"] == alumnus_id:
-            fake_alumni_db[i] = updated_alumnus.dict()
-            return updated_alumnus
-    return {"error": "Alumnus not found"}
+async def update_alumnus(alumnus_id: int, updated_alumnus: Alumnus, db: AsyncSession = Depends(get_async_db)):
+    return await write_alumnus(async_crud.update_alumnus, db, alumnus_id, updated_alumnus)
 
 @app.delete("/api/alumni/{alumnus_id}")
-def delete_alumnus(alumnus_id: int):
-    for i, alumnus in enumerate(fake_alumni_db):
-        if alumnus["id"] == alumnus_id:
-            del fake_alumni_db[i]
-            return {"message": "Alumnus deleted"}
-    return {"error": "Alumnus not found"}
+async def delete_alumnus(alumnus_id: int, db: AsyncSession = Depends(get_async_db)):
+    try:
+        deleted = await async_crud.delete_alumnus(db, alumnus_id)
+    except async_crud.ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    invalidate_alumnus(alumnus_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Alumnus not found")
+    return {"message": "Alumnus deleted"}
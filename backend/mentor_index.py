@@ -0,0 +1,211 @@
+"""
+The mentor feature matrix behind recommend.py: TF-IDF rows over alumni bios
+and careers in a scipy CSR matrix, with an overlay for profiles changed since
+the last build.
+
+Kept apart from recommend.py so numpy and scipy are only imported when the
+index is first built, not when the API starts.
+"""
+import math
+import time
+from collections import Counter
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from recommend import (
+    CAREER_QUERY_WEIGHT, COMPACT_AFTER, MENTEE_CAP, STOPWORDS, WEIGHT_DEPARTMENT, WEIGHT_LOAD, WEIGHT_TEXT,
+)
+from search import tokenize
+
+
+class MentorIndex:
+    def __init__(self):
+        self._lock = RLock()
+        self.vocab: Dict[str, int] = {}
+        self.idf = np.zeros(0)
+        self._default_idf = 1.0
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.matrix = sparse.csr_matrix((0, 0))
+        self.departments = np.zeros(0, dtype=np.int64)
+        self.loads = np.zeros(0)
+        self.position: Dict[int, int] = {}
+        self.masked = np.zeros(0, dtype=bool)
+        self.meta: Dict[int, dict] = {}
+        # alumni_id -> (row vector, department_id) for profiles changed since the last build
+        self.overlay: Dict[int, Tuple[sparse.csr_matrix, int]] = {}
+        self.load_by_id: Dict[int, int] = {}
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.meta)
+
+    # --- building ---
+
+    def _vector(self, terms: Counter) -> sparse.csr_matrix:
+        """TF-IDF row, L2-normalized; unseen terms get new columns with a rare-term idf."""
+        columns, values = [], []
+        for term, count in terms.items():
+            column = self.vocab.get(term)
+            if column is None:
+                column = self.vocab[term] = len(self.vocab)
+                self.idf = np.append(self.idf, self._default_idf)
+            columns.append(column)
+            values.append((1 + math.log(count)) * self.idf[column])
+        values = np.asarray(values, dtype=np.float64)
+        norm = np.linalg.norm(values)
+        if norm:
+            values /= norm
+        return sparse.csr_matrix(
+            (values, (np.zeros(len(columns), dtype=np.int64), columns)), shape=(1, len(self.vocab))
+        )
+
+    def build(self, docs: List[dict]):
+        """docs: dicts with alumni_id, name, department_id, department, terms (Counter), load."""
+        with self._lock:
+            doc_freq = Counter(term for doc in docs for term in doc["terms"])
+            n = len(docs)
+            self.vocab = {term: i for i, term in enumerate(sorted(doc_freq))}
+            self.idf = np.array([math.log(1 + n / doc_freq[term]) for term in sorted(doc_freq)])
+            self._default_idf = math.log(1 + max(n, 1))
+
+            indptr, indices, data = [0], [], []
+            for doc in docs:
+                row = self._vector(doc["terms"])
+                indices.extend(row.indices)
+                data.extend(row.data)
+                indptr.append(len(indices))
+            self.matrix = sparse.csr_matrix(
+                (np.asarray(data), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+                shape=(n, len(self.vocab)),
+            )
+            self.ids = np.array([doc["alumni_id"] for doc in docs], dtype=np.int64)
+            self.departments = np.array([doc["department_id"] for doc in docs], dtype=np.int64)
+            self.loads = np.array([doc["load"] for doc in docs], dtype=np.float64)
+            self.position = {doc["alumni_id"]: i for i, doc in enumerate(docs)}
+            self.masked = np.zeros(n, dtype=bool)
+            self.meta = {doc["alumni_id"]: {"name": doc["name"], "department": doc["department"]} for doc in docs}
+            self.load_by_id = {doc["alumni_id"]: doc["load"] for doc in docs}
+            self.overlay = {}
+
+    # --- incremental updates ---
+
+    def upsert(self, alumni_id: int, name: str, department_id: int, department: str, terms: Counter):
+        with self._lock:
+            row = self.position.get(alumni_id)
+            if row is not None:
+                self.masked[row] = True
+            self.overlay[alumni_id] = (self._vector(terms), department_id)
+            self.meta[alumni_id] = {"name": name, "department": department}
+            self.load_by_id.setdefault(alumni_id, 0)
+            if len(self.overlay) > COMPACT_AFTER:
+                self._compact()
+
+    def remove(self, alumni_id: int):
+        with self._lock:
+            row = self.position.get(alumni_id)
+            if row is not None:
+                self.masked[row] = True
+            self.overlay.pop(alumni_id, None)
+            self.meta.pop(alumni_id, None)
+            self.load_by_id.pop(alumni_id, None)
+
+    def adjust_load(self, alumni_id: int, delta: int):
+        with self._lock:
+            if alumni_id not in self.load_by_id:
+                return
+            self.load_by_id[alumni_id] += delta
+            row = self.position.get(alumni_id)
+            if row is not None:
+                self.loads[row] += delta
+
+    def _compact(self):
+        keep = np.flatnonzero(~self.masked)
+        width = len(self.vocab)
+        base = self.matrix[keep]
+        base.resize((len(keep), width))
+        extra_ids = list(self.overlay)
+        rows = []
+        for alumni_id in extra_ids:
+            vector = self.overlay[alumni_id][0].copy()
+            vector.resize((1, width))
+            rows.append(vector)
+        self.matrix = sparse.vstack([base, *rows], format="csr")
+        self.ids = np.concatenate([self.ids[keep], np.array(extra_ids, dtype=np.int64)])
+        self.departments = np.concatenate([
+            self.departments[keep],
+            np.array([self.overlay[i][1] for i in extra_ids], dtype=np.int64),
+        ])
+        self.loads = np.array([self.load_by_id[i] for i in self.ids], dtype=np.float64)
+        self.position = {int(alumni_id): i for i, alumni_id in enumerate(self.ids)}
+        self.masked = np.zeros(len(self.ids), dtype=bool)
+        self.overlay = {}
+
+    # --- scoring ---
+
+    def _query(self, text: Optional[str]) -> np.ndarray:
+        query = np.zeros(len(self.vocab))
+        for token, count in Counter(t for t in tokenize(text) if t not in STOPWORDS).items():
+            tf = 1 + math.log(count)
+            for prefix, weight in (("b:", 1.0), ("c:", CAREER_QUERY_WEIGHT)):
+                column = self.vocab.get(prefix + token)
+                if column is not None:
+                    query[column] = tf * self.idf[column] * weight
+        norm = np.linalg.norm(query)
+        return query / norm if norm else query
+
+    def _combine(self, similarity, same_department, load):
+        return (
+            WEIGHT_TEXT * similarity
+            + WEIGHT_DEPARTMENT * same_department
+            - WEIGHT_LOAD * np.minimum(load / MENTEE_CAP, 1.0)
+        )
+
+    def recommend(self, department_id: int, text: Optional[str], k: int = 10,
+                  exclude: Iterable[int] = ()) -> List[dict]:
+        with self._lock:
+            query = self._query(text)
+            similarity = self.matrix @ query[:self.matrix.shape[1]]
+            scores = self._combine(similarity, self.departments == department_id, self.loads)
+            scores[self.masked | (self.loads >= MENTEE_CAP)] = -np.inf
+            for alumni_id in exclude:
+                row = self.position.get(alumni_id)
+                if row is not None:
+                    scores[row] = -np.inf
+
+            candidates = []
+            if len(scores):
+                top = min(k, len(scores))
+                best = np.argpartition(-scores, top - 1)[:top]
+                candidates = [
+                    (float(scores[i]), int(self.ids[i]), float(similarity[i]))
+                    for i in best if np.isfinite(scores[i])
+                ]
+
+            excluded = set(exclude)
+            for alumni_id, (vector, overlay_department) in self.overlay.items():
+                load = self.load_by_id.get(alumni_id, 0)
+                if alumni_id in excluded or load >= MENTEE_CAP:
+                    continue
+                sim = float((vector @ query[:vector.shape[1]])[0])
+                score = float(self._combine(sim, overlay_department == department_id, load))
+                candidates.append((score, alumni_id, sim))
+
+            candidates.sort(key=lambda c: (-c[0], c[1]))
+            return [
+                {
+                    "alumni_id": alumni_id,
+                    "name": self.meta[alumni_id]["name"],
+                    "department": self.meta[alumni_id]["department"],
+                    "same_department": (
+                        self.overlay[alumni_id][1] if alumni_id in self.overlay
+                        else int(self.departments[self.position[alumni_id]])
+                    ) == department_id,
+                    "text_similarity": round(sim, 4),
+                    "current_mentees": self.load_by_id.get(alumni_id, 0),
+                    "score": round(score, 4),
+                }
+                for score, alumni_id, sim in candidates[:k]
+            ]
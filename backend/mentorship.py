@@ -0,0 +1,164 @@
+"""
+Admin processing of mentorship requests: a pending queue paged oldest first
+and bulk accept/reject in one transaction.
+
+Accepting is set-wise: one INSERT ... SELECT creates the Mentorship rows for
+every accepted request whose mentor still has room, then one UPDATE marks
+exactly those requests Accepted. The cap check lives in that SELECT. Within a
+batch, each alumnus's requests are ranked by age (row_number() over
+requested_at), and a request qualifies only while current mentees + rank stays
+within recommend.MENTEE_CAP. Requests over the cap stay Pending and are
+reported back. On Postgres the mentors are locked first, so concurrent
+batches cannot overfill the same alumnus.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from models import AdminProfile, AlumniProfile, Mentorship, MentorshipStatus, Request, StudentProfile
+from pagination import decode_keyset, encode_cursor
+from recommend import MENTEE_CAP, adjust_mentor_load
+
+
+def _mentor_load():
+    return (
+        select(func.count()).where(Mentorship.mentor_id == Request.alumni_id)
+        .correlate(Request).scalar_subquery()
+    )
+
+def queue_select(limit: int, after: Optional[str] = None, status: MentorshipStatus = MentorshipStatus.Pending):
+    """One page of requests, oldest first; walks ix_requests_status_requested."""
+    stmt = (
+        select(
+            Request.request_id, Request.request_name, Request.request_desc, Request.requested_at,
+            Request.req_status, Request.student_id, StudentProfile.student_name,
+            Request.alumni_id, AlumniProfile.alumni_name, _mentor_load().label("mentor_load"),
+        )
+        .join(StudentProfile, Request.student_id == StudentProfile.student_id)
+        .join(AlumniProfile, Request.alumni_id == AlumniProfile.alumni_id)
+        .where(Request.req_status == status)
+    )
+    if after is not None:
+        requested_at, request_id = decode_keyset(after, datetime, int)
+        stmt = stmt.where(tuple_(Request.requested_at, Request.request_id) > tuple_(requested_at, request_id))
+    return stmt.order_by(Request.requested_at, Request.request_id).limit(limit + 1)
+
+def queue_result(rows, limit: int):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].requested_at.isoformat(), rows[-1].request_id)
+    return [
+        {
+            "id": row.request_id,
+            "name": row.request_name,
+            "description": row.request_desc,
+            "requested_at": row.requested_at,
+            "status": row.req_status.value,
+            "student_id": row.student_id,
+            "student_name": row.student_name,
+            "alumni_id": row.alumni_id,
+            "alumni_name": row.alumni_name,
+            "mentor_load": row.mentor_load,
+            "mentor_at_capacity": row.mentor_load >= MENTEE_CAP,
+        }
+        for row in rows
+    ], next_cursor
+
+def get_request_queue(session: Session, limit: int, after: Optional[str] = None,
+                      status: MentorshipStatus = MentorshipStatus.Pending):
+    return queue_result(session.execute(queue_select(limit, after, status)).all(), limit)
+
+
+def _accept(session: Session, request_ids: List[int], admin_id: Optional[int]):
+    if not request_ids:
+        return []
+    # Lock the mentors in id order so concurrent batches queue up instead of both seeing spare capacity.
+    session.execute(
+        select(AlumniProfile.alumni_id)
+        .where(AlumniProfile.alumni_id.in_(select(Request.alumni_id).where(Request.request_id.in_(request_ids))))
+        .order_by(AlumniProfile.alumni_id)
+        .with_for_update()
+    )
+    batch = (
+        select(
+            Request.request_id, Request.alumni_id,
+            func.row_number().over(partition_by=Request.alumni_id,
+                                   order_by=(Request.requested_at, Request.request_id)).label("rank"),
+        )
+        .where(Request.request_id.in_(request_ids), Request.req_status == MentorshipStatus.Pending)
+        .subquery()
+    )
+    load = (
+        select(Mentorship.mentor_id, func.count().label("mentees"))
+        .where(Mentorship.mentor_id.in_(select(batch.c.alumni_id)))
+        .group_by(Mentorship.mentor_id)
+        .subquery()
+    )
+    eligible = (
+        select(batch.c.request_id, batch.c.alumni_id)
+        .outerjoin(load, load.c.mentor_id == batch.c.alumni_id)
+        .where(func.coalesce(load.c.mentees, 0) + batch.c.rank <= MENTEE_CAP)
+    )
+    created = session.execute(
+        insert(Mentorship).from_select(["request_id", "mentor_id"], eligible)
+        .returning(Mentorship.request_id, Mentorship.mentor_id)
+    ).all()
+    session.execute(
+        update(Request)
+        .where(Request.request_id.in_(select(Mentorship.request_id).where(Mentorship.request_id.in_(request_ids))),
+               Request.req_status == MentorshipStatus.Pending)
+        .values(req_status=MentorshipStatus.Accepted, action_taken_by=admin_id)
+        .execution_options(synchronize_session=False)
+    )
+    return created
+
+def _reject(session: Session, request_ids: List[int], admin_id: Optional[int]) -> List[int]:
+    if not request_ids:
+        return []
+    return list(session.scalars(
+        update(Request)
+        .where(Request.request_id.in_(request_ids), Request.req_status == MentorshipStatus.Pending)
+        .values(req_status=MentorshipStatus.Rejected, action_taken_by=admin_id)
+        .returning(Request.request_id)
+        .execution_options(synchronize_session=False)
+    ))
+
+def process_requests(session: Session, accept: List[int], reject: List[int], admin_id: Optional[int] = None):
+    """
+    Accepts and rejects Pending requests in one transaction. Requests that are
+    not Pending are skipped; accepts that would push a mentor past the cap stay
+    Pending and come back in over_capacity.
+    """
+    accept, reject = sorted(set(accept)), sorted(set(reject))
+    if set(accept) & set(reject):
+        raise ValueError("A request cannot be both accepted and rejected")
+    if admin_id is not None and session.get(AdminProfile, admin_id) is None:
+        admin_id = None
+    # Lock the requests themselves so two admins cannot act on the same ones at once.
+    pending = set(session.scalars(
+        select(Request.request_id)
+        .where(Request.request_id.in_(accept + reject), Request.req_status == MentorshipStatus.Pending)
+        .order_by(Request.request_id)
+        .with_for_update()
+    ))
+    try:
+        created = _accept(session, [r for r in accept if r in pending], admin_id)
+        rejected = _reject(session, [r for r in reject if r in pending], admin_id)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    for mentor_id, count in Counter(mentor_id for _, mentor_id in created).items():
+        adjust_mentor_load(mentor_id, count)
+    accepted = sorted(request_id for request_id, _ in created)
+    return {
+        "accepted": accepted,
+        "rejected": sorted(rejected),
+        "over_capacity": sorted((set(accept) & pending) - set(accepted)),
+        "skipped": sorted(set(accept + reject) - pending),
+        "mentee_cap": MENTEE_CAP,
+    }
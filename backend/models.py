@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Text, Date, DateTime, Enum, ForeignKey,
-    Boolean, DECIMAL
+    Boolean, DECIMAL, Index, UniqueConstraint
 )
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
@@ -78,6 +78,13 @@ class AlumniProfile(Base):
     linkedin_profile_url = Column(String)
 
     user = relationship("User", back_populates="alumni_profile")
+    department = relationship("Department")
+    # passive_deletes="all": deleting a profile never rewrites child rows; the FKs decide.
+    careers = relationship("Career", back_populates="alumni", order_by="Career.started_on.desc()",
+                           passive_deletes="all")
+    participations = relationship("EventParticipation", back_populates="alumni", passive_deletes="all")
+    donations = relationship("Donation", back_populates="alumni", order_by="Donation.donation_date.desc()",
+                             passive_deletes="all")
 
 
 class StudentProfile(Base):
@@ -137,6 +144,9 @@ class Career(Base):
     worked_till = Column(Date)  # NULL means current job
     description = Column(Text)
 
+    alumni = relationship("AlumniProfile", back_populates="careers")
+    organization = relationship("Organization")
+
 
 class EventOrganizer(Base):
     __tablename__ = "event_organizers"
@@ -153,11 +163,17 @@ class Event(Base):
     event_id = Column(Integer, primary_key=True, autoincrement=True)
     event_name = Column(String, nullable=False)
     event_type = Column(Enum(EventType), nullable=False)
-    start_time = Column(DateTime, nullable=False)
-    end_time = Column(DateTime)
+    start_time = Column(DateTime, nullable=False, index=True)
+    end_time = Column(DateTime, index=True)
     description = Column(Text)
     event_org_id = Column(Integer, ForeignKey("event_organizers.event_org_id"), nullable=False)
     req_donation = Column(Integer, nullable=False, default=0)
+    # NULL means unlimited. Lowering it keeps existing RSVPs and only blocks new ones.
+    capacity = Column(Integer)
+    # Maintained by participation.py so listings never COUNT(*) event_participation.
+    participant_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    organizer = relationship("EventOrganizer")
 
 
 class EventParticipation(Base):
@@ -168,6 +184,9 @@ class EventParticipation(Base):
     role = Column(Enum(ParticipantRole), default=ParticipantRole.Participant, nullable=False)
     feedback = Column(Text)
 
+    event = relationship("Event")
+    alumni = relationship("AlumniProfile", back_populates="participations")
+
 
 class Donation(Base):
     __tablename__ = "donation"
@@ -180,6 +199,9 @@ class Donation(Base):
     transaction_id = Column(String, unique=True, nullable=False)
     donation_date = Column(DateTime, default=datetime.now(ZoneInfo("Asia/Kolkata")), nullable=False)
 
+    alumni = relationship("AlumniProfile", back_populates="donations")
+    event = relationship("Event")
+
 
 class Opportunity(Base):
     __tablename__ = "opportunity"
@@ -193,12 +215,28 @@ class Opportunity(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     target_audience = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime)
+
+    # The feed only ever reads active rows newest-first, so every index is partial on
+    # is_active and ends in (created_at, opportunity_id) to match the keyset order.
+    __table_args__ = (
+        Index("ix_opportunity_active_feed", created_at, opportunity_id,
+              postgresql_where=is_active, sqlite_where=is_active),
+        Index("ix_opportunity_active_type", type, created_at, opportunity_id,
+              postgresql_where=is_active, sqlite_where=is_active),
+        Index("ix_opportunity_active_org", organization_id, created_at, opportunity_id,
+              postgresql_where=is_active, sqlite_where=is_active),
+        Index("ix_opportunity_active_expiry", expires_at, created_at,
+              postgresql_where=is_active, sqlite_where=is_active),
+    )
 
 
 # --- MENTORSHIP MODULE ---
 
 class Request(Base):
     __tablename__ = "requests"
+    # The admin queue pages pending requests oldest first (mentorship.py).
+    __table_args__ = (Index("ix_requests_status_requested", "req_status", "requested_at", "request_id"),)
 
     request_id = Column(Integer, primary_key=True, autoincrement=True)
     request_name = Column(String)
@@ -214,6 +252,38 @@ class Mentorship(Base):
     __tablename__ = "mentorship"
 
     mentorship_id = Column(Integer, primary_key=True, autoincrement=True)
-    request_id = Column(Integer, ForeignKey("requests.request_id"), nullable=False)
-    mentor_id = Column(Integer, ForeignKey("alumni_profiles.alumni_id"), nullable=False)
+    request_id = Column(Integer, ForeignKey("requests.request_id"), nullable=False, unique=True)
+    mentor_id = Column(Integer, ForeignKey("alumni_profiles.alumni_id"), nullable=False, index=True)
     feedback = Column(Text)
+
+
+# --- ANALYTICS ---
+
+class AnalyticsRollup(Base):
+    """Pre-aggregated counters read by /api/analytics. 0 / '' mean "not applicable" for a dimension."""
+    __tablename__ = "analytics_rollup"
+    __table_args__ = (
+        UniqueConstraint("day", "metric", "department_id", "event_id", "currency", name="uq_analytics_rollup_key"),
+    )
+
+    rollup_id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False, index=True)
+    metric = Column(String, nullable=False)
+    department_id = Column(Integer, nullable=False, default=0)
+    event_id = Column(Integer, nullable=False, default=0)
+    currency = Column(String(3), nullable=False, default="")
+    value = Column(DECIMAL(14, 2), nullable=False, default=0)
+
+
+class DonationTotal(Base):
+    """Running donation totals per event and currency, kept by donations.py (event_id 0 = general fund)."""
+    __tablename__ = "donation_totals"
+    __table_args__ = (
+        UniqueConstraint("event_id", "currency", name="uq_donation_totals_key"),
+    )
+
+    total_id = Column(Integer, primary_key=True, autoincrement=True)
+    event_id = Column(Integer, nullable=False, default=0)
+    currency = Column(String(3), nullable=False)
+    total = Column(DECIMAL(14, 2), nullable=False, default=0)
+    donation_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,298 @@
+"""
+Alumni network index: who works where now, answering "alumni from my
+department at X" and the directory facets without joining profiles, careers,
+organizations and departments per request.
+
+Each alumnus is held once with their current positions (careers with no
+worked_till) and former employers. Inverted sets by organization, department,
+graduation year and location are kept alongside, so a filter is a set
+intersection and the unfiltered facet counts are set sizes.
+
+Freshness:
+- ORM writes to Career rows are caught by session events. The alumni they touch
+  are re-read on the next query, once their transaction has committed.
+- Profile writes go through refresh_network(), and bulk loads call
+  reset_network_index().
+- The index is per process. NETWORK_INDEX_MAX_AGE bounds how long another
+  worker's changes can stay invisible; after that the index is rebuilt.
+"""
+import os
+import time
+from collections import Counter, defaultdict
+from heapq import nsmallest
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from models import AlumniProfile, Career, Department, Organization
+
+NETWORK_INDEX_MAX_AGE = float(os.getenv("NETWORK_INDEX_MAX_AGE", 300))
+
+
+def _key(value: Optional[str]) -> Optional[str]:
+    return value.strip().lower() if value and value.strip() else None
+
+
+class AlumniNetworkIndex:
+    def __init__(self):
+        self._lock = RLock()
+        self._alumni: Dict[int, dict] = {}
+        self._current: Dict[int, Set[int]] = defaultdict(set)  # organization -> alumni working there now
+        self._former: Dict[int, Set[int]] = defaultdict(set)
+        self._departments: Dict[int, Set[int]] = defaultdict(set)
+        self._years: Dict[int, Set[int]] = defaultdict(set)
+        self._locations: Dict[str, Set[int]] = defaultdict(set)
+        self.organization_names: Dict[int, str] = {}
+        self.department_names: Dict[int, str] = {}
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self._alumni)
+
+    def add(self, alumni_id: int, name: str, graduation_year: int, department_id: int, careers: Iterable[tuple]):
+        """careers: (organization_id, role, location, started_on, worked_till) rows."""
+        positions, former = [], set()
+        for organization_id, role, location, started_on, worked_till in careers:
+            if worked_till is None:
+                positions.append((organization_id, role, location, started_on))
+            else:
+                former.add(organization_id)
+        positions.sort(key=lambda p: p[3], reverse=True)
+        current = {p[0] for p in positions}
+        doc = {
+            "name": name,
+            "graduation_year": graduation_year,
+            "department_id": department_id,
+            "positions": tuple(positions),
+            "current": frozenset(current),
+            "former": frozenset(former - current),
+            "locations": frozenset(filter(None, (_key(p[2]) for p in positions))),
+        }
+        with self._lock:
+            self._remove(alumni_id)
+            self._alumni[alumni_id] = doc
+            for organization_id in doc["current"]:
+                self._current[organization_id].add(alumni_id)
+            for organization_id in doc["former"]:
+                self._former[organization_id].add(alumni_id)
+            for location in doc["locations"]:
+                self._locations[location].add(alumni_id)
+            self._departments[department_id].add(alumni_id)
+            self._years[graduation_year].add(alumni_id)
+
+    def remove(self, alumni_id: int):
+        with self._lock:
+            self._remove(alumni_id)
+
+    def _remove(self, alumni_id: int):
+        doc = self._alumni.pop(alumni_id, None)
+        if doc is None:
+            return
+        postings = [(self._current, o) for o in doc["current"]] + [(self._former, o) for o in doc["former"]]
+        postings += [(self._locations, l) for l in doc["locations"]]
+        postings += [(self._departments, doc["department_id"]), (self._years, doc["graduation_year"])]
+        for sets, key in postings:
+            members = sets.get(key)
+            if members is not None:
+                members.discard(alumni_id)
+                if not members:
+                    del sets[key]
+
+    def _match(self, organization_id=None, department_id=None, graduation_year=None, location=None,
+               role=None, include_former=False) -> Optional[Set[int]]:
+        """Alumni matching every filter; None means no filter (everyone)."""
+        candidates = []
+        if organization_id is not None:
+            at = self._current.get(organization_id, set())
+            candidates.append(at | self._former.get(organization_id, set()) if include_former else at)
+        if department_id is not None:
+            candidates.append(self._departments.get(department_id, set()))
+        if graduation_year is not None:
+            candidates.append(self._years.get(graduation_year, set()))
+        if _key(location) is not None:
+            candidates.append(self._locations.get(_key(location), set()))
+        if not candidates and not role:
+            return None
+        if candidates:
+            candidates.sort(key=len)
+            matched = set(candidates[0]).intersection(*candidates[1:])
+        else:
+            matched = set(self._alumni)
+        role = _key(role)
+        if role:
+            matched = {a for a in matched
+                       if any(role in p[1].lower() for p in self._alumni[a]["positions"])}
+        return matched
+
+    def facets(self, limit: int = 20, **filters) -> dict:
+        with self._lock:
+            matched = self._match(**filters)
+            if matched is None:
+                total = len(self._alumni)
+                organizations = {o: len(s) for o, s in self._current.items()}
+                departments = {d: len(s) for d, s in self._departments.items()}
+                years = {y: len(s) for y, s in self._years.items()}
+            else:
+                total = len(matched)
+                organizations, departments, years = Counter(), Counter(), Counter()
+                for alumni_id in matched:
+                    doc = self._alumni[alumni_id]
+                    organizations.update(doc["current"])
+                    departments[doc["department_id"]] += 1
+                    years[doc["graduation_year"]] += 1
+            top = nsmallest(limit, organizations.items(), key=lambda item: (-item[1], item[0]))
+            return {
+                "total": total,
+                "organizations": [{"id": o, "name": self.organization_names.get(o), "count": n} for o, n in top],
+                "departments": [{"id": d, "name": self.department_names.get(d), "count": n}
+                                for d, n in sorted(departments.items(), key=lambda item: (-item[1], item[0]))],
+                "graduation_years": [{"value": y, "count": n} for y, n in sorted(years.items(), reverse=True)],
+            }
+
+    def alumni(self, limit: int = 20, offset: int = 0, **filters) -> List[dict]:
+        """Matching alumni, most recent graduates first."""
+        with self._lock:
+            matched = self._match(**filters)
+            ids = self._alumni.keys() if matched is None else matched
+            page = nsmallest(offset + limit, ids, key=lambda a: (-self._alumni[a]["graduation_year"], a))[offset:]
+            organization_id = filters.get("organization_id")
+            return [self._render(a, organization_id) for a in page]
+
+    def _render(self, alumni_id: int, organization_id: Optional[int]) -> dict:
+        doc = self._alumni[alumni_id]
+        result = {
+            "id": alumni_id,
+            "name": doc["name"],
+            "graduation_year": doc["graduation_year"],
+            "department_id": doc["department_id"],
+            "department": self.department_names.get(doc["department_id"]),
+            "positions": [
+                {"organization_id": o, "organization": self.organization_names.get(o), "role": role,
+                 "location": location}
+                for o, role, location, _ in doc["positions"]
+            ],
+        }
+        if organization_id is not None:
+            result["current"] = organization_id in doc["current"]
+        return result
+
+
+# --- loading from the database ---
+
+_index: Optional[AlumniNetworkIndex] = None
+_index_lock = RLock()
+# Alumni whose careers changed in committed transactions, applied on the next read.
+_pending: Set[int] = set()
+_pending_lock = RLock()
+
+
+def _careers(session: Session, alumni_ids=None):
+    query = select(Career.alumni_id, Career.organization_id, Career.role, Career.location,
+                   Career.started_on, Career.worked_till)
+    if alumni_ids is not None:
+        query = query.where(Career.alumni_id.in_(alumni_ids))
+    careers = defaultdict(list)
+    for alumni_id, *career in session.execute(query.execution_options(yield_per=5000)):
+        careers[alumni_id].append(career)
+    return careers
+
+def _profiles():
+    return select(AlumniProfile.alumni_id, AlumniProfile.alumni_name, AlumniProfile.graduation_year,
+                  AlumniProfile.department_id)
+
+def _load_names(session: Session, index: AlumniNetworkIndex):
+    index.organization_names = dict(session.execute(
+        select(Organization.organization_id, Organization.organization_name)).all())
+    index.department_names = dict(session.execute(
+        select(Department.department_id, Department.department_name)).all())
+
+def build_network_index(session: Session) -> AlumniNetworkIndex:
+    index = AlumniNetworkIndex()
+    _load_names(session, index)
+    careers = _careers(session)
+    for alumni_id, name, year, department_id in session.execute(_profiles().execution_options(yield_per=5000)):
+        index.add(alumni_id, name, year, department_id, careers.get(alumni_id, ()))
+    return index
+
+def _refresh(session: Session, index: AlumniNetworkIndex, alumni_ids: List[int]):
+    profiles = {row[0]: row for row in session.execute(_profiles().where(AlumniProfile.alumni_id.in_(alumni_ids)))}
+    careers = _careers(session, alumni_ids)
+    if any(o not in index.organization_names for rows in careers.values() for o, *_ in rows):
+        _load_names(session, index)
+    for alumni_id in alumni_ids:
+        if alumni_id in profiles:
+            index.add(*profiles[alumni_id], careers.get(alumni_id, ()))
+        else:
+            index.remove(alumni_id)
+
+def get_network_index(session: Session) -> AlumniNetworkIndex:
+    global _index
+    with _index_lock:
+        if _index is None or time.monotonic() - _index.built_at > NETWORK_INDEX_MAX_AGE > 0:
+            with _pending_lock:
+                _pending.clear()
+            _index = build_network_index(session)
+        with _pending_lock:
+            changed = sorted(_pending)
+            _pending.clear()
+        if changed:
+            _refresh(session, _index, changed)
+        return _index
+
+def reset_network_index():
+    """Drops the index after bulk changes; it is rebuilt on the next query."""
+    global _index
+    with _index_lock:
+        _index = None
+
+def refresh_network(session: Session, alumni_id: int):
+    """Re-reads one alumnus after their profile changes (or they are deleted)."""
+    if _index is not None:
+        with _index_lock:
+            _refresh(session, _index, [alumni_id])
+
+def network_facets(session: Session, limit: int = 20, **filters) -> dict:
+    return get_network_index(session).facets(limit, **filters)
+
+def network_alumni(session: Session, limit: int = 20, offset: int = 0, **filters) -> List[dict]:
+    return get_network_index(session).alumni(limit, offset, **filters)
+
+
+# --- Career change tracking ---
+
+@event.listens_for(Session, "after_flush")
+def _collect_career_changes(session, flush_context):
+    changed = {obj.alumni_id for obj in (*session.new, *session.dirty, *session.deleted)
+               if isinstance(obj, Career) and obj.alumni_id is not None}
+    if changed:
+        session.info.setdefault("network_changed", set()).update(changed)
+
+@event.listens_for(Career.alumni_id, "set", active_history=True)
+def _career_moved(target, value, oldvalue, initiator):
+    # The previous owner loses the position; active_history loads the old value even when expired.
+    session = object_session(target)
+    if session is not None and isinstance(oldvalue, int) and oldvalue != value:
+        session.info.setdefault("network_changed", set()).add(oldvalue)
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_career_changes(orm_execute_state):
+    # ORM-enabled insert/update/delete(Career) statements touch unknown alumni: rebuild.
+    if (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete) \
+            and orm_execute_state.bind_mapper is not None and orm_execute_state.bind_mapper.class_ is Career:
+        orm_execute_state.session.info["network_rebuild"] = True
+
+@event.listens_for(Session, "after_commit")
+def _publish_career_changes(session):
+    changed = session.info.pop("network_changed", None)
+    if session.info.pop("network_rebuild", False):
+        reset_network_index()
+    elif changed and _index is not None:
+        with _pending_lock:
+            _pending.update(changed)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_career_changes(session):
+    session.info.pop("network_changed", None)
+    session.info.pop("network_rebuild", None)
@@ -0,0 +1,130 @@
+"""
+Opportunity feed for students: active postings, newest first, filtered by
+type, organization and audience, paged by (created_at, opportunity_id).
+
+Stale postings are switched off in bulk by expire_stale(), run periodically by
+the API process (OPPORTUNITY_EXPIRY_INTERVAL seconds, 0 disables) or from cron
+with `python opportunities.py`, so reads only ever test is_active and stay on
+the partial indexes declared on the model.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from models import AlumniProfile, Opportunity, OpportunityType, Organization
+from pagination import decode_keyset, encode_cursor
+
+# Postings without an explicit expires_at go stale this long after they were created.
+OPPORTUNITY_TTL_DAYS = int(os.getenv("OPPORTUNITY_TTL_DAYS", 60))
+OPPORTUNITY_EXPIRY_INTERVAL = int(os.getenv("OPPORTUNITY_EXPIRY_INTERVAL", 900))
+
+logger = logging.getLogger(__name__)
+
+
+def opportunity_to_dict(row):
+    opportunity, organization_name, posted_by = row
+    return {
+        "id": opportunity.opportunity_id,
+        "type": opportunity.type.value,
+        "title": opportunity.title,
+        "description": opportunity.description,
+        "organization_id": opportunity.organization_id,
+        "organization_name": organization_name,
+        "posted_by_alumni_id": opportunity.posted_by_alumni_id,
+        "posted_by": posted_by,
+        "target_audience": opportunity.target_audience,
+        "created_at": opportunity.created_at.isoformat(),
+        "expires_at": opportunity.expires_at.isoformat() if opportunity.expires_at else None,
+    }
+
+def opportunities_select():
+    return (
+        select(Opportunity, Organization.organization_name, AlumniProfile.alumni_name)
+        .outerjoin(Organization, Opportunity.organization_id == Organization.organization_id)
+        .join(AlumniProfile, Opportunity.posted_by_alumni_id == AlumniProfile.alumni_id)
+    )
+
+def feed_select(limit: int, after: Optional[str] = None, type: Optional[OpportunityType] = None,
+                organization_id: Optional[int] = None, audience: Optional[str] = None):
+    stmt = opportunities_select().where(Opportunity.is_active)
+    if type is not None:
+        stmt = stmt.where(Opportunity.type == type)
+    if organization_id is not None:
+        stmt = stmt.where(Opportunity.organization_id == organization_id)
+    if audience is not None:
+        # Untargeted postings are open to everyone.
+        stmt = stmt.where(or_(Opportunity.target_audience == audience, Opportunity.target_audience.is_(None)))
+    if after is not None:
+        created_at, opportunity_id = decode_keyset(after, datetime, int)
+        stmt = stmt.where(
+            tuple_(Opportunity.created_at, Opportunity.opportunity_id) < tuple_(created_at, opportunity_id)
+        )
+    return stmt.order_by(Opportunity.created_at.desc(), Opportunity.opportunity_id.desc()).limit(limit + 1)
+
+def feed_result(rows, limit: int):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        next_cursor = encode_cursor(last.created_at.isoformat(), last.opportunity_id)
+    return [opportunity_to_dict(row) for row in rows], next_cursor
+
+def new_opportunity_from(data):
+    return Opportunity(
+        posted_by_alumni_id=data.posted_by_alumni_id,
+        organization_id=data.organization_id,
+        type=data.type,
+        title=data.title,
+        description=data.description,
+        target_audience=data.target_audience,
+        expires_at=data.expires_at,
+    )
+
+
+# --- expiry ---
+
+def stale_condition(now: datetime):
+    return or_(
+        Opportunity.expires_at <= now,
+        and_(Opportunity.expires_at.is_(None),
+             Opportunity.created_at < now - timedelta(days=OPPORTUNITY_TTL_DAYS)),
+    )
+
+def expire_stale(session: Session, now: Optional[datetime] = None) -> int:
+    """Deactivates every stale posting with one UPDATE; returns how many were switched off."""
+    now = now or datetime.utcnow()
+    result = session.execute(
+        update(Opportunity)
+        .where(Opportunity.is_active, stale_condition(now))
+        .values(is_active=False)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return result.rowcount
+
+async def run_expiry_loop(session_factory, on_expired=None, interval: int = OPPORTUNITY_EXPIRY_INTERVAL):
+    """Calls expire_stale every `interval` seconds in a worker thread until cancelled."""
+    def expire_once():
+        with session_factory() as session:
+            return expire_stale(session)
+
+    while True:
+        try:
+            expired = await asyncio.to_thread(expire_once)
+            if expired and on_expired is not None:
+                on_expired(expired)
+        except Exception:
+            logger.exception("Opportunity expiry run failed")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    with SessionLocal() as db:
+        print(f"Expired {expire_stale(db)} opportunities")
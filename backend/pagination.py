@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import AsyncIterable, Iterable, Union
+
+from fastapi.responses import StreamingResponse
+
+from serialization import dumps
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    """Packs the keyset values of the last row into an opaque, URL-safe token."""
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, binascii.Error):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def cursor_datetime(value) -> datetime:
+    if not isinstance(value, str):
+        raise ValueError("Invalid cursor")
+    return datetime.fromisoformat(value)
+
+
+def cursor_id(value) -> int:
+    """Checks an id component of a decoded cursor; JSON lets any type through."""
+    if type(value) is not int:
+        raise ValueError("Invalid cursor")
+    return value
+
+
+_KEYSET_TYPES = {datetime: cursor_datetime, int: cursor_id}
+
+
+def decode_keyset(cursor: str, *types) -> list:
+    """
+    Decodes a cursor from encode_cursor into one value per keyset column,
+    checking each against `types` (datetime or int). Raises ValueError for
+    anything else, which the handlers turn into a 400.
+    """
+    values = decode_cursor(cursor)
+    if len(values) != len(types):
+        raise ValueError("Invalid cursor")
+    return [_KEYSET_TYPES[kind](value) for kind, value in zip(types, values)]
+
+
+def ndjson_response(rows: Union[Iterable[dict], AsyncIterable[dict]]) -> StreamingResponse:
+    """Streams one JSON document per line without building the whole body."""
+    if hasattr(rows, "__aiter__"):
+        async def lines():
+            async for row in rows:
+                yield dumps(row) + b"\n"
+    else:
+        def lines():
+            for row in rows:
+                yield dumps(row) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
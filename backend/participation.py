@@ -0,0 +1,168 @@
+"""
+Batch RSVP / participation writes.
+
+Each batch runs in one transaction: the event row is locked, capacity is
+enforced by a guarded UPDATE of event.participant_count, attendees are written
+with one INSERT ... ON CONFLICT (event_id, alumni_id) and removals with one
+DELETE ... RETURNING. participant_count is kept in step so event listings read
+it straight off the row; recount_participants() repairs it after loads that
+bypass this module.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from models import AlumniProfile, Event, EventParticipation
+from rollups import dialect_insert, record_participation
+from schemas import ParticipantIn, ParticipantUpdate
+
+
+class CapacityExceeded(Exception):
+    def __init__(self, capacity: int, participant_count: int, requested: int):
+        self.capacity = capacity
+        self.participant_count = participant_count
+        self.requested = requested
+        super().__init__(
+            f"Event has {max(capacity - participant_count, 0)} free places, {requested} requested"
+        )
+
+
+def _lock_event(session: Session, event_id: int) -> Optional[Event]:
+    # FOR UPDATE serialises concurrent batches for the same event (ignored by SQLite,
+    # whose writers are serialised anyway).
+    return session.scalars(select(Event).where(Event.event_id == event_id).with_for_update()).first()
+
+def _departments(session: Session, alumni_ids: Iterable[int]) -> Dict[int, int]:
+    return dict(session.execute(
+        select(AlumniProfile.alumni_id, AlumniProfile.department_id)
+        .where(AlumniProfile.alumni_id.in_(list(alumni_ids)))
+    ).all())
+
+def _existing(session: Session, event_id: int, alumni_ids: Iterable[int]) -> set:
+    return set(session.scalars(
+        select(EventParticipation.alumni_id).where(
+            EventParticipation.event_id == event_id,
+            EventParticipation.alumni_id.in_(list(alumni_ids)),
+        )
+    ))
+
+def _record(session: Session, event: Event, departments: Dict[int, int], alumni_ids, delta: int):
+    for department_id, count in Counter(departments.get(i) for i in alumni_ids).items():
+        record_participation(session, event, department_id, delta * count)
+
+def _result(event: Event, **counts):
+    return {
+        "event_id": event.event_id,
+        "participant_count": event.participant_count,
+        "capacity": event.capacity,
+        **counts,
+    }
+
+def _reserve(session: Session, event: Event, seats: int):
+    """Moves participant_count by `seats`, refusing in SQL if that would pass capacity."""
+    if seats == 0:
+        return
+    stmt = update(Event).where(Event.event_id == event.event_id)
+    if seats > 0:
+        stmt = stmt.where(Event.capacity.is_(None) | (Event.participant_count + seats <= Event.capacity))
+    result = session.execute(
+        stmt.values(participant_count=Event.participant_count + seats)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        session.rollback()
+        raise CapacityExceeded(event.capacity, event.participant_count, seats)
+    session.refresh(event, ["participant_count"])
+
+
+def add_participants(session: Session, event_id: int, participants: List[ParticipantIn]):
+    """Adds or re-RSVPs attendees; existing rows get the new role (and feedback, if given).
+
+    Returns None for an unknown event, raises ValueError for unknown alumni and
+    CapacityExceeded when the new attendees do not fit.
+    """
+    event = _lock_event(session, event_id)
+    if event is None:
+        return None
+    # Last entry wins for duplicate alumni within one batch.
+    batch = {p.alumni_id: p for p in participants}
+    departments = _departments(session, batch)
+    unknown = sorted(set(batch) - set(departments))
+    if unknown:
+        session.rollback()
+        raise ValueError(f"Unknown alumni: {unknown[:20]}")
+
+    existing = _existing(session, event_id, batch)
+    new_ids = [i for i in batch if i not in existing]
+    _reserve(session, event, len(new_ids))
+
+    stmt = dialect_insert(session)(EventParticipation)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EventParticipation.event_id, EventParticipation.alumni_id],
+        set_={
+            "role": stmt.excluded.role,
+            "feedback": func.coalesce(stmt.excluded.feedback, EventParticipation.feedback),
+        },
+    )
+    session.execute(stmt, [
+        {"event_id": event_id, "alumni_id": p.alumni_id, "role": p.role, "feedback": p.feedback}
+        for p in batch.values()
+    ])
+    _record(session, event, departments, new_ids, 1)
+    session.commit()
+    return _result(event, added=len(new_ids), updated=len(batch) - len(new_ids))
+
+def update_participants(session: Session, event_id: int, updates: List[ParticipantUpdate]):
+    """Changes role and/or feedback of existing attendees; alumni not on the event are reported as missing."""
+    event = _lock_event(session, event_id)
+    if event is None:
+        return None
+    batch = {u.alumni_id: u for u in updates}
+    existing = _existing(session, event_id, batch)
+
+    # One executemany per shape of update, so unset fields are left alone.
+    shapes: Dict[tuple, list] = {}
+    for alumni_id in existing:
+        values = batch[alumni_id].model_dump(exclude_unset=True, exclude={"alumni_id"})
+        if values:
+            shapes.setdefault(tuple(sorted(values)), []).append({"b_alumni_id": alumni_id, **values})
+    table = EventParticipation.__table__
+    for fields, rows in shapes.items():
+        session.execute(
+            table.update()
+            .where(table.c.event_id == event_id, table.c.alumni_id == bindparam("b_alumni_id"))
+            .values({field: bindparam(field) for field in fields}),
+            rows,
+        )
+    session.commit()
+    return _result(event, updated=len(existing), missing=sorted(set(batch) - existing))
+
+def remove_participants(session: Session, event_id: int, alumni_ids: List[int]):
+    event = _lock_event(session, event_id)
+    if event is None:
+        return None
+    wanted = set(alumni_ids)
+    removed = list(session.scalars(
+        delete(EventParticipation)
+        .where(EventParticipation.event_id == event_id, EventParticipation.alumni_id.in_(list(wanted)))
+        .returning(EventParticipation.alumni_id)
+    ))
+    _reserve(session, event, -len(removed))
+    _record(session, event, _departments(session, removed), removed, -1)
+    session.commit()
+    return _result(event, removed=len(removed), missing=sorted(wanted - set(removed)))
+
+def recount_participants(session: Session, event_id: Optional[int] = None):
+    """Resets event.participant_count from event_participation."""
+    counted = (
+        select(func.count())
+        .where(EventParticipation.event_id == Event.event_id)
+        .scalar_subquery()
+    )
+    stmt = update(Event).values(participant_count=counted)
+    if event_id is not None:
+        stmt = stmt.where(Event.event_id == event_id)
+    session.execute(stmt.execution_options(synchronize_session=False))
+    session.commit()
@@ -0,0 +1,320 @@
+"""
+Per-request profiling: wall time, DB time, SQL statement count, rows reported
+by the driver and serialization time for every request.
+
+- ProfilingMiddleware (pure ASGI) opens a RequestProfile in a context variable,
+  adds a Server-Timing header and feeds the metrics registry.
+- SQLAlchemy cursor events on every Engine (the async engines run on the same
+  sync core) charge statements to the current request, including sync
+  endpoints run in the threadpool, which copies the context.
+- ProfiledRoute marks when the endpoint returns, so everything between that and
+  the response headers is serialization (response_model validation, encoding,
+  rendering).
+- Requests slower than PROFILE_SLOW_MS are logged with their slowest statements.
+- PROFILE_SAMPLE_RATE of requests are traced with pyinstrument when installed,
+  otherwise cProfile, into PROFILE_DIR.
+
+Rows: psycopg2 and asyncpg report rowcount for SELECTs; SQLite only does for
+DML, so read-heavy numbers are under-counted there.
+"""
+import cProfile
+import functools
+import inspect
+import logging
+import os
+import random
+import re
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    from pyinstrument import Profiler as _Pyinstrument
+except ImportError:  # optional
+    _Pyinstrument = None
+
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", 500))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+SLOW_LOG_STATEMENTS = 10
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+    __slots__ = ("method", "path", "route", "started", "endpoint_done", "headers_sent",
+                 "db_seconds", "statements", "rows", "queries")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.started = time.perf_counter()
+        self.endpoint_done: Optional[float] = None
+        self.headers_sent: Optional[float] = None
+        self.db_seconds = 0.0
+        self.statements = 0
+        self.rows = 0
+        self.queries: List[Tuple[float, str]] = []
+
+    def serialization_seconds(self) -> float:
+        if self.endpoint_done is None or self.headers_sent is None:
+            return 0.0
+        return max(self.headers_sent - self.endpoint_done, 0.0)
+
+    def server_timing(self) -> str:
+        now = self.headers_sent or time.perf_counter()
+        return ", ".join([
+            f"app;dur={(now - self.started) * 1000:.1f}",
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.statements} queries"',
+            f"ser;dur={self.serialization_seconds() * 1000:.1f}",
+        ])
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+# --- SQL instrumentation ---
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is None:
+        return
+    started = conn.info.get("profile_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    profile.db_seconds += elapsed
+    profile.statements += 1
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount and rowcount > 0:
+        profile.rows += rowcount
+    profile.queries.append((elapsed, statement))
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute; drop their start mark.
+    connection = exception_context.connection
+    if connection is not None and _current.get() is not None:
+        started = connection.info.get("profile_started")
+        if started:
+            started.pop()
+
+
+# --- metrics ---
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Just enough of the Prometheus data model for request metrics, rendered in text format."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.requests: Dict[tuple, int] = defaultdict(int)
+        self.latency: Dict[tuple, Histogram] = defaultdict(Histogram)
+        self.db_seconds: Dict[tuple, float] = defaultdict(float)
+        self.serialization_seconds: Dict[tuple, float] = defaultdict(float)
+        self.statements: Dict[tuple, int] = defaultdict(int)
+        self.rows: Dict[tuple, int] = defaultdict(int)
+        self.slow: Dict[tuple, int] = defaultdict(int)
+
+    def observe(self, profile: RequestProfile, status: int, wall: float):
+        route = (profile.method, profile.route or "unmatched")
+        with self._lock:
+            self.requests[route + (str(status),)] += 1
+            self.latency[route].observe(wall)
+            self.db_seconds[route] += profile.db_seconds
+            self.serialization_seconds[route] += profile.serialization_seconds()
+            self.statements[route] += profile.statements
+            self.rows[route] += profile.rows
+            if wall * 1000 >= PROFILE_SLOW_MS:
+                self.slow[route] += 1
+
+    def render(self) -> str:
+        def labels(key, names=("method", "route", "status")):
+            return ",".join(f'{name}="{value}"' for name, value in zip(names, key))
+
+        lines = []
+        with self._lock:
+            lines += ["# TYPE http_requests_total counter"]
+            lines += [f"http_requests_total{{{labels(k)}}} {v}" for k, v in sorted(self.requests.items())]
+            lines += ["# TYPE http_request_duration_seconds histogram"]
+            for key, histogram in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels(key)},le="{bound}"}} {cumulative}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels(key)}}} {histogram.total:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels(key)}}} {histogram.count}")
+            for name, kind, values in (
+                ("http_request_db_seconds_total", "counter", self.db_seconds),
+                ("http_request_serialization_seconds_total", "counter", self.serialization_seconds),
+                ("http_request_sql_statements_total", "counter", self.statements),
+                ("http_request_db_rows_total", "counter", self.rows),
+                ("http_slow_requests_total", "counter", self.slow),
+            ):
+                lines.append(f"# TYPE {name} {kind}")
+                lines += [f"{name}{{{labels(k)}}} {v:.6f}" if isinstance(v, float) else f"{name}{{{labels(k)}}} {v}"
+                          for k, v in sorted(values.items())]
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+# --- sampled tracing ---
+
+_trace_lock = Lock()
+
+class _Trace:
+    """One sampled profile; only one runs at a time since profilers can't nest."""
+
+    def __init__(self):
+        if _Pyinstrument:
+            self.profiler = _Pyinstrument(async_mode="enabled")
+            self.profiler.start()
+        else:
+            # cProfile sees the whole event-loop thread, so concurrent requests show up too.
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def finish(self, profile: RequestProfile):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        route = re.sub(r"[^A-Za-z0-9]+", "_", profile.route or profile.path).strip("_")
+        name = f"{int(time.time() * 1000)}-{profile.method}-{route}"
+        if _Pyinstrument:
+            self.profiler.stop()
+            path = os.path.join(PROFILE_DIR, name + ".html")
+            with open(path, "w") as fh:
+                fh.write(self.profiler.output_html())
+        else:
+            self.profiler.disable()
+            path = os.path.join(PROFILE_DIR, name + ".prof")
+            self.profiler.dump_stats(path)
+        logger.info("Profile for %s %s written to %s", profile.method, profile.path, path)
+
+def _start_trace() -> Optional[_Trace]:
+    if PROFILE_SAMPLE_RATE <= 0 or random.random() >= PROFILE_SAMPLE_RATE:
+        return None
+    if not _trace_lock.acquire(blocking=False):
+        return None
+    try:
+        return _Trace()
+    except Exception:
+        _trace_lock.release()
+        logger.exception("Could not start request profiler")
+        return None
+
+def _finish_trace(trace: _Trace, profile: RequestProfile):
+    try:
+        trace.finish(profile)
+    except Exception:
+        logger.exception("Could not write request profile")
+    finally:
+        _trace_lock.release()
+
+
+# --- ASGI / routing glue ---
+
+def _log_slow(profile: RequestProfile, status: int, wall: float):
+    slowest = sorted(profile.queries, key=lambda q: q[0], reverse=True)[:SLOW_LOG_STATEMENTS]
+    logger.warning(
+        "Slow request %s %s -> %s in %.1f ms (db %.1f ms, %d statements, %d rows, serialization %.1f ms)%s",
+        profile.method, profile.path, status, wall * 1000, profile.db_seconds * 1000, profile.statements,
+        profile.rows, profile.serialization_seconds() * 1000,
+        "".join(f"\n  {seconds * 1000:8.1f} ms  {' '.join(sql.split())[:500]}" for seconds, sql in slowest),
+    )
+
+
+class ProfilingMiddleware:
+    """exclude_paths: long-lived streams (SSE) that would only skew the latency metrics."""
+
+    def __init__(self, app, exclude_paths=()):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            return await self.app(scope, receive, send)
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        token = _current.set(profile)
+        trace = _start_trace()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                profile.headers_sent = time.perf_counter()
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            wall = time.perf_counter() - profile.started
+            _current.reset(token)
+            if trace is not None:
+                _finish_trace(trace, profile)
+            metrics.observe(profile, status, wall)
+            if wall * 1000 >= PROFILE_SLOW_MS:
+                _log_slow(profile, status, wall)
+
+
+class ProfiledRoute(APIRoute):
+    """Records the route template and the moment the endpoint returns."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed(endpoint, path), **kwargs)
+
+def _timed(endpoint, path: str):
+    def done():
+        profile = _current.get()
+        if profile is not None:
+            profile.route = path
+            profile.endpoint_done = time.perf_counter()
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                done()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                done()
+    return wrapper
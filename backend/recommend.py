@@ -0,0 +1,133 @@
+"""
+Mentor recommendations: ranks alumni for a student by bio/career text
+similarity (TF-IDF over a sparse alumni feature matrix), department match and
+current mentee load.
+
+The feature matrix is built once and scored with a single sparse mat-vec per
+request. Profile changes land in a small overlay that is scored alongside the
+matrix and folded back in once it grows, so updates never rebuild the world.
+
+The matrix itself lives in mentor_index.py, imported on the first build so
+numpy and scipy stay out of API startup. The index is per process;
+MENTOR_INDEX_MAX_AGE bounds how long another worker's changes can stay
+invisible, after which it is rebuilt.
+"""
+import os
+import time
+from collections import Counter, defaultdict
+from threading import RLock
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import AlumniProfile, Career, Department, Mentorship, Organization, Request, StudentProfile
+from search import tokenize
+
+if TYPE_CHECKING:
+    from mentor_index import MentorIndex
+
+MENTEE_CAP = int(os.getenv("MENTEE_CAP", 5))
+MENTOR_INDEX_MAX_AGE = float(os.getenv("MENTOR_INDEX_MAX_AGE", 900))
+
+WEIGHT_TEXT = 0.6
+WEIGHT_DEPARTMENT = 0.25
+WEIGHT_LOAD = 0.15
+# A student's interests are matched against alumni careers a little less strongly than against bios.
+CAREER_QUERY_WEIGHT = 0.8
+COMPACT_AFTER = 1000
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have i in is it my of on or the to with who".split()
+)
+
+
+def _terms(bio: Optional[str], careers: Iterable[Tuple[str, str]]) -> Counter:
+    terms = Counter(f"b:{t}" for t in tokenize(bio) if t not in STOPWORDS)
+    for role, organization in careers:
+        terms.update(f"c:{t}" for t in tokenize(f"{role} {organization}") if t not in STOPWORDS)
+    return terms
+
+
+# --- loading from the database ---
+
+_index: Optional["MentorIndex"] = None
+_index_lock = RLock()
+
+
+def _careers(session: Session, alumni_ids=None):
+    query = (
+        select(Career.alumni_id, Career.role, Organization.organization_name)
+        .join(Organization, Career.organization_id == Organization.organization_id)
+    )
+    if alumni_ids is not None:
+        query = query.where(Career.alumni_id.in_(alumni_ids))
+    careers = defaultdict(list)
+    for alumni_id, role, organization in session.execute(query.execution_options(yield_per=5000)):
+        careers[alumni_id].append((role, organization))
+    return careers
+
+def _profiles(session: Session):
+    return (
+        select(AlumniProfile.alumni_id, AlumniProfile.alumni_name, AlumniProfile.department_id,
+               Department.department_name, AlumniProfile.bio)
+        .join(Department, AlumniProfile.department_id == Department.department_id)
+    )
+
+def build_mentor_index(session: Session) -> "MentorIndex":
+    from mentor_index import MentorIndex
+
+    careers = _careers(session)
+    loads = dict(session.execute(
+        select(Mentorship.mentor_id, func.count()).group_by(Mentorship.mentor_id)
+    ).all())
+    docs = [
+        {
+            "alumni_id": alumni_id,
+            "name": name,
+            "department_id": department_id,
+            "department": department,
+            "terms": _terms(bio, careers.get(alumni_id, ())),
+            "load": loads.get(alumni_id, 0),
+        }
+        for alumni_id, name, department_id, department, bio
+        in session.execute(_profiles(session).execution_options(yield_per=5000))
+    ]
+    index = MentorIndex()
+    index.build(docs)
+    return index
+
+def get_mentor_index(session: Session) -> "MentorIndex":
+    global _index
+    with _index_lock:
+        if _index is None or time.monotonic() - _index.built_at > MENTOR_INDEX_MAX_AGE > 0:
+            _index = build_mentor_index(session)
+        return _index
+
+def reset_mentor_index():
+    global _index
+    with _index_lock:
+        _index = None
+
+def refresh_mentor(session: Session, alumni_id: int):
+    """Re-vectorizes one alumnus after their profile or careers change."""
+    if _index is None:
+        return
+    row = session.execute(_profiles(session).where(AlumniProfile.alumni_id == alumni_id)).first()
+    if row is None:
+        _index.remove(alumni_id)
+        return
+    _, name, department_id, department, bio = row
+    terms = _terms(bio, _careers(session, [alumni_id]).get(alumni_id, ()))
+    _index.upsert(alumni_id, name, department_id, department, terms)
+
+def adjust_mentor_load(alumni_id: int, delta: int):
+    if _index is not None:
+        _index.adjust_load(alumni_id, delta)
+
+def recommend_mentors(session: Session, student_id: int, k: int = 10):
+    student = session.get(StudentProfile, student_id)
+    if student is None:
+        return None
+    already_asked = session.scalars(select(Request.alumni_id).where(Request.student_id == student_id)).all()
+    return get_mentor_index(session).recommend(student.department_id, student.bio, k, already_asked)
@@ -0,0 +1,255 @@
+"""
+Indexed in-memory repository of compact records, used as a read-through cache
+in front of the SQLAlchemy models for GET /api/alumni/{id} and
+GET /api/event/{id}.
+
+As a cache it is bounded (REPOSITORY_MAX_RECORDS, oldest evicted first) and
+entries expire after REPOSITORY_TTL_SECONDS, which caps how long another
+worker's writes stay invisible; this worker's writes invalidate directly.
+"""
+import os
+from bisect import bisect_right, insort
+from dataclasses import dataclass
+from threading import RLock
+from time import monotonic
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+REPOSITORY_TTL_SECONDS = float(os.getenv("REPOSITORY_TTL_SECONDS", 30))
+REPOSITORY_MAX_RECORDS = int(os.getenv("REPOSITORY_MAX_RECORDS", 10000))
+
+
+class DuplicateKeyError(ValueError):
+    pass
+
+
+@dataclass
+class AlumnusRecord:
+    __slots__ = ("id", "name", "email", "graduation_year", "major")
+    id: int
+    name: str
+    email: str
+    graduation_year: int
+    major: str
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+@dataclass
+class EventRecord:
+    __slots__ = ("id", "title", "description", "start_time", "end_time", "status", "organizer_name",
+                 "capacity", "participant_count")
+    id: int
+    title: str
+    description: Optional[str]
+    start_time: str
+    end_time: Optional[str]
+    status: str
+    organizer_name: str
+    capacity: Optional[int]
+    participant_count: int
+
+    @classmethod
+    def from_dict(cls, event: dict):
+        return cls(**{**event, "id": int(event["id"])})
+
+    @property
+    def date(self) -> str:
+        return self.start_time[:10]
+
+    def to_dict(self):
+        # The API renders event ids as strings.
+        return {**{field: getattr(self, field) for field in self.__slots__}, "id": str(self.id)}
+
+
+class IndexedRepository:
+    """
+    In-memory store keyed by record id, with secondary indexes.
+
+    Lookups by id are a dict hit, pages come from a sorted id list, and every
+    write keeps the indexes in step under a single lock. With a `loader` (or
+    through aget) it doubles as a read-through cache: ids missing here are
+    fetched once and kept, for at most `ttl` seconds and `max_records` records.
+    """
+
+    indexed_fields: Tuple[str, ...] = ()
+    unique_fields: Tuple[str, ...] = ()
+
+    def __init__(self, records=(), loader: Optional[Callable[[int], Optional[object]]] = None,
+                 ttl: Optional[float] = None, max_records: Optional[int] = None):
+        self._lock = RLock()
+        self._loader = loader
+        self._ttl = ttl
+        self._max_records = max_records
+        # Bumped by every invalidation, so a load that raced a write is not cached.
+        self._generation = 0
+        self._by_id: Dict[int, object] = {}
+        self._expires: Dict[int, float] = {}
+        self._ids: List[int] = []
+        self._indexes: Dict[str, Dict[object, Set[int]]] = {field: {} for field in self.indexed_fields}
+        self._unique: Dict[str, Dict[object, int]] = {field: {} for field in self.unique_fields}
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, record_id: int):
+        return record_id in self._by_id
+
+    # --- reads ---
+
+    def get(self, record_id: int):
+        record = self._cached(record_id)
+        if record is None and self._loader is not None:
+            generation = self._generation
+            self._keep(self._loader(record_id), generation)
+            record = self._by_id.get(record_id)
+        return record
+
+    async def aget(self, record_id: int, load: Callable[[int], Awaitable[Optional[object]]]):
+        """get() for asyncio callers: `load` is awaited on a miss."""
+        record = self._cached(record_id)
+        if record is None:
+            generation = self._generation
+            record = await load(record_id)
+            self._keep(record, generation)
+        return record
+
+    def _cached(self, record_id: int):
+        record = self._by_id.get(record_id)
+        if record is not None and self._ttl is not None and self._expires.get(record_id, 0) < monotonic():
+            with self._lock:
+                if record_id in self._by_id and self._expires.get(record_id, 0) < monotonic():
+                    self._remove(self._by_id[record_id])
+            return None
+        return record
+
+    def _keep(self, record, generation: int):
+        if record is None:
+            return
+        with self._lock:
+            if generation == self._generation and record.id not in self._by_id:
+                self.put(record)
+
+    def find_by(self, field: str, value) -> List[object]:
+        if field in self._unique:
+            record_id = self._unique[field].get(value)
+            return [] if record_id is None else [self._by_id[record_id]]
+        with self._lock:
+            ids = sorted(self._indexes[field].get(value, ()))
+        return [self._by_id[record_id] for record_id in ids]
+
+    def page(self, limit: int, after: Optional[int] = None):
+        """Returns up to `limit` records with id > after, plus the last id if more remain."""
+        with self._lock:
+            start = 0 if after is None else bisect_right(self._ids, after)
+            ids = self._ids[start:start + limit + 1]
+            records = [self._by_id[record_id] for record_id in ids[:limit]]
+        next_after = ids[limit - 1] if len(ids) > limit else None
+        return records, next_after
+
+    def iter_all(self, batch_size: int = 500) -> Iterator[object]:
+        after = None
+        while True:
+            records, after = self.page(batch_size, after)
+            yield from records
+            if after is None:
+                return
+
+    # --- writes ---
+
+    def add(self, record):
+        with self._lock:
+            if record.id in self._by_id:
+                raise DuplicateKeyError(f"id {record.id} already exists")
+            self._check_unique(record)
+            self._insert(record)
+        return record
+
+    def put(self, record):
+        """Inserts or overwrites a record, evicting any other record that holds its unique keys."""
+        with self._lock:
+            old = self._by_id.get(record.id)
+            if old is not None:
+                self._remove(old)
+            for field, index in self._unique.items():
+                owner = index.get(getattr(record, field))
+                if owner is not None:
+                    self._remove(self._by_id[owner])
+            self._insert(record)
+        return record
+
+    def replace(self, record_id: int, record):
+        with self._lock:
+            old = self._by_id.get(record_id)
+            if old is None:
+                return None
+            if record.id != record_id and record.id in self._by_id:
+                raise DuplicateKeyError(f"id {record.id} already exists")
+            self._check_unique(record, ignore_id=record_id)
+            self._remove(old)
+            self._insert(record)
+        return record
+
+    def delete(self, record_id: int) -> bool:
+        with self._lock:
+            record = self._by_id.get(record_id)
+            if record is None:
+                return False
+            self._remove(record)
+        return True
+
+    def invalidate(self, record_id: int):
+        """Drops a cached record so the next read goes back to the loader."""
+        with self._lock:
+            self._generation += 1
+            record = self._by_id.get(record_id)
+            if record is not None:
+                self._remove(record)
+
+    # --- internals, caller holds the lock ---
+
+    def _check_unique(self, record, ignore_id: Optional[int] = None):
+        for field, index in self._unique.items():
+            owner = index.get(getattr(record, field))
+            if owner is not None and owner != ignore_id:
+                raise DuplicateKeyError(f"{field} {getattr(record, field)!r} already exists")
+
+    def _insert(self, record):
+        if self._max_records is not None:
+            while len(self._by_id) >= self._max_records:
+                self._remove(self._by_id[next(iter(self._by_id))])
+        self._by_id[record.id] = record
+        if self._ttl is not None:
+            self._expires[record.id] = monotonic() + self._ttl
+        insort(self._ids, record.id)
+        for field, index in self._indexes.items():
+            index.setdefault(getattr(record, field), set()).add(record.id)
+        for field, index in self._unique.items():
+            index[getattr(record, field)] = record.id
+
+    def _remove(self, record):
+        del self._by_id[record.id]
+        self._expires.pop(record.id, None)
+        del self._ids[bisect_right(self._ids, record.id) - 1]
+        for field, index in self._indexes.items():
+            ids = index[getattr(record, field)]
+            ids.discard(record.id)
+            if not ids:
+                del index[getattr(record, field)]
+        for field, index in self._unique.items():
+            del index[getattr(record, field)]
+
+
+class AlumniRepository(IndexedRepository):
+    indexed_fields = ("graduation_year", "major")
+    unique_fields = ("email",)
+
+
+class EventRepository(IndexedRepository):
+    indexed_fields = ("date",)
+
+
+alumni_repository = AlumniRepository(ttl=REPOSITORY_TTL_SECONDS, max_records=REPOSITORY_MAX_RECORDS)
+event_repository = EventRepository(ttl=REPOSITORY_TTL_SECONDS, max_records=REPOSITORY_MAX_RECORDS)
@@ -0,0 +1,201 @@
+"""
+Incrementally maintained analytics counters.
+
+Write paths call the record_* helpers inside their own transaction so the
+counters move with the data; refresh_rollups rebuilds them from the base
+tables (run it periodically, or after bulk loads that bypass the helpers).
+/api/analytics only ever reads the analytics_rollup table.
+"""
+import argparse
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import Date, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from models import (
+    AlumniProfile, AnalyticsRollup, Donation, Event, EventParticipation,
+    StudentProfile, User, UserRole,
+)
+
+COUNT_METRICS = (
+    "alumni_registrations", "student_registrations", "events",
+    "participations", "donation_count",
+)
+ROLLUP_KEY = ("day", "metric", "department_id", "event_id", "currency")
+
+
+def dialect_insert(session: Session):
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert
+
+def bump(session: Session, day: date, metric: str, amount=1,
+         department_id: Optional[int] = None, event_id: Optional[int] = None, currency: str = ""):
+    """Adds `amount` to one counter with a single INSERT ... ON CONFLICT DO UPDATE."""
+    stmt = dialect_insert(session)(AnalyticsRollup).values(
+        day=day,
+        metric=metric,
+        department_id=department_id or 0,
+        event_id=event_id or 0,
+        currency=currency or "",
+        value=amount,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={"value": AnalyticsRollup.value + stmt.excluded.value},
+    )
+    session.execute(stmt)
+
+
+# --- write-path hooks ---
+
+def record_registration(session: Session, role: UserRole, department_id: Optional[int],
+                        created_at: Optional[datetime] = None, delta: int = 1):
+    if role not in (UserRole.Alumni, UserRole.Student):
+        return
+    day = (created_at or datetime.now()).date()
+    bump(session, day, f"{role.value.lower()}_registrations", delta, department_id=department_id)
+
+def record_event(session: Session, event: Event, delta: int = 1):
+    bump(session, event.start_time.date(), "events", delta)
+
+def record_participation(session: Session, event: Event, department_id: Optional[int], delta: int = 1):
+    bump(session, event.start_time.date(), "participations", delta,
+         department_id=department_id, event_id=event.event_id)
+
+def record_donations(session: Session, day: date, amount, count: int, department_id: Optional[int],
+                     event_id: Optional[int], currency: str = "INR"):
+    """`count` donations totalling `amount` on one day for one department, event and currency."""
+    bump(session, day, "donations", amount, department_id=department_id, event_id=event_id, currency=currency)
+    bump(session, day, "donation_count", count, department_id=department_id, event_id=event_id)
+
+
+# --- periodic rebuild ---
+
+def _day(column):
+    return func.date(column, type_=Date)
+
+def _rebuild_selects(since: Optional[datetime]):
+    def after(column, query):
+        return query if since is None else query.where(column >= since)
+
+    zero = literal(0)
+    blank = literal("")
+    yield after(User.created_at, select(
+        _day(User.created_at), literal("alumni_registrations"), AlumniProfile.department_id,
+        zero, blank, func.count(),
+    ).join(AlumniProfile, AlumniProfile.alumni_id == User.user_id)
+     .group_by(_day(User.created_at), AlumniProfile.department_id))
+
+    yield after(User.created_at, select(
+        _day(User.created_at), literal("student_registrations"), StudentProfile.department_id,
+        zero, blank, func.count(),
+    ).join(StudentProfile, StudentProfile.student_id == User.user_id)
+     .group_by(_day(User.created_at), StudentProfile.department_id))
+
+    yield after(Event.start_time, select(
+        _day(Event.start_time), literal("events"), zero, zero, blank, func.count(),
+    ).group_by(_day(Event.start_time)))
+
+    yield after(Event.start_time, select(
+        _day(Event.start_time), literal("participations"), AlumniProfile.department_id,
+        Event.event_id, blank, func.count(),
+    ).select_from(EventParticipation)
+     .join(Event, Event.event_id == EventParticipation.event_id)
+     .join(AlumniProfile, AlumniProfile.alumni_id == EventParticipation.alumni_id)
+     .group_by(_day(Event.start_time), AlumniProfile.department_id, Event.event_id))
+
+    donation_event = func.coalesce(Donation.event_id, 0)
+    yield after(Donation.donation_date, select(
+        _day(Donation.donation_date), literal("donations"), AlumniProfile.department_id,
+        donation_event, Donation.currency, func.sum(Donation.amount),
+    ).join(AlumniProfile, AlumniProfile.alumni_id == Donation.alumni_id)
+     .group_by(_day(Donation.donation_date), AlumniProfile.department_id, donation_event, Donation.currency))
+
+    yield after(Donation.donation_date, select(
+        _day(Donation.donation_date), literal("donation_count"), AlumniProfile.department_id,
+        donation_event, blank, func.count(),
+    ).join(AlumniProfile, AlumniProfile.alumni_id == Donation.alumni_id)
+     .group_by(_day(Donation.donation_date), AlumniProfile.department_id, donation_event))
+
+def refresh_rollups(session: Session, since: Optional[date] = None):
+    """Recomputes every counter for days >= since (all days when since is None) in one transaction."""
+    since_dt = datetime.combine(since, time()) if since else None
+    deleted = session.query(AnalyticsRollup)
+    if since is not None:
+        deleted = deleted.filter(AnalyticsRollup.day >= since)
+    deleted.delete(synchronize_session=False)
+
+    columns = [*ROLLUP_KEY, "value"]
+    for query in _rebuild_selects(since_dt):
+        session.execute(insert(AnalyticsRollup).from_select(columns, query))
+    session.commit()
+
+
+# --- reads ---
+
+def summarize(session: Session, start: Optional[date] = None, end: Optional[date] = None):
+    """Totals and per-department breakdown for [start, end], read from the rollups only."""
+    query = session.query(
+        AnalyticsRollup.metric,
+        AnalyticsRollup.department_id,
+        AnalyticsRollup.currency,
+        func.sum(AnalyticsRollup.value),
+    )
+    if start is not None:
+        query = query.filter(AnalyticsRollup.day >= start)
+    if end is not None:
+        query = query.filter(AnalyticsRollup.day <= end)
+    rows = query.group_by(
+        AnalyticsRollup.metric, AnalyticsRollup.department_id, AnalyticsRollup.currency
+    ).all()
+
+    totals = {metric: 0 for metric in COUNT_METRICS}
+    donations = defaultdict(float)
+    by_department = defaultdict(lambda: {metric: 0 for metric in COUNT_METRICS})
+    for metric, department_id, currency, value in rows:
+        if metric == "donations":
+            donations[currency] += float(value)
+            continue
+        totals[metric] += int(value)
+        if department_id:
+            by_department[department_id][metric] += int(value)
+
+    return {
+        "from": start,
+        "to": end,
+        "alumni_count": totals["alumni_registrations"],
+        "student_count": totals["student_registrations"],
+        "event_count": totals["events"],
+        "participation_count": totals["participations"],
+        "donation_count": totals["donation_count"],
+        "donations": dict(donations),
+        "by_department": [
+            {"department_id": department_id, **counts}
+            for department_id, counts in sorted(by_department.items())
+        ],
+    }
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild analytics rollups from the base tables.")
+    parser.add_argument("--since", type=date.fromisoformat, help="only rebuild days on or after this date")
+    parser.add_argument("--days", type=int, help="only rebuild the last N days")
+    args = parser.parse_args()
+
+    since = args.since
+    if args.days is not None:
+        since = date.today() - timedelta(days=args.days)
+
+    db = SessionLocal()
+    try:
+        refresh_rollups(db, since)
+    finally:
+        db.close()
+    print("Analytics rollups refreshed")
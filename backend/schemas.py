@@ -1,22 +1,227 @@
-from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional
-from models import EventType
+from pydantic import AfterValidator, BaseModel, Field, model_validator
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Annotated, List, Optional
+from models import EventType, OpportunityType, ParticipantRole
+
+def naive_local(value: Optional[datetime]) -> Optional[datetime]:
+    """Event times are stored as naive local time; aware input is converted to it."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+LocalDateTime = Annotated[datetime, AfterValidator(naive_local)]
+
+def check_event_period(start_time: Optional[datetime], end_time: Optional[datetime]):
+    if start_time is not None and end_time is not None and end_time < start_time:
+        raise ValueError("end_time must not be before start_time")
 
 class EventCreate(BaseModel):
     event_name: str
     event_type: EventType
-    start_time: datetime
-    end_time: Optional[datetime] = None
+    start_time: LocalDateTime
+    end_time: Optional[LocalDateTime] = None
     description: Optional[str] = None
     event_org_id: int
     req_donation: Optional[int] = 0
+    capacity: Optional[int] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def check_period(self):
+        check_event_period(self.start_time, self.end_time)
+        return self
 
 class EventUpdate(BaseModel):
     event_name: Optional[str] = None
     event_type: Optional[EventType] = None
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
+    start_time: Optional[LocalDateTime] = None
+    end_time: Optional[LocalDateTime] = None
     description: Optional[str] = None
     event_org_id: Optional[int] = None
     req_donation: Optional[int] = None
+    capacity: Optional[int] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def check_period(self):
+        # Only one side given: checked against the stored event in crud.apply_event_update.
+        check_event_period(self.start_time, self.end_time)
+        return self
+
+class AlumniSearchHit(BaseModel):
+    id: int
+    name: str
+    graduation_year: int
+    department: Optional[str] = None
+    organizations: List[str] = []
+    score: float
+
+class EventOut(BaseModel):
+    id: str
+    title: str
+    description: Optional[str] = None
+    start_time: str
+    end_time: Optional[str] = None
+    status: str
+    organizer_name: str
+    capacity: Optional[int] = None
+    participant_count: int = 0
+
+class CareerOut(BaseModel):
+    career_id: int
+    organization: str
+    role: str
+    location: Optional[str] = None
+    started_on: date
+    worked_till: Optional[date] = None
+    is_current: bool
+    description: Optional[str] = None
+
+class ParticipationOut(BaseModel):
+    event_id: int
+    title: str
+    start_time: datetime
+    end_time: Optional[datetime] = None
+    organizer_name: str
+    role: str
+    feedback: Optional[str] = None
+
+class DonationOut(BaseModel):
+    donation_id: int
+    event_id: Optional[int] = None
+    amount: Decimal
+    currency: str
+    donation_date: datetime
+
+class AlumniProfileOut(BaseModel):
+    id: int
+    name: str
+    email: str
+    ph_no: Optional[str] = None
+    graduation_year: int
+    department: str
+    bio: Optional[str] = None
+    linkedin_profile_url: Optional[str] = None
+    careers: List[CareerOut] = []
+    events: List[ParticipationOut] = []
+    donations: List[DonationOut] = []
+
+class MentorRecommendation(BaseModel):
+    alumni_id: int
+    name: str
+    department: str
+    same_department: bool
+    text_similarity: float
+    current_mentees: int
+    score: float
+
+class ParticipantIn(BaseModel):
+    alumni_id: int
+    role: ParticipantRole = ParticipantRole.Participant
+    feedback: Optional[str] = None
+
+class ParticipantUpdate(BaseModel):
+    alumni_id: int
+    role: Optional[ParticipantRole] = None
+    feedback: Optional[str] = None
+
+class ParticipantRemoval(BaseModel):
+    alumni_ids: List[int] = Field(..., min_length=1, max_length=10000)
+
+class ParticipationBatchResult(BaseModel):
+    event_id: int
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    missing: List[int] = []
+    participant_count: int
+    capacity: Optional[int] = None
+
+class OpportunityCreate(BaseModel):
+    posted_by_alumni_id: int
+    organization_id: Optional[int] = None
+    type: OpportunityType
+    title: str = Field(..., min_length=1)
+    description: str
+    target_audience: Optional[str] = None
+    expires_at: Optional[datetime] = None
+
+class OpportunityOut(BaseModel):
+    id: int
+    type: str
+    title: str
+    description: str
+    organization_id: Optional[int] = None
+    organization_name: Optional[str] = None
+    posted_by_alumni_id: int
+    posted_by: str
+    target_audience: Optional[str] = None
+    created_at: str
+    expires_at: Optional[str] = None
+
+class DonationTotalOut(BaseModel):
+    currency: str
+    total: Decimal
+    donations: int
+
+class DonationProgress(BaseModel):
+    event_id: int
+    target: Decimal
+    totals: List[DonationTotalOut] = []
+
+class DonationReceipt(BaseModel):
+    transaction_id: str
+    status: str
+
+class NetworkPosition(BaseModel):
+    organization_id: int
+    organization: Optional[str] = None
+    role: str
+    location: Optional[str] = None
+
+class NetworkAlumnus(BaseModel):
+    id: int
+    name: str
+    graduation_year: int
+    department_id: int
+    department: Optional[str] = None
+    positions: List[NetworkPosition] = []
+    current: Optional[bool] = None
+
+class FacetCount(BaseModel):
+    id: int
+    name: Optional[str] = None
+    count: int
+
+class YearCount(BaseModel):
+    value: int
+    count: int
+
+class NetworkFacets(BaseModel):
+    total: int
+    organizations: List[FacetCount] = []
+    departments: List[FacetCount] = []
+    graduation_years: List[YearCount] = []
+
+class MentorshipRequestOut(BaseModel):
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    requested_at: datetime
+    status: str
+    student_id: int
+    student_name: str
+    alumni_id: int
+    alumni_name: str
+    mentor_load: int
+    mentor_at_capacity: bool
+
+class MentorshipBulkAction(BaseModel):
+    accept: List[int] = Field([], max_length=10000)
+    reject: List[int] = Field([], max_length=10000)
+
+class MentorshipBulkResult(BaseModel):
+    accepted: List[int] = []
+    rejected: List[int] = []
+    over_capacity: List[int] = []
+    skipped: List[int] = []
+    mentee_cap: int
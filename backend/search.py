@@ -0,0 +1,280 @@
+import math
+import os
+import re
+import time
+from collections import defaultdict
+from heapq import nlargest
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from models import AlumniProfile, Career, Department, Organization
+
+# Relative weight of a match in each field when ranking results.
+FIELD_WEIGHTS = {"name": 3.0, "organization": 2.0, "department": 2.0, "bio": 1.0}
+FUZZY_THRESHOLD = 0.3
+# Seconds before the in-process index is rebuilt, so other workers' writes show up; 0 disables.
+SEARCH_INDEX_MAX_AGE = float(os.getenv("SEARCH_INDEX_MAX_AGE", 300))
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(value.lower()) if value else []
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AlumniSearchIndex:
+    """
+    In-process inverted index used when the database has no full-text search
+    (SQLite, tests). Exact terms are looked up in the postings; name terms that
+    have no exact hit fall back to trigram similarity against the name vocabulary.
+    It is per process, so get_search_index rebuilds it after SEARCH_INDEX_MAX_AGE.
+    """
+
+    def __init__(self):
+        self.built_at = time.monotonic()
+        self._lock = RLock()
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._name_trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._docs: Dict[int, dict] = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, alumni_id: int, name: str, graduation_year: int, department: Optional[str],
+            bio: Optional[str] = None, organizations: Iterable[str] = ()):
+        organizations = sorted(set(organizations))
+        fields = {
+            "name": tokenize(name),
+            "department": tokenize(department),
+            "organization": [t for org in organizations for t in tokenize(org)],
+            "bio": tokenize(bio),
+        }
+        with self._lock:
+            if alumni_id in self._docs:
+                self._remove(alumni_id)
+            terms: Dict[str, float] = {}
+            for field, tokens in fields.items():
+                for token in tokens:
+                    terms[token] = max(terms.get(token, 0.0), FIELD_WEIGHTS[field])
+            for token, weight in terms.items():
+                self._postings[token][alumni_id] = weight
+            for token in fields["name"]:
+                for gram in trigrams(token):
+                    self._name_trigrams[gram].add(token)
+            self._docs[alumni_id] = {
+                "id": alumni_id,
+                "name": name,
+                "graduation_year": graduation_year,
+                "department": department,
+                "organizations": organizations,
+                "terms": tuple(terms),
+            }
+
+    def remove(self, alumni_id: int):
+        with self._lock:
+            if alumni_id in self._docs:
+                self._remove(alumni_id)
+
+    def _remove(self, alumni_id: int):
+        for token in self._docs.pop(alumni_id)["terms"]:
+            docs = self._postings.get(token)
+            if docs is not None:
+                docs.pop(alumni_id, None)
+                if not docs:
+                    del self._postings[token]
+        # Stale trigram -> token entries are harmless: a token without postings scores nothing.
+
+    def _fuzzy_terms(self, token: str):
+        grams = trigrams(token)
+        candidates: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self._name_trigrams.get(gram, ()):
+                candidates[candidate] += 1
+        for candidate, shared in candidates.items():
+            similarity = shared / (len(grams) + len(trigrams(candidate)) - shared)
+            if similarity >= FUZZY_THRESHOLD and candidate in self._postings:
+                yield candidate, similarity
+
+    def search(self, query: str, limit: int = 20, offset: int = 0):
+        scores: Dict[int, float] = defaultdict(float)
+        with self._lock:
+            total_docs = len(self._docs) or 1
+            for token in set(tokenize(query)):
+                matches = [(token, 1.0)] if token in self._postings else list(self._fuzzy_terms(token))
+                for term, similarity in matches:
+                    docs = self._postings[term]
+                    idf = math.log(1 + total_docs / len(docs))
+                    for alumni_id, weight in docs.items():
+                        scores[alumni_id] += weight * idf * similarity
+            top = nlargest(offset + limit, scores.items(), key=lambda item: (item[1], -item[0]))[offset:]
+            results = []
+            for alumni_id, score in top:
+                doc = self._docs[alumni_id]
+                results.append({
+                    "id": doc["id"],
+                    "name": doc["name"],
+                    "graduation_year": doc["graduation_year"],
+                    "department": doc["department"],
+                    "organizations": doc["organizations"],
+                    "score": round(score, 4),
+                })
+        return results
+
+
+_index: Optional[AlumniSearchIndex] = None
+_index_lock = RLock()
+
+
+def _alumni_organizations(session: Session, alumni_ids=None):
+    query = (
+        session.query(Career.alumni_id, Organization.organization_name)
+        .join(Organization, Career.organization_id == Organization.organization_id)
+    )
+    if alumni_ids is not None:
+        query = query.filter(Career.alumni_id.in_(alumni_ids))
+    organizations = defaultdict(list)
+    for alumni_id, organization_name in query.yield_per(1000):
+        organizations[alumni_id].append(organization_name)
+    return organizations
+
+def _profiles_query(session: Session):
+    return (
+        session.query(
+            AlumniProfile.alumni_id,
+            AlumniProfile.alumni_name,
+            AlumniProfile.graduation_year,
+            Department.department_name,
+            AlumniProfile.bio,
+        )
+        .join(Department, AlumniProfile.department_id == Department.department_id)
+    )
+
+def build_search_index(session: Session) -> AlumniSearchIndex:
+    index = AlumniSearchIndex()
+    organizations = _alumni_organizations(session)
+    for alumni_id, name, year, department, bio in _profiles_query(session).yield_per(1000):
+        index.add(alumni_id, name, year, department, bio, organizations.get(alumni_id, ()))
+    return index
+
+def get_search_index(session: Session) -> AlumniSearchIndex:
+    global _index
+    with _index_lock:
+        if _index is None or time.monotonic() - _index.built_at > SEARCH_INDEX_MAX_AGE > 0:
+            _index = build_search_index(session)
+        return _index
+
+def reset_search_index():
+    """Drops the in-process index after bulk changes; it is rebuilt on the next search."""
+    global _index
+    with _index_lock:
+        _index = None
+
+def refresh_alumnus(session: Session, alumni_id: int):
+    """Re-indexes one alumnus after their profile or careers change."""
+    if session.get_bind().dialect.name == "postgresql" or _index is None:
+        return
+    row = _profiles_query(session).filter(AlumniProfile.alumni_id == alumni_id).first()
+    if row is None:
+        _index.remove(alumni_id)
+        return
+    organizations = _alumni_organizations(session, [alumni_id]).get(alumni_id, ())
+    _index.add(*row, organizations)
+
+
+# --- Postgres: tsvector + pg_trgm ---
+
+PG_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """CREATE INDEX IF NOT EXISTS ix_alumni_profiles_search ON alumni_profiles
+       USING GIN (to_tsvector('simple', alumni_name || ' ' || coalesce(bio, '')))""",
+    "CREATE INDEX IF NOT EXISTS ix_alumni_profiles_name_trgm ON alumni_profiles USING GIN (alumni_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_department_name_trgm ON department USING GIN (department_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_organization_name_trgm ON organization USING GIN (organization_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_career_alumni_id ON career (alumni_id)",
+    "CREATE INDEX IF NOT EXISTS ix_career_organization_id ON career (organization_id)",
+    "CREATE INDEX IF NOT EXISTS ix_alumni_profiles_department_id ON alumni_profiles (department_id)",
+]
+
+# Each candidate branch is served by one index (GIN tsvector, name trigram,
+# organization trigram, department trigram); OR-ing them in one WHERE over
+# LEFT JOINs would force a sequential scan of alumni_profiles.
+PG_SEARCH_SQL = text("""
+    WITH q AS (SELECT plainto_tsquery('simple', :q) AS tsq),
+    matched_orgs AS (
+        SELECT c.alumni_id, max(similarity(o.organization_name, :q)) AS sim
+        FROM organization o JOIN career c ON c.organization_id = o.organization_id
+        WHERE o.organization_name % :q OR o.organization_name ILIKE '%' || :q || '%'
+        GROUP BY c.alumni_id
+    ),
+    matched_depts AS (
+        SELECT department_id, similarity(department_name, :q) AS sim
+        FROM department
+        WHERE department_name % :q OR department_name ILIKE '%' || :q || '%'
+    ),
+    candidates AS (
+        SELECT a.alumni_id FROM alumni_profiles a, q
+        WHERE to_tsvector('simple', a.alumni_name || ' ' || coalesce(a.bio, '')) @@ q.tsq
+        UNION
+        SELECT alumni_id FROM alumni_profiles WHERE alumni_name % :q
+        UNION
+        SELECT alumni_id FROM matched_orgs
+        UNION
+        SELECT a.alumni_id FROM alumni_profiles a JOIN matched_depts md ON md.department_id = a.department_id
+    ),
+    hits AS (
+        SELECT a.alumni_id,
+               3 * similarity(a.alumni_name, :q)
+             + ts_rank(to_tsvector('simple', a.alumni_name || ' ' || coalesce(a.bio, '')), q.tsq)
+             + 2 * coalesce(mo.sim, 0) + 2 * coalesce(md.sim, 0) AS score
+        FROM candidates cand
+        JOIN alumni_profiles a ON a.alumni_id = cand.alumni_id
+        CROSS JOIN q
+        LEFT JOIN matched_orgs mo ON mo.alumni_id = a.alumni_id
+        LEFT JOIN matched_depts md ON md.department_id = a.department_id
+        ORDER BY score DESC, a.alumni_id
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT h.alumni_id, a.alumni_name, a.graduation_year, d.department_name,
+           coalesce(array_agg(DISTINCT o.organization_name)
+                    FILTER (WHERE o.organization_name IS NOT NULL), '{}') AS organizations,
+           h.score
+    FROM hits h
+    JOIN alumni_profiles a ON a.alumni_id = h.alumni_id
+    JOIN department d ON d.department_id = a.department_id
+    LEFT JOIN career c ON c.alumni_id = h.alumni_id
+    LEFT JOIN organization o ON o.organization_id = c.organization_id
+    GROUP BY h.alumni_id, a.alumni_name, a.graduation_year, d.department_name, h.score
+    ORDER BY h.score DESC, h.alumni_id
+""")
+
+
+def create_search_indexes(session: Session):
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    for statement in PG_SEARCH_DDL:
+        session.execute(text(statement))
+    session.commit()
+
+def search_alumni(session: Session, q: str, limit: int = 20, offset: int = 0):
+    if session.get_bind().dialect.name != "postgresql":
+        return get_search_index(session).search(q, limit, offset)
+
+    rows = session.execute(PG_SEARCH_SQL, {"q": q, "limit": limit, "offset": offset})
+    return [
+        {
+            "id": alumni_id,
+            "name": name,
+            "graduation_year": year,
+            "department": department,
+            "organizations": sorted(organizations),
+            "score": round(float(score), 4),
+        }
+        for alumni_id, name, year, department, organizations, score in rows
+    ]
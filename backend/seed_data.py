@@ -1,14 +1,15 @@
 from sqlalchemy.orm import Session
-from database import engine, SessionLocal
+import argparse
+from database import SessionLocal, create_schema
 from models import (
-    Base, User, UserRole, AlumniProfile, StudentProfile,
+    User, UserRole, AlumniProfile, StudentProfile,
     Department, EventOrganizer, Event, EventType, EventOrgType
 )
 from datetime import datetime
 from auth import hash_password
-
-# Create all tables
-Base.metadata.create_all(bind=engine)
+from rollups import refresh_rollups
+from search import create_search_indexes
+from event_calendar import create_calendar_index
 
 # Seed data
 def seed():
@@ -73,8 +74,21 @@ def seed():
     db.add_all([event1, event2])
     db.commit()
 
+    refresh_rollups(db)
     db.close()
     print("Seed data inserted!")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the development database.")
+    parser.add_argument("--create-schema", action="store_true", help="create tables plus search and calendar indexes first")
+    args = parser.parse_args()
+
+    if args.create_schema:
+        create_schema()
+        db = SessionLocal()
+        try:
+            create_search_indexes(db)
+            create_calendar_index(db)
+        finally:
+            db.close()
     seed()
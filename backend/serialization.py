@@ -0,0 +1,84 @@
+"""
+Fast JSON for list endpoints: SQL result tuples go straight to JSON bytes.
+
+A RowShape is declared once per endpoint (output key -> column position, plus
+an optional converter) and compiled into a plain function with a dict literal,
+so there is no per-field loop, no .isoformat() per datetime and no
+jsonable_encoder walk; orjson formats datetimes, dates, enums and UUIDs itself
+(identically to .isoformat() / .value). RawJSON marks bytes that are already
+encoded, and json_response() returns them as-is, which also skips FastAPI's
+response_model re-validation: use it only for data built by our own queries.
+
+Falls back to the standard json module when orjson is not installed.
+"""
+import enum
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if orjson is None:
+        if isinstance(value, (datetime, date, time)):
+            return value.isoformat()
+        if isinstance(value, enum.Enum):
+            return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+if orjson is not None:
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_default)
+else:
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+class RawJSON(bytes):
+    """JSON that is already encoded; passed through untouched by json_response and cached_json."""
+
+
+def json_response(content: Union[RawJSON, Any], status_code: int = 200,
+                  headers: Optional[Mapping[str, str]] = None) -> Response:
+    body = content if isinstance(content, RawJSON) else dumps(content)
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+Field = Union[int, Tuple[int, Callable]]
+
+class RowShape:
+    """
+    Maps result tuples to JSON objects. `fields` is {output key: column index}
+    or {output key: (column index, converter)}; converters run only where the
+    JSON value differs from the column value (e.g. ids rendered as strings).
+    """
+
+    def __init__(self, **fields: Field):
+        self.keys = tuple(fields)
+        self._converters = {}
+        items = []
+        for key, spec in fields.items():
+            index, convert = spec if isinstance(spec, tuple) else (spec, None)
+            value = f"r[{index}]"
+            if convert is not None:
+                name = f"c_{len(self._converters)}"
+                self._converters[name] = convert
+                value = f"{name}({value})"
+            items.append(f"{key!r}: {value}")
+        source = f"def raw(r): return {{{', '.join(items)}}}\n"
+        namespace = dict(self._converters)
+        exec(compile(source, f"<RowShape {', '.join(self.keys)}>", "exec"), namespace)
+        self.raw = namespace["raw"]
+
+    def encode(self, rows: Iterable[Sequence]) -> RawJSON:
+        raw = self.raw
+        return RawJSON(dumps([raw(r) for r in rows]))
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# The backend modules are imported flat (import main, import crud), as uvicorn runs them.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_session(tmp_path):
+    """sessionmaker over a fresh SQLite file with the full schema."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from models import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
@@ -0,0 +1,88 @@
+"""Donation ingestion: retried transaction ids are dropped by ON CONFLICT and never move the totals twice."""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+import donations
+from donations import DonationIn
+from models import (
+    AlumniProfile, AnalyticsRollup, Department, Donation, DonationTotal, Event, EventOrganizer, EventOrgType,
+    EventType, User, UserRole,
+)
+
+PAID = datetime(2030, 1, 1, 9)
+
+
+@pytest.fixture
+def session(make_session):
+    with make_session() as session:
+        department = Department(department_name="Physics")
+        organizer = EventOrganizer(event_org_type=EventOrgType.Club, event_org_name="Club")
+        session.add_all([department, organizer])
+        session.flush()
+        for alumni_id in (1, 2):
+            session.add_all([
+                User(user_id=alumni_id, email=f"a{alumni_id}@x.com", password_hash="x", role=UserRole.Alumni),
+                AlumniProfile(alumni_id=alumni_id, alumni_name=f"A{alumni_id}", graduation_year=2020,
+                              department_id=department.department_id),
+            ])
+        session.add(Event(event_id=1, event_name="Gala", event_type=EventType.Cultural,
+                          start_time=datetime(2030, 2, 1), event_org_id=organizer.event_org_id))
+        session.commit()
+        yield session
+
+
+def gift(transaction_id, amount, alumni_id=1, event_id=1, currency="INR"):
+    return DonationIn(transaction_id=transaction_id, alumni_id=alumni_id, event_id=event_id,
+                      amount=Decimal(amount), currency=currency, donation_date=PAID)
+
+
+def ingest(session, *batch):
+    result = donations.ingest_batch(session, list(batch))
+    session.commit()
+    return result
+
+
+def totals(session):
+    rows = session.execute(select(DonationTotal.event_id, DonationTotal.currency,
+                                  DonationTotal.total, DonationTotal.donation_count))
+    return {(event_id, currency): (total, count) for event_id, currency, total, count in rows}
+
+
+def rollup(session, metric):
+    return session.scalar(select(func.sum(AnalyticsRollup.value)).where(AnalyticsRollup.metric == metric))
+
+
+def test_retried_transaction_ids_are_counted_once(session):
+    first = ingest(session, gift("t1", "10.00"), gift("t2", "5.50", alumni_id=2), gift("t1", "10.00"),
+                   gift("g1", "3.00", event_id=None))
+    assert first.inserted == ["t1", "t2", "g1"] and first.duplicates == ["t1"]
+
+    retry = ingest(session, gift("t2", "5.50", alumni_id=2), gift("t3", "1.25"), gift("u1", "2", currency="usd"))
+    assert retry.inserted == ["t3", "u1"] and retry.duplicates == ["t2"]
+
+    assert session.scalar(select(func.count()).select_from(Donation)) == 5
+    assert totals(session) == {
+        (1, "INR"): (Decimal("16.75"), 3),
+        (0, "INR"): (Decimal("3.00"), 1),
+        (1, "USD"): (Decimal("2.00"), 1),
+    }
+    assert rollup(session, "donation_count") == 5
+    assert rollup(session, "donations") == Decimal("21.75")
+
+
+def test_unknown_alumni_and_events_are_rejected(session):
+    result = ingest(session, gift("t1", "1", alumni_id=99), gift("t2", "1", event_id=42), gift("t3", "1"))
+    assert result.inserted == ["t3"]
+    assert result.rejected == {"t1": "unknown alumnus 99", "t2": "unknown event 42"}
+    assert totals(session) == {(1, "INR"): (Decimal("1.00"), 1)}
+
+
+def test_flusher_reports_only_events_that_received_new_donations(session, make_session):
+    ingest(session, gift("t1", "1"))
+    flushed = []
+    flusher = donations.DonationFlusher(make_session, on_flushed=flushed.append)
+    result = flusher._flush([gift("t1", "1"), gift("g1", "1", event_id=None)])
+    assert (result.inserted, result.duplicates, flushed) == (["g1"], ["t1"], [{None}])
@@ -0,0 +1,88 @@
+"""Bulk accept: the mentee cap is applied in one INSERT ... SELECT, oldest requests first."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+import mentorship
+from models import (
+    AlumniProfile, Department, Mentorship, MentorshipStatus, Request, StudentProfile, User, UserRole,
+)
+
+T0 = datetime(2030, 1, 1)
+
+
+@pytest.fixture
+def session(make_session, monkeypatch):
+    monkeypatch.setattr(mentorship, "MENTEE_CAP", 2)
+    with make_session() as session:
+        department = Department(department_name="Physics")
+        session.add(department)
+        session.flush()
+        for user_id in (1, 2):
+            session.add_all([
+                User(user_id=user_id, email=f"a{user_id}@x.com", password_hash="x", role=UserRole.Alumni),
+                AlumniProfile(alumni_id=user_id, alumni_name=f"A{user_id}", graduation_year=2020,
+                              department_id=department.department_id),
+            ])
+        for user_id in range(10, 17):
+            session.add_all([
+                User(user_id=user_id, email=f"s{user_id}@x.com", password_hash="x", role=UserRole.Student),
+                StudentProfile(student_id=user_id, student_name=f"S{user_id}", department_id=department.department_id),
+            ])
+        session.commit()
+        yield session
+
+
+def request(session, request_id, alumni_id, student_id, minutes, status=MentorshipStatus.Pending):
+    session.add(Request(request_id=request_id, alumni_id=alumni_id, student_id=student_id,
+                        requested_at=T0 + timedelta(minutes=minutes), req_status=status))
+
+
+def statuses(session):
+    return dict(session.execute(select(Request.request_id, Request.req_status)).all())
+
+
+def test_cap_is_ranked_by_age_within_one_batch(session):
+    # Alumnus 1 already mentors one student, so one more fits.
+    request(session, 100, 1, 10, 0, MentorshipStatus.Accepted)
+    session.add(Mentorship(request_id=100, mentor_id=1))
+    request(session, 1, 1, 11, minutes=30)
+    request(session, 2, 1, 12, minutes=10)  # oldest pending for alumnus 1
+    request(session, 3, 1, 13, minutes=20)
+    request(session, 4, 2, 14, minutes=5)
+    request(session, 5, 2, 15, minutes=6)
+    request(session, 6, 2, 16, minutes=7)
+    session.commit()
+
+    result = mentorship.process_requests(session, accept=[1, 2, 3, 4, 5], reject=[6, 100])
+
+    assert result["accepted"] == [2, 4, 5]
+    assert result["over_capacity"] == [1, 3]
+    assert result["rejected"] == [6]
+    assert result["skipped"] == [100]
+    assert statuses(session) == {
+        100: MentorshipStatus.Accepted, 1: MentorshipStatus.Pending, 2: MentorshipStatus.Accepted,
+        3: MentorshipStatus.Pending, 4: MentorshipStatus.Accepted, 5: MentorshipStatus.Accepted,
+        6: MentorshipStatus.Rejected,
+    }
+    mentees = session.execute(select(Mentorship.mentor_id, Mentorship.request_id).order_by(Mentorship.request_id))
+    assert mentees.all() == [(1, 2), (2, 4), (2, 5), (1, 100)]
+
+
+def test_accept_and_reject_the_same_request(session):
+    request(session, 1, 1, 11, minutes=0)
+    session.commit()
+    with pytest.raises(ValueError):
+        mentorship.process_requests(session, accept=[1], reject=[1])
+
+
+def test_queue_pages_oldest_first_with_mentor_load(session):
+    for request_id, minutes in ((1, 30), (2, 10), (3, 20)):
+        request(session, request_id, 1, 10 + request_id, minutes)
+    session.commit()
+
+    first, cursor = mentorship.get_request_queue(session, limit=2)
+    rest, end = mentorship.get_request_queue(session, limit=2, after=cursor)
+    assert [r["id"] for r in first] == [2, 3] and [r["id"] for r in rest] == [1] and end is None
+    assert first[0]["mentor_load"] == 0 and not first[0]["mentor_at_capacity"]
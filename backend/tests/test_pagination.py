@@ -0,0 +1,54 @@
+"""Keyset cursors: anything encode_cursor could not have produced is a ValueError (400 at the API)."""
+from datetime import datetime
+
+import pytest
+
+import crud
+import mentorship
+import opportunities
+from pagination import decode_keyset, encode_cursor
+
+NOW = datetime(2030, 1, 1, 12, 30)
+
+MALFORMED = [
+    "not base64 !",
+    encode_cursor(NOW),              # too few components
+    encode_cursor(NOW, 1, 2),        # too many
+    encode_cursor(1, 2),             # id where a timestamp belongs
+    encode_cursor("yesterday", 1),   # unparseable timestamp
+    encode_cursor(NOW, "1"),         # id as a string
+    encode_cursor(NOW, 1.5),
+    encode_cursor(NOW, True),
+    encode_cursor(NOW, None),
+    "eyJhIjoxfQ",                    # a JSON object, not a list
+]
+
+PAGE_SELECTS = [
+    lambda after: crud.events_page_select(10, after, None, NOW),
+    lambda after: mentorship.queue_select(10, after),
+    lambda after: opportunities.feed_select(10, after),
+]
+
+
+def test_round_trip():
+    assert decode_keyset(encode_cursor(NOW, 7), datetime, int) == [NOW, 7]
+    assert decode_keyset(encode_cursor(7), int) == [7]
+
+
+@pytest.mark.parametrize("cursor", MALFORMED)
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_keyset(cursor, datetime, int)
+
+
+@pytest.mark.parametrize("page_select", PAGE_SELECTS)
+@pytest.mark.parametrize("cursor", MALFORMED)
+def test_page_selects_reject_malformed_cursors(page_select, cursor):
+    with pytest.raises(ValueError):
+        page_select(cursor)
+
+
+@pytest.mark.parametrize("cursor", [encode_cursor(NOW, 1), encode_cursor("1"), encode_cursor(1.0)])
+def test_alumni_cursor_is_a_single_id(cursor):
+    with pytest.raises(ValueError):
+        crud.alumni_page_select(10, cursor)
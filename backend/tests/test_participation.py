@@ -0,0 +1,72 @@
+"""Batch RSVPs: capacity is enforced in SQL and a refused batch writes nothing."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+import participation
+from models import (
+    AlumniProfile, Department, Event, EventOrganizer, EventOrgType, EventParticipation, EventType, User, UserRole,
+)
+from schemas import ParticipantIn
+
+
+@pytest.fixture
+def session(make_session):
+    with make_session() as session:
+        department = Department(department_name="Physics")
+        organizer = EventOrganizer(event_org_type=EventOrgType.Club, event_org_name="Club")
+        session.add_all([department, organizer])
+        session.flush()
+        for alumni_id in range(1, 7):
+            session.add_all([
+                User(user_id=alumni_id, email=f"a{alumni_id}@x.com", password_hash="x", role=UserRole.Alumni),
+                AlumniProfile(alumni_id=alumni_id, alumni_name=f"A{alumni_id}", graduation_year=2020,
+                              department_id=department.department_id),
+            ])
+        session.add(Event(event_id=1, event_name="Meetup", event_type=EventType.Webinar,
+                          start_time=datetime(2030, 1, 1), event_org_id=organizer.event_org_id, capacity=3))
+        session.commit()
+        yield session
+
+
+def rsvp(session, *alumni_ids):
+    return participation.add_participants(session, 1, [ParticipantIn(alumni_id=i) for i in alumni_ids])
+
+
+def state(session):
+    rows = session.scalar(select(func.count()).select_from(EventParticipation))
+    return session.scalar(select(Event.participant_count).where(Event.event_id == 1)), rows
+
+
+def test_over_capacity_batch_is_refused_whole(session):
+    with pytest.raises(participation.CapacityExceeded):
+        rsvp(session, 1, 2, 3, 4)
+    assert state(session) == (0, 0)
+
+
+def test_re_rsvps_do_not_take_seats(session):
+    assert rsvp(session, 1, 2)["added"] == 2
+    with pytest.raises(participation.CapacityExceeded) as refused:
+        rsvp(session, 1, 3, 4)  # one seat left, two new attendees
+    assert (refused.value.capacity, refused.value.participant_count, refused.value.requested) == (3, 2, 2)
+    assert state(session) == (2, 2)
+
+    result = rsvp(session, 1, 3)
+    assert (result["added"], result["updated"], result["participant_count"]) == (1, 1, 3)
+    assert state(session) == (3, 3)
+
+
+def test_removals_free_seats(session):
+    rsvp(session, 1, 2, 3)
+    result = participation.remove_participants(session, 1, [2, 5])
+    assert (result["removed"], result["missing"]) == (1, [5])
+    assert rsvp(session, 4)["participant_count"] == 3
+    assert state(session) == (3, 3)
+
+
+def test_unknown_event_and_alumni(session):
+    assert participation.add_participants(session, 99, [ParticipantIn(alumni_id=1)]) is None
+    with pytest.raises(ValueError):
+        rsvp(session, 1, 42)
+    assert state(session) == (0, 0)
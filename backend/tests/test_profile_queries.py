@@ -0,0 +1,69 @@
+"""
+The profile read path loads the whole graph (user, department, careers with
+organizations, participations with events and organizers, donations) in a
+fixed number of statements, however many related rows an alumnus has.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event
+
+import crud
+from models import (
+    AlumniProfile, Career, Department, Donation, Event, EventOrganizer, EventOrgType, EventParticipation,
+    EventType, Organization, User, UserRole,
+)
+
+MANY = 12
+
+
+def add_alumnus(session, alumni_id: int, related: int):
+    department = session.query(Department).first() or Department(department_name="Computer Science")
+    session.add_all([
+        User(user_id=alumni_id, email=f"a{alumni_id}@x.com", password_hash="x", role=UserRole.Alumni),
+        AlumniProfile(alumni_id=alumni_id, alumni_name=f"Alumnus {alumni_id}", graduation_year=2020,
+                      department=department),
+    ])
+    start = datetime(2030, 1, 1)
+    for n in range(related):
+        organizer = EventOrganizer(event_org_type=EventOrgType.Club, event_org_name=f"Club {alumni_id}-{n}")
+        event_ = Event(event_name=f"Event {alumni_id}-{n}", event_type=EventType.Webinar,
+                       start_time=start + timedelta(days=n), organizer=organizer)
+        session.add_all([
+            Career(alumni_id=alumni_id, role="Engineer", started_on=date(2020, 1, 1) + timedelta(days=n),
+                   organization=Organization(organization_name=f"Org {alumni_id}-{n}")),
+            EventParticipation(alumni_id=alumni_id, event=event_),
+            Donation(alumni_id=alumni_id, event=event_, amount=Decimal("10.00"),
+                     transaction_id=f"tx-{alumni_id}-{n}"),
+        ])
+    session.commit()
+
+
+def count_profile_statements(make_session, alumni_id: int):
+    statements = []
+    with make_session() as session:
+        engine = session.get_bind()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            profile = crud.get_alumnus_profile(session, alumni_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+    return profile, len(statements)
+
+
+def test_profile_statement_count_is_constant(make_session):
+    with make_session() as session:
+        add_alumnus(session, 1, related=1)
+        add_alumnus(session, 2, related=MANY)
+
+    one, one_count = count_profile_statements(make_session, 1)
+    many, many_count = count_profile_statements(make_session, 2)
+
+    assert (len(one["careers"]), len(one["events"]), len(one["donations"])) == (1, 1, 1)
+    assert (len(many["careers"]), len(many["events"]), len(many["donations"])) == (MANY, MANY, MANY)
+    assert one_count == many_count
+    assert many_count <= 4
@@ -0,0 +1,58 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+import repository
+from repository import AlumniRepository, AlumnusRecord, DuplicateKeyError, EventRecord, EventRepository
+
+
+def alumnus(alumni_id, email=None, year=2020):
+    return AlumnusRecord(alumni_id, f"A{alumni_id}", email or f"a{alumni_id}@x.com", year, "Physics")
+
+
+def test_indexes_follow_writes():
+    repo = AlumniRepository([alumnus(1), alumnus(2, year=2021), alumnus(3)])
+    assert [r.id for r in repo.find_by("graduation_year", 2020)] == [1, 3]
+    with pytest.raises(DuplicateKeyError):
+        repo.add(alumnus(4, email="a1@x.com"))
+    repo.replace(3, alumnus(3, year=2021))
+    assert [r.id for r in repo.find_by("graduation_year", 2021)] == [2, 3]
+    assert repo.delete(2)
+    assert repo.find_by("email", "a2@x.com") == []
+    records, after = repo.page(1)
+    assert [r.id for r in records] == [1] and after == 1
+
+
+def test_read_through_is_bounded_and_expires():
+    loads = []
+
+    def loader(alumni_id):
+        loads.append(alumni_id)
+        return alumnus(alumni_id)
+
+    repo = AlumniRepository(loader=loader, ttl=30, max_records=2)
+    for alumni_id in (1, 2, 1, 3):
+        repo.get(alumni_id)
+    assert loads == [1, 2, 3] and len(repo) == 2 and 1 not in repo
+    with mock.patch.object(repository, "monotonic", return_value=repository.monotonic() + 60):
+        repo.get(3)
+    assert loads == [1, 2, 3, 3]
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    repo = EventRepository(ttl=30)
+
+    async def load(event_id):
+        repo.invalidate(event_id)  # a write lands while the row is being read
+        return EventRecord(event_id, "t", None, "2030-01-01T10:00:00", None, "Upcoming", "Club", None, 0)
+
+    event = asyncio.run(repo.aget(5, load))
+    assert event.to_dict()["id"] == "5" and 5 not in repo
+
+
+def test_cached_record_yields_its_unique_key():
+    repo = AlumniRepository(loader=lambda alumni_id: alumnus(alumni_id, email="shared@x.com"), ttl=30)
+    repo.get(1)
+    repo.get(2)  # the email moved to alumnus 2 in the database
+    assert [r.id for r in repo.find_by("email", "shared@x.com")] == [2] and 1 not in repo
@@ -0,0 +1,159 @@
+"""
+Signed session tokens issued at login, so requests are authenticated with one
+HMAC check instead of a bcrypt round.
+
+Tokens are compact HS256 JWTs built with the standard library. An access token
+is short-lived and verified statelessly by the `current_user` dependency; a
+refresh token is longer-lived and is only accepted by the refresh endpoint,
+which re-reads the user. Logout and refresh rotation put the token's jti on an
+in-memory revocation list that forgets entries once the token would have
+expired anyway.
+"""
+import base64
+import hashlib
+import heapq
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from models import UserRole
+
+ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL", 15 * 60))
+REFRESH_TOKEN_TTL = int(os.getenv("REFRESH_TOKEN_TTL", 14 * 24 * 3600))
+
+logger = logging.getLogger(__name__)
+
+_secret = os.getenv("TOKEN_SECRET")
+if not _secret:
+    logger.warning("TOKEN_SECRET is not set; tokens will not survive a restart or work across workers")
+    _secret = secrets.token_urlsafe(32)
+SECRET = _secret.encode()
+
+_HEADER = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+
+class InvalidToken(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    sub: str
+    role: UserRole
+    type: str
+    jti: str
+    exp: int
+    uid: Optional[int] = None
+
+
+def _b64(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _unb64(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+def _sign(signing_input: bytes) -> bytes:
+    return _b64(hmac.new(SECRET, signing_input, hashlib.sha256).digest())
+
+def encode_token(sub: str, role: UserRole, token_type: str, ttl: int, uid: Optional[int] = None) -> str:
+    now = int(time.time())
+    payload = {"sub": sub, "role": role.value, "type": token_type, "iat": now, "exp": now + ttl,
+               "jti": secrets.token_urlsafe(12)}
+    if uid is not None:
+        payload["uid"] = uid
+    signing_input = _HEADER + b"." + _b64(json.dumps(payload, separators=(",", ":")).encode())
+    return (signing_input + b"." + _sign(signing_input)).decode()
+
+def decode_token(token: str, token_type: str) -> TokenClaims:
+    try:
+        header, payload, signature = token.encode().split(b".")
+    except ValueError:
+        raise InvalidToken("Malformed token")
+    if header != _HEADER or not hmac.compare_digest(signature, _sign(header + b"." + payload)):
+        raise InvalidToken("Bad signature")
+    try:
+        claims = json.loads(_unb64(payload))
+        parsed = TokenClaims(sub=claims["sub"], role=UserRole(claims["role"]), type=claims["type"],
+                             jti=claims["jti"], exp=int(claims["exp"]), uid=claims.get("uid"))
+    except (ValueError, KeyError, TypeError):
+        raise InvalidToken("Malformed token")
+    if parsed.type != token_type:
+        raise InvalidToken(f"Wrong token type, expected {token_type}")
+    if parsed.exp <= time.time():
+        raise InvalidToken("Token expired")
+    if revoked.contains(parsed.jti):
+        raise InvalidToken("Token revoked")
+    return parsed
+
+def issue_tokens(sub: str, role: UserRole, uid: Optional[int] = None) -> dict:
+    return {
+        "access_token": encode_token(sub, role, "access", ACCESS_TOKEN_TTL, uid),
+        "refresh_token": encode_token(sub, role, "refresh", REFRESH_TOKEN_TTL, uid),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_TTL,
+        "role": role.value,
+    }
+
+
+class RevocationList:
+    """jti -> expiry. Entries are dropped once their token has expired, so the set
+    only ever holds tokens that could still be presented."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._expiry: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def __len__(self):
+        return len(self._expiry)
+
+    def add(self, jti: str, exp: int):
+        with self._lock:
+            self._prune(time.time())
+            if exp > time.time():
+                self._expiry[jti] = exp
+                heapq.heappush(self._heap, (exp, jti))
+
+    def contains(self, jti: str) -> bool:
+        # Lock-free read: the hot path is a dict lookup.
+        return jti in self._expiry
+
+    def _prune(self, now: float):
+        while self._heap and self._heap[0][0] <= now:
+            _, jti = heapq.heappop(self._heap)
+            self._expiry.pop(jti, None)
+
+
+revoked = RevocationList()
+
+def revoke(claims: TokenClaims):
+    revoked.add(claims.jti, claims.exp)
+
+
+# --- FastAPI dependencies ---
+
+_bearer = HTTPBearer(auto_error=False)
+
+def current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer)) -> TokenClaims:
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        return decode_token(credentials.credentials, "access")
+    except InvalidToken as exc:
+        raise HTTPException(status_code=401, detail=str(exc), headers={"WWW-Authenticate": "Bearer"})
+
+def require_role(*roles: UserRole):
+    def check(claims: TokenClaims = Depends(current_user)) -> TokenClaims:
+        if claims.role not in roles:
+            raise HTTPException(status_code=403, detail="Not allowed for this role")
+        return claims
+    return check